@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# benchmarks/bench_events.py
+"""
+Event building: the pre-`create_events` per-row path (reproduced below as
+`legacy_create_event`) versus `create_events` with precompiled patterns and
+memoized date/time parsing.
+
+    python benchmarks/bench_events.py --rows 10000
+"""
+import argparse
+import os
+import re
+import sys
+import time
+import uuid
+from datetime import datetime
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from src.ics_generator.calendar_util import create_events, parse_when
+from src.scraping.ttec_scraper import _outage
+from src.utils.synthetic_pages import generate_rows
+
+
+def legacy_create_event(date, time, title, status, location, description):
+    try:
+        return _legacy_create_event(date, time, title, status, location, description)
+    except ValueError:
+        # formats the old parser never understood (e.g. "9am - 3pm")
+        return None
+
+
+def _legacy_create_event(date, time, title, status, location, description):
+    time = re.sub(r"\s*a\.m\.\s*", " AM", time, flags=re.IGNORECASE)
+    time = re.sub(r"\s*p\.m\.\s*", " PM", time, flags=re.IGNORECASE)
+    if "to" in time:
+        start_time, end_time = (x.strip() for x in time.split("to")[:2])
+    else:
+        start_time = end_time = time
+    for t in [start_time, end_time]:
+        if len(t.split(":")) == 1:
+            t = f"{t}:00"
+        if not re.search(r"\bAM\b|\bPM\b", t, re.I):
+            t = f"{t} AM" if int(t.split(":")[0]) < 12 else f"{t} PM"
+    try:
+        start = datetime.strptime(f"{date} {start_time}", "%d/%m/%Y %I:%M %p")
+        end = datetime.strptime(f"{date} {end_time}", "%d/%m/%Y %I:%M %p")
+    except ValueError:
+        return None
+    if status.lower() == "cancelled":
+        title, description = f"Cancelled: {title}", f"Cancelled: {description}"
+    return {"start": start, "end": end, "title": f"{title} - Scheduled Outage",
+            "location": location, "description": f"{status}: {description}", "uid": str(uuid.uuid4())}
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=10_000)
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+
+    outages = [_outage(*r, "CANCELLED") for r in generate_rows(args.rows, seed=args.seed)]
+
+    t0 = time.perf_counter()
+    legacy = [legacy_create_event(o["date"], o["time"], "TTEC", o["status"], o["location"], o["description"])
+              for o in outages]
+    t_legacy = time.perf_counter() - t0
+
+    parse_when.cache_clear()
+    t0 = time.perf_counter()
+    events = create_events(outages, "TTEC")
+    t_bulk = time.perf_counter() - t0
+
+    info = parse_when.cache_info()
+    print(f"rows={args.rows}  distinct (date, time)={info.currsize}")
+    print(f"  legacy per-row : {t_legacy * 1000:8.1f} ms  parsed {sum(e is not None for e in legacy)}")
+    print(f"  create_events  : {t_bulk * 1000:8.1f} ms  parsed {len(events)}  ({info.misses} date/time parses)")
+    print(f"  speedup        : {t_legacy / t_bulk:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# benchmarks/bench_http.py
+"""
+The shared HTTP client against the old bare `requests.get`:
+
+- repeated fetches of one page from a local server: a new connection per
+  call versus the pooled keep-alive session;
+- a site that accepts connections but never answers: the time each job
+  loses per fetch, before and after the host's circuit breaker opens.
+
+Checks both fetch paths return the same body.
+
+    python benchmarks/bench_http.py --fetches 200 --rows 200
+"""
+import argparse
+import os
+import socket
+import sys
+import time
+
+import requests
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from src.scraping.http_client import CircuitOpenError, HttpClient
+from src.utils.synthetic_pages import generate_page, serve_pages
+
+
+def fetch_loop(get, url, n):
+    t0 = time.perf_counter()
+    for _ in range(n):
+        body = get(url, timeout=30).text
+    return time.perf_counter() - t0, body
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--fetches", type=int, default=200)
+    ap.add_argument("--rows", type=int, default=200)
+    ap.add_argument("--stall-timeout", type=float, default=0.5, help="Read timeout against the silent site")
+    args = ap.parse_args()
+
+    server = serve_pages({"/p.html": generate_page(args.rows, seed=1)})
+    url = f"http://127.0.0.1:{server.server_address[1]}/p.html"
+    client = HttpClient(rate=0)
+    try:
+        bare, body_bare = fetch_loop(requests.get, url, args.fetches)
+        pooled, body_pooled = fetch_loop(client.get, url, args.fetches)
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert body_bare == body_pooled, "body mismatch"
+    print(f"{args.fetches} fetches of a {len(body_bare) / 1e3:.0f} kB page")
+    print(f"  requests.get   {bare / args.fetches * 1000:7.2f} ms/fetch")
+    print(f"  pooled client  {pooled / args.fetches * 1000:7.2f} ms/fetch   {bare / pooled:5.2f}x")
+
+    # listens but never reads or answers: every request ends in a read timeout
+    silent = socket.socket()
+    silent.bind(("127.0.0.1", 0))
+    silent.listen(64)
+    stall_url = f"http://127.0.0.1:{silent.getsockname()[1]}/"
+    stalling = HttpClient(rate=0, retries=1, backoff=0.05, breaker_failures=3, breaker_reset=60,
+                          timeout=(args.stall_timeout, args.stall_timeout))
+    print(f"silent site, read timeout {args.stall_timeout}s, 1 retry, breaker after 3 failures")
+    for i in range(5):
+        t0 = time.perf_counter()
+        try:
+            stalling.get(stall_url)
+            outcome = "ok?"
+        except CircuitOpenError:
+            outcome = "circuit open"
+        except requests.RequestException as e:
+            outcome = type(e).__name__
+        print(f"  job {i + 1}: {(time.perf_counter() - t0) * 1000:8.1f} ms   {outcome}")
+    silent.close()
+    client.close()
+    stalling.close()
+
+
+if __name__ == "__main__":
+    main()
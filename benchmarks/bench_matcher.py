@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# benchmarks/bench_matcher.py
+"""
+Keyword matching at subscriber scale: naive per-profile `any(... in ...)`
+scans versus one compiled KeywordMatcher over all profiles.
+
+    python benchmarks/bench_matcher.py --profiles 10000 --rows 500
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from src.scraping.keyword_matcher import KeywordMatcher
+
+AREAS = ["North", "South", "East", "West", "Central", "Tobago", "North East", "South West"]
+PLACES = ["Moka", "Maraval", "Fernandez", "Saddle", "Perseverance", "Hummingbird", "Ojoe",
+          "Foster", "Eastern Main", "Arima", "Sangre Grande", "Couva", "Chaguanas", "Diego Martin",
+          "Point Fortin", "Siparia", "Tunapuna", "Curepe", "St. Augustine", "Valsayn"]
+STREETS = ["Road", "Street", "Avenue", "Trace", "Drive", "Lane", "Extension", "Heights"]
+
+
+def make_profiles(n, rng):
+    vocab = [f"{p} {s}" for p in PLACES for s in STREETS] + PLACES
+    return [
+        (f"sub{i}",
+         rng.sample(["north", "south", "east", "west", "central", "tobago"], rng.randint(1, 2)),
+         rng.sample(vocab, rng.randint(1, 5)))
+        for i in range(n)
+    ]
+
+
+def make_rows(n, rng):
+    return [
+        (rng.choice(AREAS),
+         ", ".join(f"{rng.choice(PLACES)} {rng.choice(STREETS)}" for _ in range(rng.randint(1, 4))))
+        for _ in range(n)
+    ]
+
+
+def naive(profiles, rows):
+    out = 0
+    for area, location in rows:
+        for _, area_kws, loc_kws in profiles:
+            if any(a.lower() in area.lower() for a in area_kws) and \
+               any(l.lower() in location.lower() for l in loc_kws):
+                out += 1
+    return out
+
+
+def compiled(matcher, rows):
+    return sum(len(matcher.match(area, location)) for area, location in rows)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--profiles", type=int, default=10_000)
+    ap.add_argument("--rows", type=int, default=500)
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+
+    rng = random.Random(args.seed)
+    profiles = make_profiles(args.profiles, rng)
+    rows = make_rows(args.rows, rng)
+
+    t0 = time.perf_counter()
+    matcher = KeywordMatcher(profiles)
+    t_build = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    hits_fast = compiled(matcher, rows)
+    t_fast = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    hits_naive = naive(profiles, rows)
+    t_naive = time.perf_counter() - t0
+
+    assert hits_fast == hits_naive, (hits_fast, hits_naive)
+    print(f"profiles={args.profiles} rows={args.rows} matches={hits_fast}")
+    print(f"  build matcher : {t_build * 1000:9.1f} ms")
+    print(f"  compiled scan : {t_fast * 1000:9.1f} ms  ({t_fast / args.rows * 1e6:8.1f} us/row)")
+    print(f"  naive scan    : {t_naive * 1000:9.1f} ms  ({t_naive / args.rows * 1e6:8.1f} us/row)")
+    print(f"  speedup       : {t_naive / t_fast:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
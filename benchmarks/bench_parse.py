@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# benchmarks/bench_parse.py
+"""
+Row extraction: full BeautifulSoup tree (`parse_rows_soup`) versus the
+streaming lxml path (`parse_rows_lxml`), plus the declarative extractor
+engine configured for the same page (`spec`). Checks all return identical rows,
+then times each and measures peak RSS growth in a fresh child process
+(lxml allocates in C, so tracemalloc alone would under-report it).
+
+    python benchmarks/bench_parse.py --rows 1000 10000 50000
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from src.scraping.extractor import ExtractorSpec, compile_extractor
+from src.scraping.ttec_scraper import parse_rows_lxml, parse_rows_soup
+from src.utils.synthetic_pages import generate_page
+
+TTEC_SPEC = ExtractorSpec.from_config("ttec_spec", {
+    "rows": "tr.MsoNormalTable", "columns": {"date": 0, "area": 1, "location": 2, "time": 3}})
+PARSERS = {"soup": parse_rows_soup, "lxml": parse_rows_lxml, "spec": compile_extractor(TTEC_SPEC).extract}
+
+
+def _maxrss_kb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def child(parser, n, seed):
+    html = generate_page(n, seed=seed)
+    base = _maxrss_kb()
+    t0 = time.perf_counter()
+    rows = PARSERS[parser](html)
+    dt = time.perf_counter() - t0
+    print(json.dumps({"seconds": dt, "rss_kb": _maxrss_kb() - base, "rows": len(rows)}))
+
+
+def measure(parser, n, seed):
+    out = subprocess.check_output(
+        [sys.executable, __file__, "--child", parser, "--rows", str(n), "--seed", str(seed)])
+    return json.loads(out)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--child", choices=sorted(PARSERS))
+    args = ap.parse_args()
+
+    if args.child:
+        return child(args.child, args.rows[0], args.seed)
+
+    # children inherit the parent's RSS high-water mark, so measure before the
+    # parent parses anything large itself
+    results = {n: {name: measure(name, n, args.seed) for name in ("soup", "lxml", "spec")} for n in args.rows}
+    for n, res in results.items():
+        html = generate_page(n, seed=args.seed)
+        expected = parse_rows_soup(html)
+        assert parse_rows_lxml(html) == expected, f"lxml row mismatch at {n} rows"
+        assert PARSERS["spec"](html) == expected, f"spec row mismatch at {n} rows"
+        print(f"rows={n:>6}  page={len(html) / 1e6:6.1f} MB  (rows identical)")
+        for name, r in res.items():
+            print(f"  {name:<5} {r['seconds'] * 1000:9.1f} ms   +{r['rss_kb'] / 1024:7.1f} MB RSS")
+        print(f"  speedup lxml {res['soup']['seconds'] / res['lxml']['seconds']:.1f}x, "
+              f"spec {res['soup']['seconds'] / res['spec']['seconds']:.1f}x")
+
+if __name__ == "__main__":
+    main()
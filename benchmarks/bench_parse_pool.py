@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# benchmarks/bench_parse_pool.py
+"""
+Parsing many distinct pages concurrently: provider threads parsing in-thread
+(GIL-bound) versus the same threads handing pages to the parse process pool,
+for 1..N workers. Checks every path returns identical rows.
+
+    python benchmarks/bench_parse_pool.py --pages 16 --rows 5000 --workers 1 2 4
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from src.scraping import parse_pool
+from src.scraping.ttec_scraper import parse_rows
+from src.utils.synthetic_pages import generate_page
+
+
+def run(pages, threads, parse):
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as ex:
+        out = list(ex.map(parse, pages))
+    return time.perf_counter() - t0, out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--pages", type=int, default=16)
+    ap.add_argument("--rows", type=int, default=5_000)
+    ap.add_argument("--threads", type=int, default=8, help="Provider threads submitting pages")
+    ap.add_argument("--workers", type=int, nargs="+",
+                    default=sorted({1, 2, os.cpu_count() or 1}))
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+
+    pages = [generate_page(args.rows, seed=args.seed + i) for i in range(args.pages)]
+    size = sum(len(p) for p in pages) / 1e6
+    print(f"{args.pages} pages x {args.rows} rows ({size:.1f} MB), {args.threads} threads, "
+          f"{os.cpu_count()} CPU(s)")
+
+    base, expected = run(pages, args.threads, parse_rows)
+    print(f"  in-thread        {base * 1000:9.1f} ms   {args.pages / base:7.1f} pages/s")
+
+    for w in args.workers:
+        parse_pool.configure(w)
+        # warm the workers up so spawn/import cost isn't billed to the first run
+        run(pages[:w], w, lambda p: parse_pool.parse_rows(p, min_bytes=0))
+        dt, out = run(pages, args.threads, lambda p: parse_pool.parse_rows(p, min_bytes=0))
+        assert out == expected, f"row mismatch with {w} worker(s)"
+        print(f"  pool workers={w:<3} {dt * 1000:9.1f} ms   {args.pages / dt:7.1f} pages/s   "
+              f"{base / dt:5.2f}x")
+    parse_pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
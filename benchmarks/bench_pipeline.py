@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# benchmarks/bench_pipeline.py
+"""
+The provider pipeline with every stage materialised as a list (the old
+shape: parse_rows -> matched list -> diff -> create_events) versus the lazy
+generator chain in src/pipeline.py, on generated pages of growing size.
+Reports the time until the first event is available, the total time, and
+the peak Python heap while the chain runs (the page itself is allocated
+before measuring; the events, which both sides keep, are included). Checks both produce the same events.
+
+    python benchmarks/bench_pipeline.py --rows 10000 50000
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from src.ics_generator.calendar_util import create_events
+from src.pipeline import pending_events
+from src.scraping.keyword_matcher import compile_matcher
+from src.scraping.ttec_scraper import iter_matches, iter_rows, parse_rows
+from src.state.outage_store import UNCHANGED, Delta, OutageStore
+from src.utils.synthetic_pages import generate_page
+
+PROVIDER = {"id": "bench", "title": "TTEC", "url": "-",
+            "area_keywords": ["north", "east"], "location_keywords": ["road", "street"]}
+
+
+def materialised(html, store):
+    matcher = compile_matcher(PROVIDER["area_keywords"], PROVIDER["location_keywords"])
+    rows = parse_rows(html)
+    outages = list(iter_matches(rows, matcher, "CANCELLED"))
+    delta = store.diff("bench", outages, source=PROVIDER["url"])
+    events = iter(create_events((c.outage.replace(uid=c.uid, sequence=c.sequence)
+                                 for c in delta.changes if c.kind != UNCHANGED), PROVIDER["title"]))
+    return events
+
+
+def streamed(html, store):
+    return pending_events(PROVIDER, iter_rows(html), Delta("bench"), store=store)
+
+
+def timed(build, html):
+    store = OutageStore(":memory:")
+    t0 = time.perf_counter()
+    events = build(html, store)
+    first = next(events, None)
+    t_first = time.perf_counter() - t0
+    kept = [first, *events] if first is not None else []
+    total = time.perf_counter() - t0
+    store.close()
+    return t_first, total, kept
+
+
+def peak_heap(build, html):
+    # separate pass: tracemalloc slows everything down too much to time under it
+    store = OutageStore(":memory:")
+    gc.collect()
+    tracemalloc.start()
+    for _ in build(html, store):
+        pass
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    store.close()
+    return peak
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, nargs="+", default=[10_000, 50_000])
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+
+    for n in args.rows:
+        html = generate_page(n, seed=args.seed)
+        timed(streamed, html)  # warm the date/time caches for both sides
+        print(f"rows={n:>7}  page={len(html) / 1e6:6.1f} MB")
+        results = {}
+        for name, build in (("lists", materialised), ("generators", streamed)):
+            t_first, total, events = timed(build, html)
+            peak = peak_heap(build, html)
+            results[name] = events
+            print(f"  {name:<11} peak {peak / 1e6:7.1f} MB   first event {t_first * 1000:8.2f} ms   "
+                  f"total {total * 1000:8.1f} ms   events {len(events)}")
+        assert results["lists"] == results["generators"], "event mismatch"
+        del html, results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# benchmarks/bench_records.py
+"""
+Per-row memory of the pipeline's records: the old dict outages/events versus
+the slotted, interned `Outage` / `Event` records. Rows are parsed from a
+generated page (so every cell is a fresh string, as in production), turned
+into outages and events, and the parse output is dropped; what is still
+allocated is divided by the row count. Also checks both paths render the
+same email table.
+
+    python benchmarks/bench_records.py --rows 10000 100000
+"""
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+import uuid
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from src.ics_generator.calendar_util import create_events, parse_when
+from src.mailer.email_format_util import format_events_as_html
+from src.scraping.ttec_scraper import _outage, parse_rows
+from src.utils.synthetic_pages import generate_page
+
+
+def legacy_outage(date, area, location, time, kw):
+    status = "Cancelled" if location.lower().startswith(kw.lower()) else "Active"
+    return {"date": date, "area": area, "location": location, "time": time, "status": status,
+            "description": location}
+
+
+def legacy_events(outages, title):
+    events = []
+    for o in outages:
+        try:
+            start, end = parse_when(o["date"], o["time"])
+        except ValueError:
+            continue
+        t, d = title, o["description"]
+        if o["status"].lower() == "cancelled":
+            t, d = f"Cancelled: {t}", f"Cancelled: {d}"
+        events.append({"start": start, "end": end, "title": f"{t} - Scheduled Outage",
+                       "location": o["location"], "description": f"{o['status']}: {d}",
+                       "uid": str(uuid.uuid4()), "date_str": o["date"], "status": o["status"]})
+    return events
+
+
+def build_legacy(html):
+    rows = parse_rows(html)
+    outages = [legacy_outage(*r, "CANCELLED") for r in rows]
+    return outages, legacy_events(outages, "TTEC")
+
+
+def build_records(html):
+    rows = parse_rows(html)
+    outages = [_outage(*r, "CANCELLED") for r in rows]
+    return outages, create_events(outages, "TTEC")
+
+
+def measure(build, html):
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    kept = build(html)
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    return used, kept
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+
+    for n in args.rows:
+        html = generate_page(n, seed=args.seed)
+        build_records(html)  # warm the shared date/time cache so neither side is billed for it
+        legacy_bytes, (lo, le) = measure(build_legacy, html)
+        del lo, le
+        record_bytes, (ro, re_) = measure(build_records, html)
+        # same table apart from the random UIDs, which the table doesn't show
+        assert format_events_as_html(build_legacy(html)[1]) == format_events_as_html(re_), "render mismatch"
+        print(f"rows={n:>7}  outages+events retained")
+        print(f"  dicts    {legacy_bytes / n:8.0f} B/row   {legacy_bytes / 1e6:8.1f} MB")
+        print(f"  records  {record_bytes / n:8.0f} B/row   {record_bytes / 1e6:8.1f} MB   "
+              f"({1 - record_bytes / legacy_bytes:.0%} less)")
+        del ro, re_
+
+
+if __name__ == "__main__":
+    main()
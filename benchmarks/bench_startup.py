@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# benchmarks/bench_startup.py
+"""
+Cold-start budget for runner.py. Imports `runner` in fresh interpreters under
+`-X importtime`, reports the slowest imports, and exits 1 if the median import
+time exceeds the budget, if a scheduler-only/fallback module gets loaded, or
+if the import has side effects (threads, files under ./logs).
+tests/test_startup.py enforces the same checks through `check()`.
+
+    python benchmarks/bench_startup.py                  # budget 300 ms
+    python benchmarks/bench_startup.py --budget-ms 150 --repeat 7 --top 15
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_BUDGET_MS = 300.0
+
+# modules --run-now must not pay for
+FORBIDDEN = ["apscheduler", "bs4", "http.server", "icalendar"]
+
+_PROBE = f"""
+import json, os, sys, threading
+sys.path.insert(0, {BASE_DIR!r})
+import runner
+print(json.dumps({{
+    "loaded": [m for m in {FORBIDDEN!r} if m in sys.modules],
+    "threads": sorted(t.name for t in threading.enumerate() if t is not threading.main_thread()),
+    "logs_dir": os.path.exists("logs"),
+}}))
+"""
+
+
+def parse_importtime(stderr):
+    """[(module, self_us, cumulative_us)] from `-X importtime` output."""
+    out = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cum_us, name = line[len("import time:"):].split("|")
+        out.append((name.strip(), int(self_us), int(cum_us)))
+    return out
+
+
+def probe():
+    with tempfile.TemporaryDirectory() as cwd:
+        proc = subprocess.run([sys.executable, "-X", "importtime", "-c", _PROBE],
+                              cwd=cwd, capture_output=True, text=True, check=True)
+    times = parse_importtime(proc.stderr)
+    runner_us = next(cum for name, _, cum in times if name == "runner")
+    return runner_us, times, json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def check(budget_ms=DEFAULT_BUDGET_MS, repeat=5):
+    """
+    Probe `repeat` cold imports; returns (median_ms, samples_ms, importtimes of
+    the last run, facts of the last run, failures).
+    """
+    samples, times, facts = [], None, None
+    for _ in range(repeat):
+        runner_us, times, facts = probe()
+        samples.append(runner_us / 1000)
+
+    median = statistics.median(samples)
+    failures = []
+    if median > budget_ms:
+        failures.append(f"median {median:.1f} ms exceeds budget {budget_ms:.0f} ms")
+    if facts["loaded"]:
+        failures.append(f"loaded at import: {', '.join(facts['loaded'])}")
+    if facts["threads"]:
+        failures.append(f"threads started at import: {', '.join(facts['threads'])}")
+    if facts["logs_dir"]:
+        failures.append("./logs created at import")
+    return median, samples, times, facts, failures
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--top", type=int, default=10, help="Slowest imports to list")
+    args = ap.parse_args()
+
+    median, samples, times, _, failures = check(args.budget_ms, args.repeat)
+    print(f"import runner: median {median:.1f} ms, min {min(samples):.1f} ms over {args.repeat} run(s)")
+    print("slowest imports (self time, last run):")
+    for name, self_us, cum_us in sorted(times, key=lambda t: t[1], reverse=True)[:args.top]:
+        print(f"  {self_us / 1000:8.1f} ms  {cum_us / 1000:8.1f} ms cum  {name}")
+
+    for f in failures:
+        print(f"FAIL: {f}")
+    if not failures:
+        print("OK")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
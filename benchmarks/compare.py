@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# benchmarks/compare.py
+"""
+Compare two run_benchmarks.py JSON files and flag regressions.
+
+    python benchmarks/compare.py benchmarks/results/abc123.json benchmarks/results/def456.json --threshold 0.15
+
+Exits 1 when any benchmark's median got slower than `threshold` (fractional).
+"""
+import argparse
+import json
+import sys
+
+
+def load(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("baseline")
+    ap.add_argument("candidate")
+    ap.add_argument("--threshold", type=float, default=0.10)
+    args = ap.parse_args()
+
+    base, cand = load(args.baseline), load(args.candidate)
+    print(f"baseline {base['meta']['commit']}  →  candidate {cand['meta']['commit']}")
+    regressions = 0
+    for name, sizes in sorted(cand["results"].items()):
+        for size, r in sorted(sizes.items(), key=lambda kv: int(kv[0])):
+            old = base["results"].get(name, {}).get(size)
+            if not old:
+                print(f"  {name:<24} rows={size:>7}  {r['median_s'] * 1000:10.2f} ms  (new)")
+                continue
+            change = r["median_s"] / old["median_s"] - 1 if old["median_s"] else 0.0
+            flag = "REGRESSION" if change > args.threshold else ""
+            regressions += bool(flag)
+            print(f"  {name:<24} rows={size:>7}  {old['median_s'] * 1000:10.2f} → {r['median_s'] * 1000:10.2f} ms"
+                  f"  {change:+7.1%}  {flag}")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# benchmarks/run_benchmarks.py
+"""
+Hot-path benchmark suite over synthetic outage pages (100 → 100k rows).
+
+Times fetch + parse + filter ("scrape_outages": fetch_rows and iter_matches
+against a local HTTP stand-in, page cache cold),
+create_event (per row), create_events (bulk), build_ics,
+format_events_as_html and format_criteria_table, and writes the results to
+JSON so runs can be compared across commits with benchmarks/compare.py.
+
+    python benchmarks/run_benchmarks.py                       # -> benchmarks/results/<commit>.json
+    python benchmarks/run_benchmarks.py --sizes 100 1000 --repeat 3 --out /tmp/a.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from src.ics_generator.calendar_util import build_ics, create_event, create_events, parse_when
+from src.mailer.email_format_util import format_criteria_table, format_events_as_html
+from src.scraping import http_client, ttec_scraper
+from src.scraping.keyword_matcher import compile_matcher
+from src.scraping.ttec_scraper import _outage, fetch_rows, iter_matches
+from src.utils.synthetic_pages import generate_rows, render_page, serve_pages
+
+DEFAULT_SIZES = [100, 1_000, 10_000, 100_000]
+# broad enough that most rows match, so downstream stages see realistic volume
+AREA_KWS = ["north", "south", "east", "west", "central", "tobago"]
+LOC_KWS = ["road", "street", "avenue", "trace", "drive", "lane", "extension", "heights"]
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR,
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except Exception:
+        return "unknown"
+
+
+def timeit(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return {"median_s": statistics.median(samples), "min_s": min(samples), "repeat": repeat}
+
+
+def bench_size(n, repeat, seed):
+    rows = generate_rows(n, seed=seed)
+    server = serve_pages({"/outages.html": render_page(rows)})
+    # repeated downloads from one local host: the politeness limit would only add sleeps
+    prev_client = http_client.set_default_client(http_client.HttpClient(rate=0))
+    url = f"http://127.0.0.1:{server.server_address[1]}/outages.html"
+    matcher = compile_matcher(AREA_KWS, LOC_KWS)
+
+    def scrape():
+        ttec_scraper._page_cache.invalidate()  # full download + parse every time
+        return list(iter_matches(fetch_rows(url), matcher, "CANCELLED"))
+
+    try:
+        outages = scrape()
+        results = {"scrape_outages": timeit(scrape, repeat)}
+    finally:
+        server.shutdown()
+        server.server_close()
+        http_client.set_default_client(prev_client).close()
+
+    outages = outages or [_outage(*r, "CANCELLED") for r in rows]
+
+    def per_row():
+        parse_when.cache_clear()
+        for o in outages:
+            create_event(o["date"], o["time"], "TTEC", o["status"], o["location"], o["description"])
+
+    def bulk():
+        parse_when.cache_clear()
+        return create_events(outages, "TTEC")
+
+    events = bulk()
+    blocks = [("TTEC", url, AREA_KWS, LOC_KWS)] * max(1, n // 100)
+    results["create_event"] = timeit(per_row, repeat)
+    results["create_events"] = timeit(bulk, repeat)
+    results["build_ics"] = timeit(lambda: build_ics(events), repeat)
+    results["format_events_as_html"] = timeit(lambda: format_events_as_html(events), repeat)
+    results["format_criteria_table"] = timeit(lambda: format_criteria_table(blocks), repeat)
+    for r in results.values():
+        r["rows"] = n
+        r["events"] = len(events)
+    return results
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--out", help="JSON output path (default benchmarks/results/<commit>.json)")
+    args = ap.parse_args()
+
+    commit = git_commit()
+    out = args.out or os.path.join(BASE_DIR, "benchmarks", "results", f"{commit}.json")
+    report = {
+        "meta": {
+            "commit": commit,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "repeat": args.repeat,
+            "seed": args.seed,
+        },
+        "results": {},
+    }
+    for n in args.sizes:
+        # a 100k-row page is slow to repeat; keep the big sizes to a few samples
+        repeat = args.repeat if n <= 10_000 else max(1, min(args.repeat, 2))
+        for name, r in bench_size(n, repeat, args.seed).items():
+            report["results"].setdefault(name, {})[str(n)] = r
+            print(f"{name:<24} rows={n:>7}  median {r['median_s'] * 1000:10.2f} ms  min {r['min_s'] * 1000:10.2f} ms")
+
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"wrote {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,12 +5,12 @@ from __future__ import annotations
 import os
 import sys
 import time
+import uuid
 import signal
 import logging
 import threading
 import pathlib
 from datetime import datetime
-from zoneinfo import ZoneInfo
 
 # --- paths ---
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -20,20 +20,25 @@ if BASE_DIR not in sys.path:
 if SRC_DIR not in sys.path:
     sys.path.insert(0, SRC_DIR)
 
-# --- internal imports ---
-from src.utils.my_logging import setup_logging
-from src.utils.env_util import recipients_for_provider
-from src.scraping.ttec_scraper import scrape_outages
-from src.ics_generator.calendar_util import create_event, save_ics_file
-from src.mailer.email_util import send_email_with_attachment
-from src.mailer.email_format_util import format_events_as_html, format_criteria_table
-from src.main import load_config
-
-# --- APScheduler ---
-from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.triggers.cron import CronTrigger
+# .env first: the module constants below read from it
+from src.utils.env_util import load_env
+load_env()
 
-TT_TZ = ZoneInfo("America/Port_of_Spain")
+# --- internal imports ---
+from src.utils.my_logging import attach_handler, log_context, queued_handlers, setup_logging
+from src import pipeline
+from src.pipeline import TT_TZ
+from src.scraping.keyword_matcher import compile_profiles
+from src.scraping.ttec_scraper import fetch_rows, split_rows
+from src.mailer.outbox import default_outbox
+from src.state.outage_store import default_store
+from src.utils.metrics import JOB_RUNS, SCHEDULER_LAG, stage, start_http_server
+from src.utils.config_util import ConfigWatcher, diff_providers, load_snapshot
+# APScheduler is imported in main()/_add_job(): --run-now never needs it
+
+METRICS_ADDR = os.getenv("METRICS_ADDR", "127.0.0.1")
+METRICS_PORT = int(os.getenv("METRICS_PORT", 9464))  # 0 disables the endpoint
+CONFIG_RELOAD_S = float(os.getenv("CONFIG_RELOAD_S", 5))  # 0 disables hot reload
 
 def now_tt() -> datetime:
     return datetime.now(TT_TZ)
@@ -64,24 +69,30 @@ except Exception:
         def emit(self, record): pass
 
 # --- logging ---
-logger = setup_logging("service-outage-monitor")
+# handlers (and the log listener thread) are set up by _init_logging(), not at import
+logger = logging.getLogger("service-outage-monitor")
+
+def _init_logging():
+    setup_logging("service-outage-monitor")
+    if getattr(_init_logging, "done", False):
+        return
+    _init_logging.done = True
 
-# Guarantee stdout handler so tmux -> runner.out receives logs
-if not any(isinstance(h, logging.StreamHandler) for h in logger.handlers):
-    sh = logging.StreamHandler(sys.stdout)
-    sh.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(name)s: %(message)s"))
-    logger.addHandler(sh)
+    # Guarantee stdout handler so tmux -> runner.out receives logs
+    if not any(isinstance(h, logging.StreamHandler) for h in queued_handlers(logger)):
+        sh = logging.StreamHandler(sys.stdout)
+        sh.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(name)s: %(message)s"))
+        attach_handler(logger, sh)
 
-# Add bridge handler (ERROR+) if available
-if _BRIDGE:
-    bh = BridgeHandler(job_title="Outage Monitor")
-    bh.setLevel(logging.ERROR)
-    logger.addHandler(bh)
+    # Add bridge handler (ERROR+) if available; runs on the log listener thread
+    if _BRIDGE:
+        bh = BridgeHandler(job_title="Outage Monitor")
+        bh.setLevel(logging.ERROR)
+        attach_handler(logger, bh)
 
-# --- heartbeat for boot watchdog ---
+# --- heartbeat for boot watchdog (scheduler mode only) ---
 APP_ROOT = pathlib.Path(__file__).resolve().parent
 RUN_LOG_DIR = APP_ROOT / "logs" / "outage-runner"
-RUN_LOG_DIR.mkdir(parents=True, exist_ok=True)
 HB_FILE = RUN_LOG_DIR / "runner.heartbeat"
 
 def _heartbeat_loop():
@@ -92,136 +103,369 @@ def _heartbeat_loop():
             logger.warning("Heartbeat write failed: %s", e)
         time.sleep(10)
 
-threading.Thread(target=_heartbeat_loop, daemon=True).start()
+def _start_heartbeat():
+    RUN_LOG_DIR.mkdir(parents=True, exist_ok=True)
+    threading.Thread(target=_heartbeat_loop, daemon=True, name="heartbeat").start()
 
 # ---------------- core job ----------------
-def _run_provider_impl(provider: dict):
+def _run_provider_impl(provider: dict, matcher=None, rows=None, deliver=True, prefiltered=False):
     t_start = now_tt()
-    provider_id = provider.get("id")
     title = provider["title"]
-    url = provider["url"]
-    area_keywords = provider.get("area_keywords", [])
-    location_keywords = provider.get("location_keywords", [])
-    status_inactive_keyword = provider.get("status_inactive_keyword", "CANCELLED")
-
-    recipients = recipients_for_provider(provider_id) if provider_id else []
-    if not recipients:
-        logger.error(f"[{title}] No recipients for provider_id={provider_id}. Skipping email.")
-        notify(f"{title}", f"⚠️ No recipients • start {fmt_ts(t_start)}", "default")
-    else:
-        logger.info(f"[{title}] recipients={len(recipients)}")
 
-    logger.info(f"[{title}] Starting scrape {url}")
+    logger.info(f"[{title}] Starting scrape {provider['url']}")
     toast(f"[{title}] started @ {t_start.strftime('%H:%M:%S')}")
 
-    outages = scrape_outages(url, area_keywords, location_keywords, status_inactive_keyword)
-
-    events = []
-    for o in outages:
-        ev = create_event(
-            date=o["date"],
-            time=o["time"],
-            title=title,
-            status=o["status"],
-            location=o["location"],
-            description=o["description"],
-            logger=logger
-        )
-        if ev:
-            ev["date_str"] = o["date"]
-            ev["status"] = o["status"]
-            events.append(ev)
-
-    if not events:
-        t_end = now_tt()
-        dur = human_dur((t_end - t_start).total_seconds())
-        logger.info(f"[{title}] No matching outages; skipping email.")
-        notify(f"{title}", f"ℹ️ No events • {fmt_ts(t_start)} → {fmt_ts(t_end)} • {dur}", "low")
-        return
-
-    ics_name = f"service_outage_{title.lower().replace(' ','_')}_{now_tt().strftime('%Y%m%d')}.ics"
-    ics_path = os.path.expanduser(f"./logs/{ics_name}")
-    save_ics_file(events, ics_path, logger=logger)
-
-    table_html = format_events_as_html(events)
-    crit_html = format_criteria_table([(title, url, area_keywords, location_keywords)])
-    subject = f"{title} — Scheduled Outages ({len(events)})"
-    body_html = (
-        "<p>Dear User,</p>"
-        "<p>Please find below the scheduled outage details:</p>"
-        f"{table_html}<br/>{crit_html}"
-        "<p>Best regards,<br/>Service Outage Monitor</p>"
-    )
-
-    send_email_with_attachment(
-        subject=subject,
-        body_html=body_html,
-        attachment_path=ics_path,
-        recipients=recipients,
-        logger=logger
-    )
+    report = pipeline.prepare(provider, matcher=matcher, rows=rows, logger=logger, render=deliver,
+                              prefiltered=prefiltered)
+    if not report.recipients:
+        logger.error(f"[{title}] No recipients for provider_id={provider.get('id')}. Skipping email.")
+        notify(f"{title}", f"⚠️ No recipients • start {fmt_ts(t_start)}", "default")
+    counts = report.delta.counts()
+    logger.info(f"[{title}] outages={sum(counts.values())} " + " ".join(f"{k}={v}" for k, v in counts.items()))
+    if not deliver:
+        # digest mode: the window's digest job sends and records it
+        return report
 
+    pipeline.deliver(report, logger=logger)
     t_end = now_tt()
     dur = human_dur((t_end - t_start).total_seconds())
+    if not report.events:
+        logger.info(f"[{title}] No new or changed outages; skipping email.")
+        notify(f"{title}", f"ℹ️ No changes • {fmt_ts(t_start)} → {fmt_ts(t_end)} • {dur}", "low")
+        return report
     notify(
         f"{title}",
-        f"✅ Emailed {len(events)} event(s) to {len(recipients) or 0} • {fmt_ts(t_start)} → {fmt_ts(t_end)} • {dur}",
+        f"✅ Queued {len(report.events)} event(s) for {len(report.recipients)} • {fmt_ts(t_start)} → {fmt_ts(t_end)} • {dur}",
         "high"
     )
+    return report
 
-def run_provider(provider: dict):
+def run_provider(provider: dict, matcher=None, rows=None, deliver=True, prefiltered=False):
     t0 = time.time()
+    label = provider.get("id") or provider.get("title", "Provider")
     try:
-        return _run_provider_impl(provider)
+        with log_context(provider_id=label, run_id=uuid.uuid4().hex[:12]):
+            rv = _run_provider_impl(provider, matcher=matcher, rows=rows, deliver=deliver, prefiltered=prefiltered)
+        JOB_RUNS.labels(label, "ok").inc()
+        return rv
     except Exception as e:
+        JOB_RUNS.labels(label, "error").inc()
         dt = time.time() - t0
         title = provider.get("title", "Provider")
         notify(title, f"❌ {type(e).__name__} • {human_dur(dt)}", "max", sticky=True)
         raise
 
+def _member_label(provider: dict) -> str:
+    return provider.get("id") or provider["title"]
+
+def _run_members(members: list, rows, deliver=True):
+    """
+    Run each member on `rows` (None: each fetches its own). Shared rows are
+    scanned once against every member's keywords, and each member gets just
+    the rows it matched.
+    """
+    split = None
+    if rows is not None and len(members) > 1:
+        matcher = compile_profiles((_member_label(p), p.get("area_keywords", []), p.get("location_keywords", []))
+                                   for p, _ in members)
+        split = split_rows(rows, matcher, provider="+".join(_member_label(p) for p, _ in members))
+    reports = []
+    for provider, matcher in members:
+        own = rows if split is None else split[_member_label(provider)]
+        try:
+            reports.append(run_provider(provider, matcher=matcher, rows=own, deliver=deliver,
+                                        prefiltered=split is not None))
+        except Exception as e:
+            logger.exception(f"[{provider.get('title', 'Provider')}] run failed: {e}")
+    return reports
+
+def _fetch_shared(members: list):
+    """Rows of the page `members` share, fetched once; None (members fetch on their own) on failure."""
+    url = members[0][0]["url"]
+    label = "+".join(p.get("id") or p["title"] for p, _ in members)
+    try:
+        with log_context(provider_id=label, run_id=uuid.uuid4().hex[:12]):
+            rows = fetch_rows(url, provider=label, extractor=members[0][0].get("extractor"))
+            logger.info(f"Fetch group {label}: {len(rows)} row(s) from {url} for {len(members)} provider(s)")
+            return rows
+    except Exception as e:
+        # members fetch on their own and report their own failures
+        logger.warning(f"Fetch group {label}: fetch failed ({type(e).__name__}: {e}); running members separately")
+        return None
+
+def run_group(members: list):
+    """
+    Job for providers sharing (url, extractor, schedule): fetch and parse the
+    page once, match its rows once against every member's keywords, then run
+    each member's own diff/render/send with its usual logs, metrics and
+    notifications. `members` is [(provider, matcher), ...].
+    """
+    _run_members(members, _fetch_shared(members))
+
+def run_digest(members: list):
+    """
+    Digest-mode job for every scheduled provider sharing one schedule: each
+    page is fetched once, every member is prepared as usual, then each
+    recipient gets one combined email for all their providers.
+    """
+    pages = {}
+    for provider, matcher in members:
+        pages.setdefault((provider["url"], provider.get("extractor")), []).append((provider, matcher))
+    reports = []
+    for page_members in pages.values():
+        rows = _fetch_shared(page_members) if len(page_members) > 1 else None
+        reports += _run_members(page_members, rows, deliver=False)
+    # back in config order, so the digest lists providers as the file does
+    order = {id(p): i for i, (p, _) in enumerate(members)}
+    reports.sort(key=lambda r: order[id(r.provider)])
+
+    t_start = now_tt()
+    label = "+".join(r.label for r in reports)
+    with log_context(provider_id=label, run_id=uuid.uuid4().hex[:12]):
+        sent = pipeline.deliver_digest(reports, logger=logger)
+    events = len(pipeline.merge_events(reports))
+    if events:
+        dur = human_dur((now_tt() - t_start).total_seconds())
+        notify("Digest", f"✅ Queued {sent} digest(s), {events} event(s) from {len(reports)} provider(s) • {dur}", "high")
+
+_pollers = {}
+_pollers_lock = threading.Lock()
+
+def _poller_key(url: str, extractor=None) -> str:
+    return f"{url}#{extractor}" if extractor else url
+
+def _poller_for(url: str, settings, extractor=None):
+    from src.scraping.adaptive_poll import AdaptivePoller
+    key = _poller_key(url, extractor)
+    with _pollers_lock:
+        poller = _pollers.get(key)
+        if poller is None:
+            poller = _pollers[key] = AdaptivePoller(url, settings, extractor=extractor,
+                                                    state=default_store().load_poll_state(key))
+        elif poller.settings != settings:
+            poller.update_settings(settings)
+        return poller
+
+def run_poll(members: list, settings):
+    """
+    Tick job (every min_interval) for the polled providers of one page: probe
+    the page when its poller is due and run the members only if the outage
+    rows changed. The first probe after startup always runs them once.
+    """
+    url, extractor = members[0][0]["url"], members[0][0].get("extractor")
+    key = _poller_key(url, extractor)
+    poller = _poller_for(url, settings, extractor)
+    if not poller.due():
+        return
+    label = "+".join(p.get("id") or p["title"] for p, _ in members)
+    seen = poller.state()
+    with log_context(provider_id=label, run_id=uuid.uuid4().hex[:12]):
+        try:
+            with stage("probe", label):
+                rows = poller.poll()
+        except Exception as e:
+            poller.record(changed=False)
+            default_store().save_poll_state(key, poller.state())
+            logger.warning(f"Poll {url}: probe failed ({type(e).__name__}: {e}); "
+                           f"next probe in {human_dur(poller.interval)}")
+            return
+        logger.info(f"Poll {url}: {'changed' if rows is not None else 'unchanged'}; "
+                    f"next probe in {human_dur(poller.interval)}")
+    if rows is not None and len(_run_members(members, rows)) < len(members):
+        # a member failed: the next probe must see this change again, not "unchanged"
+        poller.rewind(seen)
+        logger.warning(f"Poll {url}: {len(members)} member(s) not all processed; change kept pending")
+    # saved only now, so a crash mid-run never records the change as handled
+    default_store().save_poll_state(key, poller.state())
+
 # ---------------- scheduling ----------------
-def _schedule_from_yaml(sched, cfg: dict):
-    providers = cfg.get("websites", [])
-    for idx, p in enumerate(providers, 1):
-        cron_expr = p.get("schedule")
-        title = p.get("title", f"provider{idx}")
-        if not cron_expr:
-            logger.warning(f"[{title}] missing 'schedule' in config.yaml — skipping")
-            continue
+# scheduler job id -> the per-member job ids its providers would have on their own
+_member_jobs = {}
+
+def _record_lag(event):
+    # fire time vs. the moment the job was handed to the executor, per member job id
+    for scheduled in event.scheduled_run_times:
+        lag = max(0.0, (now_tt() - scheduled).total_seconds())
+        for job_id in _member_jobs.get(event.job_id, (event.job_id,)):
+            SCHEDULER_LAG.labels(job_id).observe(lag)
+
+def _job_groups(snapshot) -> dict:
+    """
+    {job_id: [spec, ...]}; providers with the same (url, extractor, schedule)
+    share one job, and so do all polled providers of one (url, extractor).
+    In digest mode every scheduled provider of one schedule shares a job.
+    """
+    groups = {}
+    for spec in snapshot.providers.values():
+        if spec.poll:
+            key = (spec.url, spec.extractor, "poll")
+        elif snapshot.digest:
+            key = ("digest", spec.schedule)
+        else:
+            key = (spec.url, spec.extractor, spec.schedule)
+        groups.setdefault(key, []).append(spec)
+    return {_job_id(members, digest=key[0] == "digest"): members for key, members in groups.items()}
+
+def _job_id(members, digest=False) -> str:
+    if digest:
+        prefix = "digest"
+    else:
+        prefix = "poll" if members[0].poll else "provider" if len(members) == 1 else "group"
+    return f"{prefix}_" + "+".join(spec.id for spec in members)
+
+def _poll_settings(members):
+    # the most eager bounds among the members win
+    from src.utils.config_util import PollSettings
+    return PollSettings(
+        min_interval=min(spec.poll.min_interval for spec in members),
+        max_interval=min(spec.poll.max_interval for spec in members),
+        backoff=min(spec.poll.backoff for spec in members),
+    )
 
+def _trigger_key(members):
+    if members[0].poll:
+        return "poll", _poll_settings(members).min_interval
+    return "cron", members[0].schedule
+
+def _job_target(job_id, members):
+    if job_id.startswith("digest_"):
+        return run_digest, {"members": [(spec.config, spec.matcher) for spec in members]}
+    if members[0].poll:
+        return run_poll, {"members": [(spec.config, spec.matcher) for spec in members],
+                          "settings": _poll_settings(members)}
+    if len(members) == 1:
+        return run_provider, {"provider": members[0].config, "matcher": members[0].matcher}
+    return run_group, {"members": [(spec.config, spec.matcher) for spec in members]}
+
+def _add_job(sched, job_id, members) -> bool:
+    """(Re)schedule one job; False (and no job) if its schedule is missing or invalid."""
+    from apscheduler.triggers.cron import CronTrigger
+    from apscheduler.triggers.interval import IntervalTrigger
+    title = " + ".join(dict.fromkeys(spec.title for spec in members))
+    cron_expr = members[0].schedule
+    extra = {}
+    if members[0].poll:
+        settings = _poll_settings(members)
+        trigger = IntervalTrigger(seconds=settings.min_interval, timezone=TT_TZ)
+        # probe right away; the poller decides when the next real probe is due
+        extra["next_run_time"] = now_tt()
+        cron_expr = f"poll {human_dur(settings.min_interval)}–{human_dur(settings.max_interval)}"
+    elif not cron_expr:
+        logger.warning(f"[{title}] missing 'schedule' for "
+                       f"{', '.join(spec.id for spec in members)} in config.yaml — skipping")
+        return False
+    else:
         try:
             trigger = CronTrigger.from_crontab(cron_expr, timezone=TT_TZ)
         except Exception as e:
             logger.error(f"[{title}] invalid cron '{cron_expr}': {e}")
             toast(f"[{title}] invalid cron")
-            continue
+            return False
+
+    func, kwargs = _job_target(job_id, members)
+    sched.add_job(
+        func,
+        trigger=trigger,
+        id=job_id,
+        kwargs=kwargs,
+        max_instances=1,
+        coalesce=True,
+        misfire_grace_time=60*30,
+        replace_existing=True,
+        **extra,
+    )
 
-        job_id = f"provider_{idx}_{title.lower().replace(' ','_')}"
-        sched.add_job(
-            run_provider,
-            trigger=trigger,
-            id=job_id,
-            kwargs={"provider": p},
-            max_instances=1,
-            coalesce=True,
-            misfire_grace_time=60*30,
-            replace_existing=True,
-        )
-
-        now = now_tt()
-        next_fire = trigger.get_next_fire_time(previous_fire_time=None, now=now)
-        logger.info(f"[{title}] scheduled '{cron_expr}' as '{job_id}' (next={next_fire})")
-        if next_fire:
-            toast(f"[{title}] next @ {next_fire.astimezone(TT_TZ).strftime('%Y-%m-%d %H:%M')}")
+    now = now_tt()
+    next_fire = extra.get("next_run_time") or trigger.get_next_fire_time(previous_fire_time=None, now=now)
+    logger.info(f"[{title}] scheduled '{cron_expr}' as '{job_id}' (next={next_fire})")
+    if next_fire:
+        toast(f"[{title}] next @ {next_fire.astimezone(TT_TZ).strftime('%Y-%m-%d %H:%M')}")
+    return True
+
+def _remove_job(sched, job_id: str):
+    # a run already in progress finishes; only future fires are dropped
+    if sched.get_job(job_id):
+        sched.remove_job(job_id)
+
+def _apply_config(sched, old, new):
+    """Bring the scheduler from snapshot `old` (None at startup) to `new`, touching only what changed."""
+    before = _job_groups(old) if old else {}
+    after = _job_groups(new)
+    for job_id in before.keys() - after.keys():
+        _remove_job(sched, job_id)
+        _member_jobs.pop(job_id, None)
+        logger.info(f"'{job_id}' no longer in config — job dropped")
+    for job_id, members in after.items():
+        _member_jobs[job_id] = tuple(_job_id([spec]) for spec in members)
+        prev = before.get(job_id)
+        if prev == members:
+            continue
+        job = sched.get_job(job_id)
+        if prev is None or job is None or _trigger_key(prev) != _trigger_key(members):
+            if not _add_job(sched, job_id, members):
+                _remove_job(sched, job_id)
+        else:
+            # same trigger: keep the job's next fire time, swap what it runs with
+            func, kwargs = _job_target(job_id, members)
+            sched.modify_job(job_id, func=func, kwargs=kwargs)
+            logger.info(f"'{job_id}' updated in place")
+    return diff_providers(old, new)
+
+def prune_state():
+    """Daily job: forget outages that have been off the page for OUTAGE_PRUNE_DAYS."""
+    try:
+        removed = default_store().prune()
+    except Exception as e:
+        logger.warning(f"Pruning outage state failed: {type(e).__name__}: {e}")
+        return
+    if removed:
+        logger.info(f"Pruned {removed} outage(s) not seen for a while from the state DB")
+
+def _configure_parse_pool(snapshot):
+    from src.scraping import parse_pool
+    conc = snapshot.raw.get("concurrency") or {}
+    if "parse_workers" in conc:
+        parse_pool.configure(conc["parse_workers"])
+
+def _on_config_change(sched, old, new):
+    _configure_parse_pool(new)
+    added, removed, changed = _apply_config(sched, old, new)
+    summary = f"+{len(added)} -{len(removed)} ~{len(changed)}"
+    logger.info(f"Config reloaded ({summary}); jobs={len(sched.get_jobs())}")
+    if added or removed or changed:
+        toast(f"Outage Monitor: config reloaded ({summary})")
 
 def main():
+    from apscheduler.events import EVENT_JOB_SUBMITTED
+    from apscheduler.schedulers.background import BackgroundScheduler
+
+    _init_logging()
+    _start_heartbeat()
     print("[runner] main() entered", flush=True)
     notify("Outage Monitor", "main() entered", "low")
 
-    cfg = load_config()
+    if METRICS_PORT:
+        try:
+            start_http_server(METRICS_PORT, METRICS_ADDR)
+            logger.info(f"Metrics at http://{METRICS_ADDR}:{METRICS_PORT}/metrics")
+        except OSError as e:
+            logger.warning(f"Metrics endpoint disabled: {e}")
+
+    # mail queued before a restart goes out first; jobs only ever enqueue
+    outbox = default_outbox().start()
+
     scheduler = BackgroundScheduler(timezone=TT_TZ)
-    _schedule_from_yaml(scheduler, cfg)
+    scheduler.add_listener(_record_lag, EVENT_JOB_SUBMITTED)
+    watcher = ConfigWatcher(on_change=lambda old, new: _on_config_change(scheduler, old, new),
+                            interval=CONFIG_RELOAD_S, logger=logger)
+    _configure_parse_pool(watcher.snapshot)
+    _apply_config(scheduler, None, watcher.snapshot)
+    from apscheduler.triggers.interval import IntervalTrigger
+    scheduler.add_job(prune_state, IntervalTrigger(hours=24, timezone=TT_TZ), id="prune_state",
+                      next_run_time=now_tt(), max_instances=1, coalesce=True, replace_existing=True)
     scheduler.start()
+    if CONFIG_RELOAD_S > 0:
+        watcher.start()
     print("[runner] APScheduler started", flush=True)
     jobs = scheduler.get_jobs()
     logger.info("APScheduler started. Press Ctrl+C to exit. jobs=%d", len(jobs))
@@ -230,7 +474,9 @@ def main():
     def _shutdown(signum, frame):
         logger.info("Shutting down scheduler...")
         toast("Outage Monitor: shutting down…")
+        watcher.stop()
         scheduler.shutdown(wait=False)
+        outbox.stop()
         sys.exit(0)
 
     signal.signal(signal.SIGINT, _shutdown)
@@ -250,17 +496,32 @@ if __name__ == "__main__":
     import argparse
     parser = argparse.ArgumentParser()
     parser.add_argument("--run-now", metavar="PROVIDER_ID", help="Run one provider immediately and exit")
+    parser.add_argument("--load-test", metavar="N", type=int,
+                        help="Run N synthetic providers against local HTTP/SMTP stand-ins and report")
+    parser.add_argument("--rows", type=int, default=500, help="Rows per synthetic page (--load-test)")
+    parser.add_argument("--pages", type=int, help="Distinct synthetic pages (--load-test, default N)")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent jobs (--load-test)")
+    parser.add_argument("--json", action="store_true", help="Print the load-test report as JSON")
     args = parser.parse_args()
+    _init_logging()
+
+    if args.load_test:
+        import json
+        from src.utils.load_test import format_report, run_load_test
+        report = run_load_test(_run_provider_impl, providers=args.load_test, rows=args.rows,
+                               pages=args.pages, workers=args.workers, logger=logger)
+        print(json.dumps(report, indent=2) if args.json else format_report(report), flush=True)
+        sys.exit(1 if report["errors"] else 0)
 
     if args.run_now:
-        cfg = load_config()
-        p = next((x for x in cfg.get("websites", []) if x.get("id") == args.run_now), None)
-        if not p:
+        spec = load_snapshot().providers.get(args.run_now)
+        if not spec:
             logger.error(f"No provider with id={args.run_now}")
             notify("Outage Monitor", f"⚠️ No provider id={args.run_now}", "default")
             sys.exit(1)
-        toast(f"Running {p.get('title','provider')} now…")
-        run_provider(p)
+        toast(f"Running {spec.title} now…")
+        run_provider(spec.config, matcher=spec.matcher)
+        default_outbox().flush()
         sys.exit(0)
 
     main()
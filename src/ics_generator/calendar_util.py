@@ -3,87 +3,73 @@ import logging
 import uuid
 import os
 import re
-from datetime import datetime, timedelta
-from icalendar import Calendar, Event
-
-def build_ics(events, tzname="America/Port_of_Spain", logger=None):
-    cal = Calendar()
-    cal.add('prodid', '-//Outage Monitor//')
-    cal.add('version', '2.0')
-    cal.add('method', 'PUBLISH')
-
-    for ev in events:
-        e = Event()
-        e.add('uid', ev.get("uid", str(uuid.uuid4())))
-        e.add('summary', ev['title'])  # e.g., TTEC - Scheduled Outage
-        e.add('dtstart', ev['start'])
-        e.add('dtend', ev['end'])
-        e.add('location', ev.get('location', ''))
-        e.add('description', ev.get('description', ''))
-        e.add('url', ev.get('url', ''))
-        cal.add_component(e)
-
-    return cal.to_ical()
-
-
-def create_event(date, time, title, status, location, description, logger=None):
-    # Log the time input for debugging
-    # if logger:
-    #     logger.debug(f"Raw time data: {time}")
-
-    # Manually replace a.m. and p.m. with AM and PM for proper parsing
-    time = re.sub(r"\s*a\.m\.\s*", " AM", time, flags=re.IGNORECASE)
-    time = re.sub(r"\s*p\.m\.\s*", " PM", time, flags=re.IGNORECASE)
-
-    # Log the cleaned time for debugging
-    # if logger:
-    #     logger.debug(f"Cleaned time data: {time}")
-
-    # If the time includes a range (e.g., "9:00 AM to 3:00 PM"), split it into start and end times
-    if "to" in time:
-        time_range = time.split("to")
-        start_time = time_range[0].strip()
-        end_time = time_range[1].strip()
-    else:
-        start_time = time
-        end_time = time  # If no range, use the same time for start and end
-
-    # Log the split times for debugging
-    # if logger:
-    #     logger.debug(f"Start time: {start_time}, End time: {end_time}")
-
-    # Ensure time is in a proper format, adding AM/PM if missing
-    for t in [start_time, end_time]:
-        if len(t.split(":")) == 1:  # Only hour provided, add :00 and AM
-            t = f"{t}:00"
-
-        if not re.search(r"\bAM\b|\bPM\b", t, re.I):  # Check if AM/PM is missing
-            hour = int(t.split(":")[0])
-            if hour < 12:
-                t = f"{t} AM"  # Default to AM if no AM/PM is found and the hour is before 12
-            else:
-                t = f"{t} PM"  # Default to PM if the hour is 12 or greater
-
-        # Log the finalized time for debugging
-        # if logger:
-        #     logger.debug(f"Final time with AM/PM: {t}")
-
-    # Combine date and time to create a datetime object
+import sys
+from datetime import datetime, time as dt_time
+from functools import lru_cache
+
+from src.ics_generator.ics_stream import iter_calendar, merge_rolling_calendar
+from src.utils.records import Event, Outage
+
+_intern = sys.intern
+
+def build_ics(events):
+    return b"".join(iter_calendar(events))
+
+
+# "a.m." / "p.m." / "am" / "P.M" -> " AM" / " PM"
+_MERIDIEM_RE = re.compile(r"\s*(?<![A-Za-z])([ap])\.?\s?m\.?(?![A-Za-z])", re.IGNORECASE)
+# "9 AM to 3 PM", "9 AM - 3 PM", "9 AM – 3 PM"
+_RANGE_RE = re.compile(r"\s*(?:\bto\b|[-–—])\s*", re.IGNORECASE)
+# "9", "9:30", "9.30", each optionally followed by AM/PM
+_CLOCK_RE = re.compile(r"^(\d{1,2})(?:[:.](\d{2}))?\s*(AM|PM)?$", re.IGNORECASE)
+
+
+def _normalize_time(time):
+    return _MERIDIEM_RE.sub(lambda m: f" {m.group(1).upper()}M", time).strip()
+
+
+def _clock(t):
+    """(hour, minute) in 24h for one side of a range; bare hours < 12 are AM."""
+    m = _CLOCK_RE.match(t)
+    if not m:
+        raise ValueError(f"unrecognised time {t!r}")
+    hour, minute, meridiem = int(m.group(1)), int(m.group(2) or 0), (m.group(3) or "").upper()
+    if meridiem:
+        if not 1 <= hour <= 12:
+            raise ValueError(f"hour out of range in {t!r}")
+        hour = hour % 12 + (12 if meridiem == "PM" else 0)
+    return hour, minute
+
+
+@lru_cache(maxsize=4096)
+def _parse_date(date):
+    return datetime.strptime(date, "%d/%m/%Y").date()
+
+
+@lru_cache(maxsize=16384)
+def parse_when(date, time):
+    """
+    (start, end) datetimes for a date cell and a time cell such as
+    "9 a.m. to 3 p.m.". Raises ValueError when either cannot be parsed.
+    Memoized: the same (date, time) strings repeat across rows and providers.
+    """
+    parts = _RANGE_RE.split(_normalize_time(time), maxsplit=1)
+    start_time = parts[0].strip()
+    end_time = parts[1].strip() if len(parts) > 1 else start_time
+    day = _parse_date(date.strip())
+    start = datetime.combine(day, dt_time(*_clock(start_time)))
+    end = datetime.combine(day, dt_time(*_clock(end_time)))
+    return start, end
+
+
+def create_event(date, time, title, status, location, description, logger=None, uid=None,
+                 date_str=None, row_status=None, sequence=None):
     try:
-        start = datetime.strptime(f"{date} {start_time}", "%d/%m/%Y %I:%M %p")
-        end = datetime.strptime(f"{date} {end_time}", "%d/%m/%Y %I:%M %p")
-        
-        # Log the finalized time for debugging
-        # if logger:
-        #     logger.debug(f"Start time: {start}, End time: {end}")
+        start, end = parse_when(date, time)
     except ValueError as e:
         # In case of a parsing issue, log it and skip this entry
         if logger:
-            logger.warning(f"Skipping invalid event date/time: {date} {start_time} to {end_time} ({e})")
-        start = end = None
-    
-    if not start or not end:
-        # If we couldn't parse the time correctly, skip this event
+            logger.warning(f"Skipping invalid event date/time: {date} {time} ({e})")
         return None
 
     # If the status is 'Cancelled', modify the title and description
@@ -91,22 +77,84 @@ def create_event(date, time, title, status, location, description, logger=None):
         title = f"Cancelled: {title}"
         description = f"Cancelled: {description}"
 
-    # Create event dictionary
-    event = {
-        'start': start,
-        'end': end,
-        'title': f"{title} - Scheduled Outage",
-        'location': location,
-        'description': f"{status}: {description}",
-        'uid': str(uuid.uuid4())
-    }
-    
-    return event
-
-def save_ics_file(events, output_filename, logger=None):
-    ics_data = build_ics(events, logger=logger)
-    with open(output_filename, "wb") as f:
-        f.write(ics_data)
+    return Event.make(
+        start=start,
+        end=end,
+        title=f"{title} - Scheduled Outage",
+        location=location,
+        description=f"{status}: {description}",
+        uid=uid or str(uuid.uuid4()),
+        date_str=date_str,
+        status=row_status,
+        sequence=sequence,
+    )
+
+
+def _event_builder(title, logger=None):
+    """
+    A one-row-at-a-time equivalent of create_event for many rows of one
+    provider: the two possible titles are built and interned once, each
+    distinct (date, time) pair is parsed once per batch (failures included),
+    and Outage records are read by attribute instead of through the mapping.
+    """
+    active_title = _intern(f"{title} - Scheduled Outage")
+    cancelled_title = _intern(f"Cancelled: {title} - Scheduled Outage")
+    when_cache = {}
+    uuid4 = uuid.uuid4
+
+    def build(o):
+        if type(o) is Outage:
+            date, time, status, location, description = o.date, o.time, o.status, o.location, o.description
+            uid, sequence = o.uid, o.sequence
+        else:
+            date, time, status, location, description = (
+                o["date"], o["time"], o["status"], o["location"], o["description"])
+            uid, sequence = o.get("uid"), o.get("sequence")
+
+        when = when_cache.get((date, time))
+        if when is None:
+            try:
+                when = parse_when(date, time)
+            except ValueError as e:
+                when = e
+            when_cache[(date, time)] = when
+        if type(when) is not tuple:
+            if logger:
+                logger.warning(f"Skipping invalid event date/time: {date} {time} ({when})")
+            return None
+
+        if status.lower() == "cancelled":
+            ev_title, description = cancelled_title, f"Cancelled: {description}"
+        else:
+            ev_title = active_title
+        return Event(when[0], when[1], ev_title, location, f"{status}: {description}",
+                     uid or str(uuid4()), _intern(date) if date else date, _intern(status) if status else status,
+                     sequence)
+
+    return build
+
+
+def iter_events(rows, title, logger=None):
+    """
+    Events for outage rows, built lazily as the rows arrive. Each row is an
+    Outage (or a dict with date, time, status, location, description) and may
+    carry 'uid' and 'sequence'. Rows whose date/time cannot be parsed are skipped.
+    Same output as calling create_event per row.
+    """
+    build = _event_builder(title, logger)
+    for o in rows:
+        ev = build(o)
+        if ev is not None:
+            yield ev
+
+def create_events(rows, title, logger=None):
+    """Build events for many outage rows at once; the bulk form of iter_events."""
+    build = _event_builder(title, logger)
+    return [ev for ev in map(build, rows) if ev is not None]
+
+def update_rolling_calendar(events, path, logger=None):
+    """Merge events into a provider's long-lived calendar, replacing changed ones by UID."""
+    replaced, added = merge_rolling_calendar(path, events)
     if logger:
-        logger.info(f"ICS file saved: {output_filename}")
-    return output_filename
+        logger.info(f"Rolling calendar {path}: {added} added, {replaced} updated")
+    return path
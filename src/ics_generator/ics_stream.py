@@ -0,0 +1,173 @@
+# ics_generator/ics_stream.py
+"""
+Streaming iCalendar (RFC 5545) writer.
+
+Events are serialised one VEVENT at a time straight to a binary file or
+buffer, so writing N events never holds more than one of them as text.
+`merge_rolling_calendar` keeps one calendar file per provider up to date by
+streaming the existing file block by block, replacing events whose UID was
+re-emitted, appending new ones, and atomically swapping the result in.
+"""
+import os
+import tempfile
+import uuid
+from datetime import datetime, timezone
+
+PRODID = "-//Outage Monitor//"
+CRLF = b"\r\n"
+
+
+def escape_text(value):
+    return (str(value).replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+            .replace("\r\n", "\\n").replace("\n", "\\n"))
+
+
+def fold(line):
+    """Fold a content line to 75-octet chunks without splitting UTF-8 sequences."""
+    data = line.encode("utf-8")
+    if len(data) <= 75:
+        return data + CRLF
+    out, limit = [], 75
+    while len(data) > limit:
+        cut = limit
+        while cut > 0 and (data[cut] & 0xC0) == 0x80:  # don't cut inside a code point
+            cut -= 1
+        out.append(data[:cut])
+        data = data[cut:]
+        limit = 74  # continuation lines start with a space
+    out.append(data)
+    return (CRLF + b" ").join(out) + CRLF
+
+
+def format_dt(dt):
+    """Naive datetimes are written as floating local time, aware ones in UTC."""
+    if dt.tzinfo is not None:
+        return dt.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    return dt.strftime("%Y%m%dT%H%M%S")
+
+
+def vevent_bytes(ev, dtstamp=None):
+    dtstamp = dtstamp or datetime.now(timezone.utc)
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{ev.get('uid') or uuid.uuid4()}",
+        f"DTSTAMP:{format_dt(dtstamp)}",
+        f"SUMMARY:{escape_text(ev['title'])}",
+        f"DTSTART:{format_dt(ev['start'])}",
+        f"DTEND:{format_dt(ev['end'])}",
+        f"LOCATION:{escape_text(ev.get('location', ''))}",
+        f"DESCRIPTION:{escape_text(ev.get('description', ''))}",
+    ]
+    if ev.get('url'):
+        lines.append(f"URL:{ev['url']}")
+    if 'sequence' in ev:
+        lines.append(f"SEQUENCE:{int(ev['sequence'])}")
+    if str(ev.get('status', '')).lower() == 'cancelled':
+        lines.append("STATUS:CANCELLED")
+    lines.append("END:VEVENT")
+    return b"".join(fold(l) for l in lines)
+
+
+def calendar_header():
+    return (b"BEGIN:VCALENDAR" + CRLF + fold(f"PRODID:{PRODID}") + b"VERSION:2.0" + CRLF
+            + b"METHOD:PUBLISH" + CRLF)
+
+
+def write_header(fp):
+    fp.write(calendar_header())
+
+
+def write_footer(fp):
+    fp.write(b"END:VCALENDAR" + CRLF)
+
+
+def iter_calendar(events):
+    """A complete VCALENDAR of `events` (any iterable) as byte chunks, one VEVENT each."""
+    dtstamp = datetime.now(timezone.utc)
+    yield calendar_header()
+    for ev in events:
+        yield vevent_bytes(ev, dtstamp)
+    yield b"END:VCALENDAR" + CRLF
+
+
+def write_calendar(fp, events):
+    """Stream a complete VCALENDAR of `events` (any iterable) to binary `fp`."""
+    for chunk in iter_calendar(events):
+        fp.write(chunk)
+
+
+def _block_uid(raw):
+    unfolded = raw.replace(b"\r\n ", b"").replace(b"\n ", b"")
+    for line in unfolded.splitlines():
+        if line.startswith(b"UID:"):
+            return line[4:].decode("utf-8")
+    return None
+
+
+def iter_vevents(fp):
+    """Yield (uid, raw_bytes) for each VEVENT in binary `fp`, one block at a time."""
+    block = None
+    for raw in fp:
+        line = raw.rstrip(b"\r\n")
+        if line == b"BEGIN:VEVENT":
+            block = [raw]
+        elif block is not None:
+            block.append(raw)
+            if line == b"END:VEVENT":
+                data = b"".join(block)
+                yield _block_uid(data), data
+                block = None
+
+
+def atomic_write(path, write):
+    """Call write(fp) on a temp file next to `path`, then atomically replace `path`."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=".tmp-", suffix=".ics", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as fp:
+            write(fp)
+            fp.flush()
+            os.fsync(fp.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    return path
+
+
+def merge_rolling_calendar(path, events):
+    """
+    Merge `events` into the calendar at `path` by UID: existing events with a
+    re-emitted UID are replaced in place, the rest are copied through
+    unchanged, and new UIDs are appended. Returns (replaced, added).
+    """
+    pending = {}
+    for ev in events:
+        ev = dict(ev)
+        ev.setdefault('uid', str(uuid.uuid4()))
+        pending[ev['uid']] = ev
+    dtstamp = datetime.now(timezone.utc)
+    counts = {"replaced": 0}
+
+    def _write(out):
+        write_header(out)
+        if os.path.exists(path):
+            with open(path, "rb") as existing:
+                for uid, raw in iter_vevents(existing):
+                    ev = pending.pop(uid, None)
+                    if ev is None:
+                        out.write(raw)
+                    else:
+                        out.write(vevent_bytes(ev, dtstamp))
+                        counts["replaced"] += 1
+        for ev in pending.values():
+            out.write(vevent_bytes(ev, dtstamp))
+        write_footer(out)
+
+    total = len(pending)
+    atomic_write(path, _write)
+    return counts["replaced"], total - counts["replaced"]
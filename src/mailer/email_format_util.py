@@ -1,16 +1,17 @@
 # email/email_format_util.py
-def format_events_as_html(events):
-    html = [
-        "<h2>Scheduled Outages</h2>",
-        '<table border="1" cellpadding="5" cellspacing="0">',
+def iter_events_html(events):
+    """The outage table as HTML chunks, one per event (plus header and footer)."""
+    yield (
+        "<h2>Scheduled Outages</h2>"
+        '<table border="1" cellpadding="5" cellspacing="0">'
         "<thead><tr><th>Date</th><th>Time</th><th>Status</th><th>Location</th></tr></thead><tbody>"
-    ]
+    )
     for ev in events:
         date_cell = ev.get('date_str') or ev['start'].strftime("%d/%m/%Y")
         time_cell = f"{ev['start'].strftime('%H:%M')}–{ev['end'].strftime('%H:%M')}"
         status    = ev.get('status') or ('Cancelled' if ev.get('title','').startswith('Cancelled:') else 'Active')
         location  = ev.get('location', '')
-        html.append(
+        yield (
             "<tr>"
             f"<td>{date_cell}</td>"
             f"<td>{time_cell}</td>"
@@ -18,8 +19,10 @@ def format_events_as_html(events):
             f"<td>{location}</td>"
             "</tr>"
         )
-    html.append("</tbody></table>")
-    return "".join(html)
+    yield "</tbody></table>"
+
+def format_events_as_html(events):
+    return "".join(iter_events_html(events))
 
 def format_criteria_table(blocks):
     # blocks: list of tuples (title, url, area_kws, loc_kws)
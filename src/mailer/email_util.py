@@ -1,41 +1,53 @@
 # email/email_util.py
-import os, smtplib
+import os
+import threading
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
-from email.mime.base import MIMEBase
-from email import encoders
-from dotenv import load_dotenv
 
-load_dotenv()
+from src.mailer.smtp_pool import SMTPPool, deliver
+from src.utils.env_util import load_env
+
+load_env()
 SMTP_HOST = os.getenv('SMTP_HOST')
 SMTP_PORT = int(os.getenv('SMTP_PORT', 587))
 SMTP_USER = os.getenv('SMTP_USER')
 SMTP_PASSWORD = os.getenv('SMTP_PASSWORD')
 FROM_EMAIL = os.getenv('FROM_EMAIL')
+SMTP_STARTTLS = os.getenv('SMTP_STARTTLS', '1') not in ('0', 'false', 'False', '')
+SMTP_POOL_SIZE = int(os.getenv('SMTP_POOL_SIZE', 2))
+SMTP_IDLE_TIMEOUT = float(os.getenv('SMTP_IDLE_TIMEOUT', 60))
+SMTP_BATCH_SIZE = int(os.getenv('SMTP_BATCH_SIZE', 50))
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool():
+    """Process-wide SMTP connection pool, created on first send."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = SMTPPool(SMTP_HOST, SMTP_PORT, SMTP_USER, SMTP_PASSWORD,
+                             starttls=SMTP_STARTTLS, size=SMTP_POOL_SIZE,
+                             idle_timeout=SMTP_IDLE_TIMEOUT)
+        return _pool
 
-def send_email_with_attachment(subject, body_html, attachment_path, recipients, logger=None):
-    if not recipients:
-        if logger: logger.error("No recipients provided for this provider.")
-        return
+def set_pool(pool):
+    """Swap the process-wide pool (e.g. for a local SMTP sink); returns the previous one."""
+    global _pool
+    with _pool_lock:
+        prev, _pool = _pool, pool
+        return prev
+
+def build_message(subject, body_html, attachment_part=None):
+    """The MIME message (no To:) for body_html plus an optional prebuilt attachment part."""
     msg = MIMEMultipart()
     msg['From'] = FROM_EMAIL
-    msg['To'] = ", ".join(recipients)
     msg['Subject'] = subject
     msg.attach(MIMEText(body_html, 'html'))
+    if attachment_part is not None:
+        msg.attach(attachment_part)
+    return msg
 
-    if attachment_path:
-        with open(attachment_path, "rb") as f:
-            part = MIMEBase('application', 'octet-stream')
-            part.set_payload(f.read())
-            encoders.encode_base64(part)
-            part.add_header('Content-Disposition', f'attachment; filename="{os.path.basename(attachment_path)}"')
-            msg.attach(part)
-
-    try:
-        with smtplib.SMTP(SMTP_HOST, SMTP_PORT) as server:
-            server.starttls()
-            server.login(SMTP_USER, SMTP_PASSWORD)
-            server.sendmail(FROM_EMAIL, recipients, msg.as_string())
-            if logger: logger.info(f"Email sent to {', '.join(recipients)} with attachment {attachment_path}")
-    except Exception as e:
-        if logger: logger.error(f"Failed to send email: {str(e)}")
+def send_message(msg, recipients):
+    """Deliver a built message over the process-wide pool; returns the smtp_pool DeliveryReport."""
+    return deliver(get_pool(), FROM_EMAIL, recipients, msg, batch_size=SMTP_BATCH_SIZE)
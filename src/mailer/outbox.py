@@ -0,0 +1,339 @@
+# mailer/outbox.py
+"""
+Durable outbox for outgoing mail.
+
+Jobs enqueue a finished message and return; a background worker delivers
+it. Each message is one JSON file in OUTBOX_DIR (written to a temp file and
+renamed into place), so queued mail survives a restart and is picked up by
+the next runner or one-shot run. Files are named by a hash of the content
+(subject, body, recipients and the attached event set): the same message
+enqueued twice is stored and sent once, including within OUTBOX_DEDUPE_S
+after it was sent. The ICS bytes themselves are not hashed, since every
+render stamps a fresh DTSTAMP.
+
+A failed send is retried with exponential backoff plus jitter, only to the
+recipient batches that failed, until OUTBOX_MAX_ATTEMPTS; then the file is
+moved to OUTBOX_DIR/dead and logged. Processes sharing the directory claim a
+message with flock before sending it.
+
+Env:
+  OUTBOX_DIR            default ./logs/outbox
+  OUTBOX_MAX_ATTEMPTS   default 8
+  OUTBOX_BACKOFF_S      default 30 (first retry; doubles per attempt)
+  OUTBOX_MAX_BACKOFF_S  default 3600
+  OUTBOX_DEDUPE_S       default 86400
+  OUTBOX_POLL_S         default 5
+"""
+import email
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import random
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from src.utils.metrics import OUTBOX_DEPTH, OUTBOX_MESSAGES, stage
+
+OUTBOX_DIR = os.getenv("OUTBOX_DIR", "./logs/outbox")
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", 8))
+OUTBOX_BACKOFF_S = float(os.getenv("OUTBOX_BACKOFF_S", 30))
+OUTBOX_MAX_BACKOFF_S = float(os.getenv("OUTBOX_MAX_BACKOFF_S", 3600))
+OUTBOX_DEDUPE_S = float(os.getenv("OUTBOX_DEDUPE_S", 86400))
+OUTBOX_POLL_S = float(os.getenv("OUTBOX_POLL_S", 5))
+
+_SUFFIX = ".json"
+
+
+def message_key(subject, body_html, recipients, attachment_part=None, content_key=None):
+    """
+    Dedupe key of a message. `content_key` identifies the attachment's
+    content (render_cache.event_set_key); without it the attachment is hashed
+    with its DTSTAMP lines left out, so a re-render of the same events
+    still maps to the same key.
+    """
+    h = hashlib.sha256()
+    for part in (subject, body_html, "\x1f".join(sorted(recipients))):
+        h.update(part.encode("utf-8"))
+        h.update(b"\x1e")
+    if attachment_part is not None:
+        h.update((attachment_part.get_filename() or "").encode("utf-8"))
+        h.update(b"\x1e")
+        if content_key is not None:
+            h.update(content_key.encode("utf-8"))
+        else:
+            for line in attachment_part.get_payload(decode=True).splitlines():
+                if not line.startswith(b"DTSTAMP:"):
+                    h.update(line)
+    return h.hexdigest()
+
+
+def _default_send(msg, recipients):
+    from src.mailer.email_util import send_message
+    return send_message(msg, recipients)
+
+
+class Outbox:
+    def __init__(self, path=OUTBOX_DIR, send=_default_send, max_attempts=OUTBOX_MAX_ATTEMPTS,
+                 backoff=OUTBOX_BACKOFF_S, max_backoff=OUTBOX_MAX_BACKOFF_S, dedupe_window=OUTBOX_DEDUPE_S,
+                 workers=2, clock=time.time, jitter=random.random, logger=None):
+        self.path = os.path.expanduser(path)
+        self.send = send
+        self.max_attempts = max(1, max_attempts)
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.dedupe_window = dedupe_window
+        self.workers = max(1, workers)
+        self.clock = clock
+        self.jitter = jitter
+        self.logger = logger or logging.getLogger("service-outage-monitor")
+        for sub in ("", "sent", "dead"):
+            os.makedirs(os.path.join(self.path, sub), exist_ok=True)
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._inflight = set()
+        self._lock = threading.Lock()
+
+    # --- files ---
+    def _file(self, key, sub=""):
+        return os.path.join(self.path, sub, key + (_SUFFIX if sub != "sent" else ""))
+
+    def _write(self, path, entry):
+        fd, tmp = tempfile.mkstemp(prefix=".tmp-", suffix=_SUFFIX, dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as fp:
+                json.dump(entry, fp)
+                fp.flush()
+                os.fsync(fp.fileno())
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+    def pending(self):
+        """Keys of the queued messages."""
+        return sorted(n[:-len(_SUFFIX)] for n in os.listdir(self.path)
+                      if n.endswith(_SUFFIX) and not n.startswith("."))
+
+    def _recently_sent(self, key):
+        try:
+            return self.clock() - os.path.getmtime(self._file(key, "sent")) < self.dedupe_window
+        except OSError:
+            return False
+
+    # --- producer side ---
+    def enqueue(self, subject, body_html, recipients, attachment_part=None, content_key=None,
+                provider=None) -> Optional[str]:
+        """
+        Durably queue a message for `recipients` and wake the worker. Returns
+        its key, or None if the same message is already queued or was just sent.
+        `provider` labels the send's smtp stage timing.
+        """
+        from src.mailer.email_util import build_message
+        key = message_key(subject, body_html, recipients, attachment_part, content_key)
+        path = self._file(key)
+        if os.path.exists(path) or self._recently_sent(key):
+            OUTBOX_MESSAGES.labels("duplicate").inc()
+            self.logger.info(f"Outbox: {subject!r} already queued or sent ({key[:12]})")
+            return None
+        now = self.clock()
+        msg = build_message(subject, body_html, attachment_part=attachment_part)
+        self._write(path, {
+            "key": key, "provider": provider, "subject": subject, "recipients": list(recipients), "attempts": 0,
+            "created": now, "next_attempt": now, "last_error": None, "message": msg.as_string(),
+        })
+        OUTBOX_MESSAGES.labels("queued").inc()
+        OUTBOX_DEPTH.labels().set(len(self.pending()))
+        self._wake.set()
+        return key
+
+    # --- delivery side ---
+    def _delay(self, attempts):
+        # exponential, capped, with the upper half jittered so retries from many messages spread out
+        d = min(self.max_backoff, self.backoff * 2 ** (attempts - 1))
+        return d / 2 + self.jitter() * d / 2
+
+    def attempt(self, key) -> Optional[bool]:
+        """
+        Try to send one queued message if it is due: True if it went out, False
+        if it was rescheduled or dead-lettered, None if it wasn't ours to send
+        (not due, gone, or claimed by another process).
+        """
+        with self._lock:
+            if key in self._inflight:
+                return None
+            self._inflight.add(key)
+        try:
+            return self._attempt(key)
+        finally:
+            with self._lock:
+                self._inflight.discard(key)
+
+    def _attempt(self, key):
+        path = self._file(key)
+        try:
+            fp = open(path, "r", encoding="utf-8")
+        except FileNotFoundError:
+            return None
+        with fp:
+            try:
+                fcntl.flock(fp, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return None
+            if os.fstat(fp.fileno()).st_nlink == 0:  # sent and removed while we waited
+                return None
+            if self._recently_sent(key):  # sent, then interrupted before the file was removed
+                os.unlink(path)
+                return None
+            entry = json.load(fp)
+            if entry["next_attempt"] > self.clock():
+                return None
+
+            msg = email.message_from_string(entry["message"])
+            recipients = entry["recipients"]
+            try:
+                with stage("smtp", entry.get("provider") or "outbox"):
+                    report = self.send(msg, recipients)
+                failed = [r for batch, _ in report.errors for r in batch]
+                error = "; ".join(f"{type(e).__name__}: {e}" for _, e in report.errors) or None
+            except Exception as e:
+                failed, error = recipients, f"{type(e).__name__}: {e}"
+
+            if not failed:
+                # marker first: if we die before the unlink, the next attempt sees it and drops the file
+                with open(self._file(key, "sent"), "w"):
+                    pass
+                os.unlink(path)
+                OUTBOX_MESSAGES.labels("sent").inc()
+                lat = ", ".join(f"{t * 1000:.0f}ms" for t in report.latencies)
+                self.logger.info(f"Outbox: sent {entry['subject']!r} to {len(recipients)} recipient(s) "
+                                 f"after {entry['attempts'] + 1} attempt(s) (latency {lat})")
+                return True
+
+            entry.update(recipients=failed, attempts=entry["attempts"] + 1, last_error=error)
+            if entry["attempts"] >= self.max_attempts:
+                self._write(self._file(key, "dead"), entry)
+                os.unlink(path)
+                OUTBOX_MESSAGES.labels("dead").inc()
+                self.logger.error(f"Outbox: giving up on {entry['subject']!r} to {', '.join(failed)} "
+                                  f"after {entry['attempts']} attempt(s): {error}")
+                return False
+            delay = self._delay(entry["attempts"])
+            entry["next_attempt"] = self.clock() + delay
+            self._write(path, entry)
+            OUTBOX_MESSAGES.labels("retry").inc()
+            self.logger.warning(f"Outbox: {entry['subject']!r} to {len(failed)} recipient(s) failed "
+                                f"({error}); retry {entry['attempts']} in {delay:.0f}s")
+            return False
+
+    def prune_sent(self):
+        cutoff = self.clock() - self.dedupe_window
+        sent_dir = os.path.join(self.path, "sent")
+        for name in os.listdir(sent_dir):
+            p = os.path.join(sent_dir, name)
+            try:
+                if os.path.getmtime(p) < cutoff:
+                    os.unlink(p)
+            except OSError:
+                pass
+
+    def drain(self) -> int:
+        """Attempt every queued message that is due, concurrently; returns how many were sent."""
+        keys = self.pending()
+        sent = 0
+        if keys:
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(keys)),
+                                    thread_name_prefix="outbox") as ex:
+                sent = sum(1 for ok in ex.map(self.attempt, keys) if ok)
+        OUTBOX_DEPTH.labels().set(len(self.pending()))
+        return sent
+
+    def flush(self, timeout=30.0) -> bool:
+        """Drain until nothing is due (retries scheduled later stay queued); False on timeout."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            self.drain()
+            now = self.clock()
+            if not any(self._due(k, now) for k in self.pending()):
+                return True
+            time.sleep(0.05)
+        return False
+
+    def _due(self, key, now):
+        try:
+            with open(self._file(key), "r", encoding="utf-8") as fp:
+                return json.load(fp)["next_attempt"] <= now
+        except (OSError, ValueError):
+            return False
+
+    # --- worker ---
+    def _loop(self, poll):
+        while not self._stop.is_set():
+            try:
+                self.drain()
+                self.prune_sent()
+            except Exception as e:
+                self.logger.exception(f"Outbox worker error: {e}")
+            self._wake.wait(poll)
+            self._wake.clear()
+
+    def start(self, poll=OUTBOX_POLL_S):
+        """Deliver in a background thread: right after each enqueue, and every `poll` seconds for retries."""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, args=(poll,), daemon=True, name="outbox")
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=10.0):
+        """Stop the worker after its current pass; anything unsent stays queued on disk."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def default_outbox():
+    """Process-wide outbox at $OUTBOX_DIR."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            from src.mailer.email_util import SMTP_POOL_SIZE
+            _default = Outbox(workers=SMTP_POOL_SIZE)
+        return _default
+
+
+def set_default_outbox(outbox):
+    """Swap the process-wide outbox (e.g. a throwaway one for load tests); returns the previous one."""
+    global _default
+    with _default_lock:
+        prev, _default = _default, outbox
+        return prev
+
+
+def queue_email(subject, body_html, recipients, logger=None, attachment_part=None, content_key=None,
+                provider=None) -> bool:
+    """Queue a message on the default outbox; True once it is safely on disk (or already was)."""
+    if not recipients:
+        if logger: logger.error("No recipients provided for this provider.")
+        return False
+    try:
+        default_outbox().enqueue(subject, body_html, recipients, attachment_part=attachment_part,
+                                 content_key=content_key, provider=provider)
+    except OSError as e:
+        if logger: logger.error(f"Failed to queue email: {e}")
+        return False
+    return True
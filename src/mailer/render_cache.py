@@ -0,0 +1,81 @@
+# mailer/render_cache.py
+"""
+Content-addressed cache of rendered outputs for an event set.
+
+Providers that match the same outages produce byte-identical HTML tables and
+ICS attachments. The cache keys those renders by a hash of the event set, so
+the table, the ICS bytes and the base64-encoded MIME part are each built once
+and handed to the mailer in memory.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from email import encoders
+from email.mime.base import MIMEBase
+
+from src.ics_generator.calendar_util import build_ics
+from src.mailer.email_format_util import format_events_as_html
+
+_EVENT_FIELDS = ("uid", "start", "end", "title", "location", "description", "status", "sequence", "date_str", "url")
+
+
+def event_set_key(events):
+    h = hashlib.sha256()
+    for ev in events:
+        for f in _EVENT_FIELDS:
+            h.update(repr(ev.get(f)).encode("utf-8"))
+            h.update(b"\x1f")
+        h.update(b"\x1e")
+    return h.hexdigest()
+
+
+def ics_attachment(ics_bytes, filename):
+    part = MIMEBase('application', 'octet-stream')
+    part.set_payload(ics_bytes)
+    encoders.encode_base64(part)
+    part.add_header('Content-Disposition', f'attachment; filename="{filename}"')
+    return part
+
+
+@dataclass(frozen=True)
+class Rendered:
+    key: str
+    table_html: str
+    ics_bytes: bytes
+    attachment: MIMEBase  # already base64-encoded; safe to attach to many messages
+    filename: str
+
+
+class RenderCache:
+    def __init__(self, maxsize=64):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def render(self, events, filename):
+        key = (event_set_key(events), filename)
+        with self._lock:
+            r = self._items.get(key)
+            if r is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return r
+            self.misses += 1
+
+        ics_bytes = build_ics(events)
+        r = Rendered(key[0], format_events_as_html(events), ics_bytes, ics_attachment(ics_bytes, filename), filename)
+        with self._lock:
+            self._items[key] = r
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+        return r
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+render_cache = RenderCache()
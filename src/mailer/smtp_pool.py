@@ -0,0 +1,145 @@
+# mailer/smtp_pool.py
+"""
+Pooled, authenticated SMTP connections.
+
+Connections are opened (connect + STARTTLS + login) once and reused across
+jobs. A connection idle longer than `idle_timeout` is probed with NOOP before
+reuse and replaced if the server has dropped it. `deliver` splits large
+recipient lists into batches and sends them concurrently over the pool.
+"""
+import copy
+import smtplib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+
+class SMTPPool:
+    def __init__(self, host, port=587, user=None, password=None, starttls=True,
+                 size=2, idle_timeout=60.0, timeout=30.0):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.starttls = starttls
+        self.size = max(1, size)
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self._idle = []  # [(smtp, last_used)]
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.size)
+
+    def _connect(self):
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.starttls:
+                server.starttls()
+            if self.user:
+                server.login(self.user, self.password)
+        except Exception:
+            _close(server)
+            raise
+        return server
+
+    def _checkout(self):
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                server, last_used = self._idle.pop()
+            if time.monotonic() - last_used < self.idle_timeout:
+                return server
+            try:
+                if server.noop()[0] == 250:
+                    return server
+            except OSError:  # SMTPException included
+                pass
+            _close(server)
+        return self._connect()
+
+    @contextmanager
+    def connection(self):
+        """Borrow a live connection; it is discarded instead of returned if the block raises."""
+        with self._slots:
+            server = self._checkout()
+            try:
+                yield server
+            except Exception:
+                _close(server)
+                raise
+            with self._lock:
+                self._idle.append((server, time.monotonic()))
+
+    def sendmail(self, from_addr, recipients, msg):
+        """Send one message; retries once on a connection the server dropped. Returns latency in seconds."""
+        t0 = time.perf_counter()
+        for attempt in (1, 2):
+            try:
+                with self.connection() as server:
+                    server.sendmail(from_addr, recipients, msg)
+                return time.perf_counter() - t0
+            except smtplib.SMTPServerDisconnected:
+                if attempt == 2:
+                    raise
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for server, _ in idle:
+            _close(server)
+
+
+def _close(server):
+    try:
+        server.quit()
+    except Exception:
+        try:
+            server.close()
+        except Exception:
+            pass
+
+
+def chunks(items, size):
+    size = max(1, size)
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+@dataclass
+class DeliveryReport:
+    sent: int = 0
+    failed: int = 0
+    latencies: list = field(default_factory=list)  # seconds per sent message
+    errors: list = field(default_factory=list)
+
+    @property
+    def ok(self):
+        return self.failed == 0 and self.sent > 0
+
+
+def deliver(pool, from_addr, recipients, msg, batch_size=50):
+    """
+    Send `msg` (an email.message.Message) to `recipients` in batches of
+    `batch_size`, each batch as its own message with only that batch in To:,
+    concurrently over `pool`. `msg` itself is left untouched.
+    """
+    batches = chunks(list(recipients), batch_size)
+    msg = copy.deepcopy(msg)  # the caller may reuse (or share) its message
+    payloads = []
+    for batch in batches:
+        del msg['To']
+        msg['To'] = ", ".join(batch)
+        payloads.append((batch, msg.as_string()))
+
+    report = DeliveryReport()
+    with ThreadPoolExecutor(max_workers=min(pool.size, len(payloads)) or 1) as ex:
+        futures = [ex.submit(pool.sendmail, from_addr, batch, data) for batch, data in payloads]
+        for (batch, _), fut in zip(payloads, futures):
+            try:
+                report.latencies.append(fut.result())
+                report.sent += 1
+            except Exception as e:
+                report.failed += 1
+                report.errors.append((batch, e))
+    return report
@@ -1,88 +1,101 @@
 # main.py
-from datetime import datetime
+import threading
+import uuid
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from html import escape
-import yaml
+from urllib.parse import urlparse
 
-from src.utils.my_logging import setup_logging
-from src.utils.env_util import recipients_for_provider
-from src.scraping.ttec_scraper import scrape_outages
-from src.ics_generator.calendar_util import create_event, save_ics_file
-from src.mailer.email_util import send_email_with_attachment
-from src.mailer.email_format_util import format_events_as_html, format_criteria_table
+from src.utils.config_util import load_snapshot
+from src.utils.my_logging import log_context, setup_logging
+from src.utils.env_util import load_env
+from src import pipeline
+from src.mailer.outbox import default_outbox
+from src.state.outage_store import default_store
+from src.scraping import parse_pool
 
-logger = setup_logging("service-outage-monitor")
+# handlers are attached by setup_logging() in main(), not at import time
+logger = logging.getLogger("service-outage-monitor")
 
-def load_config(path="config/config.yaml"):
-    with open(path, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f)
-
-def run_for_provider(provider: dict):
+def run_for_provider(provider: dict, deliver=True):
     provider_id = provider["id"]
-    title       = provider["title"]
-    url         = provider["url"]
-    area_kws    = provider.get("area_keywords", [])
-    loc_kws     = provider.get("location_keywords", [])
-    inactive_kw = provider.get("status_inactive_keyword", "CANCELLED")
-
-    recipients  = recipients_for_provider(provider_id)
-    logger.info(f"Starting to scrape {url} (provider_id={provider_id}, recipients={len(recipients)})")
-
-    # scrape
-    outages = scrape_outages(url, area_kws, loc_kws, inactive_kw)
-
-    # build events
-    events = []
-    for o in outages:
-        ev = create_event(
-            date=o['date'],
-            time=o['time'],
-            title=title,
-            status=o['status'],
-            location=o['location'],
-            description=o['description'],
-            logger=logger
-        )
-        if ev:
-            events.append(ev)
-
-    if not events:
-        logger.info(f"No matching outages for provider {provider_id}. No email/ICS.")
+    logger.info(f"Starting to scrape {provider['url']} (provider_id={provider_id})")
+
+    report = pipeline.prepare(provider, logger=logger, render=deliver)
+    logger.info(f"Changes for {provider_id}: {report.delta.counts()}")
+    if not deliver:
+        # digest mode: main() sends every provider's report together
+        return report
+    pipeline.deliver(report, logger=logger)
+    if not report.events:
+        logger.info(f"No new or changed outages for provider {provider_id}. No email/ICS.")
         return None
-
-    # save ICS: one per provider per run date
-    ics_filename = f"/root/projects/logs/{provider_id}_{datetime.now().strftime('%Y%m%d')}.ics"
-    save_ics_file(events, ics_filename, logger=logger)
-
-    # email body
-    table_html = format_events_as_html(events)
-    criteria_html = format_criteria_table([(title, url, area_kws, loc_kws)])
-
-    subject = f"{title} Outages Report ({len(events)}) — {provider_id}"
-    body_html = (
-        "<p>Dear User,</p>"
-        "<p>Please find below the scheduled outage details:</p>"
-        f"{table_html}"
-        "<br/>"
-        f"{criteria_html}"
-        "<p>Best regards,<br/>Service Outage Monitor</p>"
-    )
-
-    # send to this provider's list
-    send_email_with_attachment(subject, body_html, attachment_path=ics_filename, recipients=recipients, logger=logger)
-    return {"provider_id": provider_id, "ics": ics_filename, "recipients": recipients, "events": len(events)}
-
-def main():
-    cfg = load_config()
-    providers = cfg.get("websites", [])
-
-    results = []
-    for p in providers:
-        res = run_for_provider(p)
-        if res:
-            results.append(res)
-
+    logger.info(f"ICS file saved: {report.ics_path}")
+    return {"provider_id": provider_id, "ics": report.ics_path, "recipients": report.recipients,
+            "events": len(report.events)}
+
+def run_providers(providers, workers=1, per_host=2, deliver=True):
+    """
+    Run providers on a thread pool, at most `per_host` at a time against any one
+    site. Results come back in config order; a provider that raises is logged and
+    yields None instead of aborting the others. With deliver=False the results
+    are the providers' unsent reports.
+    """
+    host_locks = {}
+    guard = threading.Lock()
+    run_id = uuid.uuid4().hex[:12]
+
+    def _host_lock(p):
+        host = urlparse(p.get("url", "")).netloc.lower()
+        with guard:
+            return host_locks.setdefault(host, threading.BoundedSemaphore(max(1, per_host)))
+
+    def _run(p):
+        with _host_lock(p), log_context(provider_id=p.get("id"), run_id=run_id):
+            return run_for_provider(p, deliver=deliver)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="provider") as pool:
+        futures = [pool.submit(_run, p) for p in providers]
+        results = []
+        for p, fut in zip(providers, futures):
+            try:
+                results.append(fut.result())
+            except Exception:
+                logger.exception(f"Provider {p.get('id')} failed")
+                results.append(None)
+    return results
+
+def main(workers=None, per_host=None):
+    load_env()
+    setup_logging("service-outage-monitor")
+    # validates the file and registers its `extractors:`
+    snapshot = load_snapshot()
+    cfg = snapshot.raw
+    providers = [spec.config for spec in snapshot.providers.values()]
+    conc = cfg.get("concurrency") or {}
+    if "parse_workers" in conc:
+        parse_pool.configure(conc["parse_workers"])
+    workers = workers or conc.get("workers", 1)
+    per_host = per_host or conc.get("per_host", 2)
+
+    if snapshot.digest:
+        reports = [r for r in run_providers(providers, workers, per_host, deliver=False) if r]
+        pipeline.deliver_digest(reports, logger=logger)
+        results = [r for r in reports if r.events]
+    else:
+        results = [r for r in run_providers(providers, workers, per_host) if r]
+
+    # one-shot: send what this run queued (plus anything left from before);
+    # messages still failing stay in the outbox for the next run or the runner
+    default_outbox().flush()
+    default_store().prune()
     if not results:
         logger.info("Run complete: no providers produced events.")
 
 if __name__ == "__main__":
-    main()
+    import argparse
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, help="Providers to run in parallel (default: config concurrency.workers)")
+    parser.add_argument("--per-host", type=int, help="Max concurrent providers per site (default: config concurrency.per_host)")
+    args = parser.parse_args()
+    main(workers=args.workers, per_host=args.per_host)
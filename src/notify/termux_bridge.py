@@ -4,39 +4,144 @@
 Termux bridge client (toast + notify) for proot/Ubuntu → Termux:API.
 No external deps. Safe no-op on failures or when disabled.
 
+toast()/notify() only enqueue: a background dispatcher thread delivers over
+one keep-alive HTTP connection, so an unreachable bridge never blocks a job or
+a logging call. Identical notifications already queued, or sent within the
+coalesce window, are dropped; when the queue is full the oldest entry goes.
+
 Env:
   TT_BRIDGE_URL   default http://127.0.0.1:8787
   TT_BRIDGE_TOKEN default "super-secret-change-me"
   TT_BRIDGE_ENABLED default "1" (set "0" to disable)
+  TT_BRIDGE_QUEUE_MAX default 100
+  TT_BRIDGE_COALESCE_S default 5
 """
 from __future__ import annotations
-import json, os, urllib.request, urllib.error, logging, functools, time
+import json, os, urllib.request, urllib.error, logging, functools, time, threading, atexit
+import http.client
+from collections import deque
+from urllib.parse import urlsplit
 from typing import Optional, Dict, Any, Callable
 
 BRIDGE_URL   = os.environ.get("TT_BRIDGE_URL",   "http://127.0.0.1:8787")
 BRIDGE_TOKEN = os.environ.get("TT_BRIDGE_TOKEN", "super-secret-change-me")
 ENABLED      = os.environ.get("TT_BRIDGE_ENABLED", "1") not in ("0", "false", "False", "")
+QUEUE_MAX    = int(os.environ.get("TT_BRIDGE_QUEUE_MAX", "100"))
+COALESCE_S   = float(os.environ.get("TT_BRIDGE_COALESCE_S", "5"))
+
+class _Dispatcher:
+    """Bounded drop-oldest queue drained by one daemon thread over a keep-alive connection."""
+
+    def __init__(self, base_url: str, maxlen: int = QUEUE_MAX, coalesce_s: float = COALESCE_S,
+                 timeout: float = 2.0):
+        u = urlsplit(base_url)
+        self._scheme, self._host, self._port = u.scheme or "http", u.hostname or "127.0.0.1", u.port
+        self._prefix = u.path.rstrip("/")
+        self._timeout = timeout
+        self._coalesce_s = coalesce_s
+        self._queue: deque = deque(maxlen=max(1, maxlen))
+        self._recent: Dict[tuple, float] = {}  # key -> last sent (monotonic)
+        self._cv = threading.Condition()
+        self._conn: Optional[http.client.HTTPConnection] = None
+        self._thread: Optional[threading.Thread] = None
+        self._busy = False
+        self.sent = self.failed = self.coalesced = self.dropped = 0
+
+    def submit(self, path: str, payload: Dict[str, Any]) -> bool:
+        key = (path, json.dumps(payload, sort_keys=True))
+        now = time.monotonic()
+        with self._cv:
+            if any(k == key for k, _ in self._queue) or now - self._recent.get(key, -1e9) < self._coalesce_s:
+                self.coalesced += 1
+                return True
+            if len(self._queue) == self._queue.maxlen:
+                self.dropped += 1  # deque drops the oldest on append
+            self._queue.append((key, payload))
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="termux-bridge", daemon=True)
+                self._thread.start()
+            self._cv.notify()
+        return True
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until the queue is drained (used at exit and by the CLI)."""
+        deadline = time.monotonic() + timeout
+        with self._cv:
+            while self._queue or self._busy:
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    return False
+                self._cv.wait(left)
+        return True
+
+    def _run(self) -> None:
+        while True:
+            with self._cv:
+                while not self._queue:
+                    self._busy = False
+                    self._cv.notify_all()
+                    self._cv.wait()
+                key, payload = self._queue.popleft()
+                self._busy = True
+            ok = self._post(key[0], payload)
+            with self._cv:
+                if ok:
+                    self.sent += 1
+                    now = time.monotonic()
+                    self._recent[key] = now
+                    if len(self._recent) > 1000:
+                        self._recent = {k: t for k, t in self._recent.items() if now - t < self._coalesce_s}
+                else:
+                    self.failed += 1
+
+    def _connection(self) -> http.client.HTTPConnection:
+        if self._conn is None:
+            cls = http.client.HTTPSConnection if self._scheme == "https" else http.client.HTTPConnection
+            self._conn = cls(self._host, self._port, timeout=self._timeout)
+        return self._conn
 
-def _call(path: str, payload: Dict[str, Any], timeout: float = 2.0) -> bool:
-    """Best-effort call to /toast or /notify. Returns True on 2xx, False otherwise."""
+    def _post(self, path: str, payload: Dict[str, Any]) -> bool:
+        body = json.dumps(payload).encode()
+        headers = {"Content-Type": "application/json", "X-TT-Token": BRIDGE_TOKEN}
+        for attempt in (1, 2):  # a kept-alive socket may have been closed by the bridge
+            try:
+                conn = self._connection()
+                conn.request("POST", self._prefix + path, body=body, headers=headers)
+                r = conn.getresponse()
+                r.read()
+                if r.will_close:
+                    self._close()
+                return 200 <= r.status < 300
+            except Exception:
+                self._close()
+                if attempt == 2:
+                    return False
+        return False
+
+    def _close(self) -> None:
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+            self._conn = None
+
+_dispatcher = _Dispatcher(BRIDGE_URL)
+atexit.register(lambda: _dispatcher.flush(timeout=1.0))
+
+def _call(path: str, payload: Dict[str, Any]) -> bool:
+    """Queue a best-effort call to /toast or /notify. Returns immediately; never raises."""
     if not ENABLED:
         return False
     try:
-        data = json.dumps(payload).encode()
-        req = urllib.request.Request(
-            BRIDGE_URL.rstrip("/") + path,
-            data=data,
-            headers={
-                "Content-Type": "application/json",
-                "X-TT-Token": BRIDGE_TOKEN
-            }
-        )
-        with urllib.request.urlopen(req, timeout=timeout) as r:
-            _ = r.read()
-        return True
+        return _dispatcher.submit(path, payload)
     except Exception:
         return False  # never raise into your app
 
+def flush(timeout: float = 5.0) -> bool:
+    """Block until queued notifications are delivered (or dropped), up to `timeout`."""
+    return _dispatcher.flush(timeout)
+
 def toast(text: str) -> bool:
     """Show a quick toast."""
     return _call("/toast", {"text": text})
@@ -145,3 +250,4 @@ if __name__ == "__main__":
         toast(args.toast)
     else:
         notify(args.notify[0], args.notify[1], priority=args.priority, sticky=args.sticky)
+    flush()
@@ -0,0 +1,243 @@
+# pipeline.py
+"""
+The per-provider run shared by src/main.py and runner.py.
+
+The scrape side is a chain of lazy generator stages:
+
+    rows -> outages (keyword filter) -> changes (vs. the outage store) -> events
+
+Rows come off the page one at a time (see ttec_scraper.iter_page_rows), so
+the first matching event exists before the rest of the page is parsed; the
+rows are kept on the cached page once it has been read through, and later
+runs against the same body start from them. Only the new/changed events are
+collected, and rendering streams them into the HTML table and ICS chunks.
+
+`prepare()` runs the chain and renders; `deliver()` queues the email on the
+durable outbox (src/mailer/outbox.py) and records the delta, and
+`deliver_digest()` does the same for several reports at once with one
+combined email per recipient. Entry points add their own logging,
+notifications and metrics around them.
+"""
+import logging
+import os
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+from src.ics_generator.calendar_util import iter_events, update_rolling_calendar
+from src.ics_generator.ics_stream import atomic_write, write_calendar
+from src.mailer.email_format_util import format_criteria_table
+from src.mailer.outbox import queue_email
+from src.mailer.render_cache import Rendered, render_cache
+from src.scraping.keyword_matcher import compile_matcher
+from src.scraping.ttec_scraper import fetch_page, iter_matches, iter_outages, iter_page_rows
+from src.state.outage_store import UNCHANGED, Delta, default_store
+from src.utils.env_util import recipients_for_provider
+from src.utils.metrics import StageTimer, stage
+
+TT_TZ = ZoneInfo("America/Port_of_Spain")
+OUTPUT_DIR = "./logs"
+CALENDAR_DIR = os.getenv("CALENDAR_DIR", "./logs/calendars")
+
+_logger = logging.getLogger("service-outage-monitor")
+
+
+def rolling_calendar_path(provider_id: str) -> str:
+    return os.path.join(os.path.expanduser(CALENDAR_DIR), f"{provider_id}.ics")
+
+
+def ics_filename(title: str, day: Optional[datetime] = None) -> str:
+    day = day or datetime.now(TT_TZ)
+    return f"service_outage_{title.lower().replace(' ', '_')}_{day.strftime('%Y%m%d')}.ics"
+
+
+@dataclass
+class Report:
+    provider: dict
+    label: str
+    recipients: list
+    delta: Delta
+    events: list = field(default_factory=list)
+    rendered: Optional[Rendered] = None
+    ics_path: Optional[str] = None
+
+    @property
+    def title(self) -> str:
+        return self.provider["title"]
+
+    @property
+    def criteria(self) -> tuple:
+        p = self.provider
+        return p["title"], p["url"], p.get("area_keywords", []), p.get("location_keywords", [])
+
+
+# --- stages ---
+def source_rows(url, label, extractor=None):
+    """Rows for `url`, streamed off the (cached) page."""
+    with stage("fetch", label):
+        page = fetch_page(url)
+    return iter_page_rows(page, extractor)
+
+
+def pending_events(provider, rows, delta, matcher=None, store=None, logger=None, timer=None, prefiltered=False):
+    """
+    rows -> matching outages -> changes (appended to `delta`) -> events for the
+    new, changed and cancelled ones; lazy end to end. With a StageTimer each
+    stage (filter, diff, create_event) is timed on its own. `prefiltered` rows
+    were already matched against the provider's keywords (see split_rows).
+    """
+    label = provider.get("id") or provider["title"]
+    inactive_kw = provider.get("status_inactive_keyword", "CANCELLED")
+    store = store or default_store()
+    timed = timer.wrap if timer is not None else (lambda name, it: it)
+
+    if prefiltered:
+        outages = iter_outages(rows, inactive_kw)
+    else:
+        matcher = matcher or compile_matcher(provider.get("area_keywords", []),
+                                             provider.get("location_keywords", []))
+        outages = timed("filter", iter_matches(rows, matcher, inactive_kw, label))
+    # identities (and UIDs) come from the page, so providers on one URL share them
+    changes = store.iter_diff(delta, outages, inactive_kw, source=provider["url"])
+    # only new / changed / cancelled outages are reported; UIDs stay stable across runs
+    pending = timed("diff", (c.outage.replace(uid=c.uid, sequence=c.sequence)
+                             for c in changes if c.kind != UNCHANGED))
+    return timed("create_event", iter_events(pending, provider["title"], logger=logger))
+
+
+# --- run ---
+def prepare(provider: dict, matcher=None, rows=None, logger=None, render=True, prefiltered=False) -> Report:
+    """
+    Fetch (unless `rows` are given), filter (unless they are `prefiltered`),
+    diff and build events for one provider, then render them and write the
+    day's ICS file (named by provider id) and the rolling calendar. Nothing is sent and nothing is
+    committed. With render=False (digest mode) the email table and attachment
+    are left to the digest.
+    """
+    logger = logger or _logger
+    label = provider.get("id") or provider["title"]
+    report = Report(provider, label, recipients_for_provider(label) if provider.get("id") else [],
+                    Delta(label))
+
+    timer = StageTimer(label)
+    if rows is None:
+        # a fetch group's rows were parsed (and timed) before they got here
+        rows = timer.wrap("parse", source_rows(provider["url"], label, provider.get("extractor")))
+    try:
+        report.events = list(pending_events(provider, rows, report.delta, matcher=matcher, logger=logger,
+                                            timer=timer, prefiltered=prefiltered))
+    finally:
+        timer.observe()
+    if not report.events:
+        return report
+
+    if render:
+        with stage("render", label):
+            report.rendered = render_cache.render(report.events, ics_filename(report.title))
+    with stage("build_ics", label):
+        # on disk by provider id: providers may share a title
+        path = os.path.expanduser(os.path.join(OUTPUT_DIR, ics_filename(label)))
+        if report.rendered is not None:
+            report.ics_path = atomic_write(path, lambda fp: fp.write(report.rendered.ics_bytes))
+        else:
+            report.ics_path = atomic_write(path, lambda fp: write_calendar(fp, report.events))
+        update_rolling_calendar(report.events, rolling_calendar_path(label), logger=logger)
+    return report
+
+
+def email_body(table_html: str, criteria: list) -> str:
+    return (
+        "<p>Dear User,</p>"
+        "<p>Please find below the scheduled outage details:</p>"
+        f"{table_html}<br/>{format_criteria_table(criteria)}"
+        "<p>Best regards,<br/>Service Outage Monitor</p>"
+    )
+
+
+def deliver(report: Report, logger=None) -> bool:
+    """
+    Queue a prepared report's email for its recipients and record its delta.
+    Once queued the outbox owns delivery (retries included); if queueing
+    failed the delta stays pending for the next run. Reports without events,
+    or without recipients, are simply recorded.
+    """
+    logger = logger or _logger
+    store = default_store()
+    if not report.events:
+        store.commit(report.delta)
+        return False
+    queued = False
+    if report.recipients:
+        with stage("enqueue", report.label):
+            queued = queue_email(
+                provider=report.label,
+                subject=f"{report.title} — Scheduled Outages ({len(report.events)})",
+                body_html=email_body(report.rendered.table_html, [report.criteria]),
+                recipients=report.recipients,
+                logger=logger,
+                attachment_part=report.rendered.attachment,
+                content_key=report.rendered.key,
+            )
+    if queued or not report.recipients:
+        store.commit(report.delta)
+    return queued
+
+
+def merge_events(reports) -> list:
+    """Events of several reports in report order; an outage reported by two providers appears once."""
+    merged = {}
+    for r in reports:
+        for ev in r.events:
+            merged.setdefault(ev.uid, ev)
+    return list(merged.values())
+
+
+def deliver_digest(reports, logger=None) -> int:
+    """
+    Email the reports of one scheduling window as a digest: each recipient
+    gets one message with a combined events table, one criteria table and one
+    merged ICS covering every report they subscribe to. Recipients with the
+    same subscriptions share the message (and its render). A report's delta
+    is recorded once every digest that carries it is queued. Returns the
+    number of digests queued.
+    """
+    logger = logger or _logger
+    store = default_store()
+    audiences = {}  # (report index, ...) -> [recipient, ...]
+    for addr in dict.fromkeys(a for r in reports for a in r.recipients):
+        subs = tuple(i for i, r in enumerate(reports) if r.events and addr in r.recipients)
+        if subs:
+            audiences.setdefault(subs, []).append(addr)
+
+    failed, queued = set(), 0
+    day = datetime.now(TT_TZ)
+    for subs, recipients in audiences.items():
+        subset = [reports[i] for i in subs]
+        events = merge_events(subset)
+        label = "+".join(r.label for r in subset)
+        name = ics_filename(subset[0].title if len(subset) == 1 else "digest", day)
+        with stage("render", label):
+            rendered = render_cache.render(events, name)
+        titles = ", ".join(dict.fromkeys(r.title for r in subset))
+        with stage("enqueue", label):
+            ok = queue_email(
+                provider=label,
+                subject=f"{titles} — Scheduled Outages ({len(events)})",
+                body_html=email_body(rendered.table_html, [r.criteria for r in subset]),
+                recipients=recipients,
+                logger=logger,
+                attachment_part=rendered.attachment,
+                content_key=rendered.key,
+            )
+        if ok:
+            queued += 1
+        else:
+            failed.update(subs)
+    logger.info(f"Digest: {queued}/{len(audiences)} message(s) queued for {len(reports)} report(s)")
+
+    for i, r in enumerate(reports):
+        # kept pending (and retried next window) if any digest carrying it couldn't be queued
+        if i not in failed:
+            store.commit(r.delta)
+    return queued
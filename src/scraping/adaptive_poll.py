@@ -0,0 +1,145 @@
+# scraping/adaptive_poll.py
+"""
+Change-driven polling for one page.
+
+Each probe is as cheap as the server allows: a HEAD whose ETag /
+Last-Modified match the last probe means "unchanged" without a download
+(Content-Length alone is not trusted; a same-length edit would go unseen).
+Otherwise the page is revalidated through the shared page cache (a
+conditional GET, so still a 304 when validators work) and a hash of the
+parsed outage rows decides whether anything that matters changed; edits
+elsewhere on the page don't count.
+
+While the page is stable the interval grows by `backoff` per probe up to
+`max_interval`, capped at a quarter of the learned update cadence (an EWMA of
+the gaps between observed changes), so a page that changes every few days is
+still checked several times in between. A change resets it to `min_interval`.
+"""
+import hashlib
+import time
+from typing import Callable, Optional
+from urllib.parse import urlparse
+
+import requests
+
+from src.scraping import http_client, ttec_scraper
+from src.utils.config_util import PollSettings
+from src.utils.metrics import POLL_INTERVAL, POLL_PROBES
+
+# weight of the newest gap in the cadence estimate
+CADENCE_ALPHA = 0.3
+# probes per learned cadence while the page is stable
+PROBES_PER_CADENCE = 4
+
+_VALIDATORS = ("ETag", "Last-Modified")
+
+
+def rows_hash(rows):
+    h = hashlib.sha1()
+    for row in rows:
+        h.update("\x1f".join(row).encode("utf-8"))
+        h.update(b"\x1e")
+    return h.hexdigest()
+
+
+class AdaptivePoller:
+    def __init__(self, url: str, settings: PollSettings, state: Optional[dict] = None,
+                 session_head: Callable = http_client.head, clock: Callable[[], float] = time.time,
+                 extractor: Optional[str] = None):
+        self.url = url
+        self.extractor = extractor
+        self.settings = settings
+        self._head = session_head
+        self._clock = clock
+        self._host = urlparse(url).netloc
+        self.validators = None    # last HEAD validators
+        self.row_hash = None      # hash of the rows last seen
+        self.last_change = None   # wall time of the last observed change
+        self.cadence = None       # learned seconds between changes
+        self.interval = settings.min_interval
+        self.next_due = 0.0
+        if state:
+            self.load(state)
+
+    # --- persistence ---
+    def state(self) -> dict:
+        return {"validators": self.validators, "row_hash": self.row_hash, "last_change": self.last_change,
+                "cadence": self.cadence, "interval": self.interval, "next_due": self.next_due}
+
+    def load(self, state: dict):
+        for k in ("validators", "row_hash", "last_change", "cadence"):
+            setattr(self, k, state.get(k))
+        self.interval = self._clamp(state.get("interval") or self.settings.min_interval)
+        self.next_due = state.get("next_due") or 0.0
+
+    def rewind(self, state: dict):
+        """
+        Forget what was seen since `state` (an earlier state()), so the next
+        probe reports the same change again, e.g. when processing it failed.
+        """
+        self.validators, self.row_hash = state.get("validators"), state.get("row_hash")
+
+    def update_settings(self, settings: PollSettings):
+        self.settings = settings
+        self.interval = self._clamp(self.interval)
+        self.next_due = min(self.next_due, self._clock() + self.interval)
+
+    # --- probing ---
+    def due(self, now: Optional[float] = None) -> bool:
+        return (self._clock() if now is None else now) >= self.next_due
+
+    def _head_validators(self):
+        try:
+            r = self._head(self.url, headers=ttec_scraper.HEADERS, timeout=15, allow_redirects=True)
+        except requests.RequestException:
+            return None
+        if r.status_code >= 400:
+            return None
+        found = {k: r.headers[k] for k in _VALIDATORS if r.headers.get(k)}
+        return found or None
+
+    def probe(self):
+        """One probe; returns the freshly parsed rows if the row region changed, else None."""
+        validators = self._head_validators()
+        if validators and validators == self.validators and self.row_hash is not None:
+            POLL_PROBES.labels(self._host, "head_unchanged").inc()
+            return None
+
+        page = ttec_scraper.fetch_page(self.url, max_age=0)
+        rows = ttec_scraper.page_rows(page, self.extractor)
+        digest = page.memo(("rows_hash", self.extractor), lambda _: rows_hash(rows))
+        self.validators = validators
+        if digest == self.row_hash:
+            POLL_PROBES.labels(self._host, "rows_unchanged").inc()
+            return None
+        self.row_hash = digest
+        POLL_PROBES.labels(self._host, "changed").inc()
+        return rows
+
+    def _clamp(self, interval):
+        cap = self.settings.max_interval
+        if self.cadence:
+            cap = min(cap, self.cadence / PROBES_PER_CADENCE)
+        return max(self.settings.min_interval, min(interval, cap))
+
+    def record(self, changed: bool, baseline: bool = False, now: Optional[float] = None):
+        now = self._clock() if now is None else now
+        if changed:
+            if not baseline and self.last_change is not None:
+                gap = now - self.last_change
+                self.cadence = gap if self.cadence is None else (1 - CADENCE_ALPHA) * self.cadence + CADENCE_ALPHA * gap
+            if not baseline:
+                self.last_change = now
+            self.interval = self.settings.min_interval
+        else:
+            self.interval = self._clamp(self.interval * self.settings.backoff)
+        self.next_due = now + self.interval
+        POLL_INTERVAL.labels(self._host).set(self.interval)
+
+    def poll(self, now: Optional[float] = None):
+        """Probe and schedule the next probe; returns the rows when the page changed."""
+        # the first probe only establishes a baseline; it says nothing about cadence
+        baseline = self.row_hash is None
+        rows = self.probe()
+        self.record(rows is not None, baseline=baseline, now=now)
+        return rows
@@ -0,0 +1,262 @@
+# scraping/extractor.py
+"""
+Declarative row extraction and the scraper registry.
+
+A provider names a scraper (`extractor:` in config.yaml, default "ttec").
+Built-in scrapers are plain functions (html -> rows); everything else is an
+ExtractorSpec from the top-level `extractors:` block: a row selector, a
+column map and optional date/time formats. Specs compile once into lxml
+XPath objects (cached per spec, so across runs and reloads), and every
+scraper returns the same (date, area, location, time) tuples, with dates as
+DD/MM/YYYY, so the rest of the pipeline doesn't care which one ran.
+
+    extractors:
+      example_isp:
+        rows: "table#outages tr"      # CSS, or XPath starting with "/" or "./"
+        columns: {date: 0, area: 1, location: 2, start: 3, end: 4}
+        date_format: "%Y-%m-%d"
+        time_format: "%H:%M"
+
+Columns are 0-based cell indexes or selectors relative to the row. Give
+either `time` or `start` (+ optional `end`). Rows whose date doesn't match
+`date_format` (e.g. header rows) are skipped.
+"""
+import re
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from typing import Callable, Optional, Union
+
+from src.ics_generator.calendar_util import _RANGE_RE
+
+DEFAULT_SCRAPER = "ttec"
+CANONICAL_DATE = "%d/%m/%Y"
+FIELDS = ("date", "area", "location", "time", "start", "end")
+
+# tag, then any .class / #id parts: "tr", "tr.MsoNormalTable", "table#outages", ".row"
+_SIMPLE_CSS_RE = re.compile(r"^([A-Za-z][\w-]*|\*)?((?:[.#][\w-]+)*)$")
+
+
+def norm_text(t):
+    return " ".join(t.split())
+
+
+@dataclass(frozen=True)
+class ExtractorSpec:
+    name: str
+    rows: str
+    columns: tuple  # ((field, int index | selector), ...)
+    date_format: Optional[str] = None
+    time_format: Optional[str] = None
+
+    @classmethod
+    def from_config(cls, name, cfg):
+        """Build and compile a spec from its config.yaml mapping; ValueError if it is unusable."""
+        if not isinstance(cfg, dict) or not isinstance(cfg.get("rows"), str):
+            raise ValueError(f"extractor {name!r} needs a 'rows' selector")
+        columns = cfg.get("columns")
+        if not isinstance(columns, dict):
+            raise ValueError(f"extractor {name!r} needs a 'columns' mapping")
+        unknown = set(columns) - set(FIELDS)
+        if unknown:
+            raise ValueError(f"extractor {name!r}: unknown column(s) {', '.join(sorted(unknown))}")
+        missing = {"date", "area", "location"} - set(columns)
+        if missing or not ({"time", "start"} & set(columns)):
+            raise ValueError(f"extractor {name!r}: columns need date, area, location and time or start")
+        for field, col in columns.items():
+            if isinstance(col, bool) or not isinstance(col, (int, str)):
+                raise ValueError(f"extractor {name!r}: column {field!r} must be an index or a selector")
+        spec = cls(name=name, rows=cfg["rows"], columns=tuple(sorted(columns.items())),
+                   date_format=cfg.get("date_format"), time_format=cfg.get("time_format"))
+        try:
+            compile_extractor(spec)  # surface selector errors at load time
+        except (SyntaxError, ValueError) as e:  # SyntaxError: lxml's XPathSyntaxError
+            raise ValueError(f"extractor {name!r}: bad selector ({e})") from None
+        return spec
+
+
+def _is_xpath(selector):
+    # ".cls" is CSS; "./td", "../x", "//tr", "(//tr)[1]" are XPath
+    return selector.startswith(("/", "./", "..", "("))
+
+
+def _simple_css_to_xpath(selector):
+    """Descendant/child combinations of tag.class#id compounds, for when cssselect isn't installed."""
+    steps, axis = [], "descendant-or-self::"
+    for tok in selector.replace(">", " > ").split():
+        if tok == ">":
+            axis = "/"
+            continue
+        m = _SIMPLE_CSS_RE.match(tok)
+        if not m:
+            raise ValueError(f"unsupported CSS selector {selector!r} (install cssselect or use XPath)")
+        preds = []
+        for part in re.findall(r"[.#][\w-]+", m.group(2)):
+            if part[0] == ".":
+                preds.append(f"contains(concat(' ', normalize-space(@class), ' '), ' {part[1:]} ')")
+            else:
+                preds.append(f"@id='{part[1:]}'")
+        steps.append(axis + (m.group(1) or "*") + "".join(f"[{p}]" for p in preds))
+        axis = "/descendant::"
+    if not steps:
+        raise ValueError(f"empty CSS selector {selector!r}")
+    return "".join(steps)
+
+
+def to_xpath(selector):
+    if _is_xpath(selector):
+        return selector
+    try:
+        from lxml.cssselect import CSSSelector
+    except ImportError:
+        return _simple_css_to_xpath(selector)
+    return CSSSelector(selector, translator="html").path
+
+
+class CompiledExtractor:
+    def __init__(self, spec: ExtractorSpec):
+        from lxml import etree
+        self.spec = spec
+        self._etree = etree
+        self._paths = (to_xpath(spec.rows),
+                       tuple((field, col if isinstance(col, int) else to_xpath(col)) for field, col in spec.columns))
+        self._needs_cells = any(isinstance(col, int) for _, col in spec.columns)
+        self._local = threading.local()
+        self._xpaths()  # selector errors surface here, at load time
+
+    def _xpaths(self):
+        """
+        (rows, cells, columns) XPath objects for the calling thread: a compiled
+        XPath must not be evaluated from two threads at once, so each thread
+        compiles its own set once and extraction needs no lock.
+        """
+        compiled = getattr(self._local, "xpaths", None)
+        if compiled is None:
+            XPath = self._etree.XPath
+            rows, columns = self._paths
+            compiled = self._local.xpaths = (
+                XPath(rows),
+                XPath("./td|./th"),
+                tuple((field, col if isinstance(col, int) else XPath(col)) for field, col in columns),
+            )
+        return compiled
+
+    @staticmethod
+    def _text(node):
+        if node is None:
+            return ""
+        if isinstance(node, str):
+            return norm_text(node)
+        return norm_text("".join(node.itertext()))
+
+    def _clock(self, value):
+        if not self.spec.time_format or not value:
+            return value
+        return datetime.strptime(value, self.spec.time_format).strftime("%H:%M")
+
+    def _row(self, tr, cells_of, columns):
+        cells = cells_of(tr) if self._needs_cells else ()
+        values = {}
+        for field, col in columns:
+            if isinstance(col, int):
+                node = cells[col] if col < len(cells) else None
+            else:
+                found = col(tr)
+                node = found[0] if found else None
+            values[field] = self._text(node)
+
+        date = values["date"]
+        if self.spec.date_format:
+            date = datetime.strptime(date, self.spec.date_format).strftime(CANONICAL_DATE)
+        if "time" in values:
+            parts = _RANGE_RE.split(values["time"], maxsplit=1) if self.spec.time_format else [values["time"]]
+        else:
+            parts = [values["start"], values.get("end", "")]
+        parts = [self._clock(p.strip()) for p in parts if p.strip()]
+        return date, values["area"], values["location"], " to ".join(parts)
+
+    def extract(self, html):
+        data = html.encode("utf-8") if isinstance(html, str) else html
+        root = self._etree.fromstring(data, self._etree.HTMLParser(encoding="utf-8"))
+        rows = []
+        if root is None:
+            return rows
+        rows_of, cells_of, columns = self._xpaths()
+        for tr in rows_of(root):
+            try:
+                row = self._row(tr, cells_of, columns)
+            except ValueError:
+                continue  # header/footer rows that don't fit the formats
+            if row[0] and row[1] and row[2]:
+                rows.append(row)
+        return rows
+
+
+@lru_cache(maxsize=128)
+def compile_extractor(spec: ExtractorSpec) -> CompiledExtractor:
+    return CompiledExtractor(spec)
+
+
+# --- registry ---
+Scraper = Union[ExtractorSpec, Callable]
+
+_builtin = {}
+_streams = {}  # built-in function -> its row-at-a-time variant
+_configured = {}
+_registry_lock = threading.Lock()
+
+
+def register_scraper(name: str, scraper: Scraper, stream: Optional[Callable] = None):
+    """
+    Register a built-in scraper: a module-level html -> rows function (picklable
+    for the parse pool), plus optionally a generator yielding the same rows lazily.
+    """
+    with _registry_lock:
+        _builtin[name] = scraper
+        if stream is not None:
+            _streams[scraper] = stream
+
+
+def set_configured(specs: dict):
+    """Replace the scrapers defined in config.yaml's `extractors:` block."""
+    global _configured
+    with _registry_lock:
+        _configured = dict(specs)
+
+
+def builtin_names():
+    with _registry_lock:
+        return set(_builtin)
+
+
+def get_scraper(name: Optional[str] = None) -> Scraper:
+    name = name or DEFAULT_SCRAPER
+    with _registry_lock:
+        scraper = _configured.get(name) or _builtin.get(name)
+    if scraper is None and name == DEFAULT_SCRAPER:
+        # registers itself on import
+        from src.scraping import ttec_scraper  # noqa: F401
+        return get_scraper(name)
+    if scraper is None:
+        raise KeyError(f"no scraper named {name!r}")
+    return scraper
+
+
+def extract_rows(scraper: Scraper, html):
+    """Rows of `html` using a registered scraper (a spec or a function)."""
+    if isinstance(scraper, ExtractorSpec):
+        return compile_extractor(scraper).extract(html)
+    return scraper(html)
+
+
+def stream_rows(scraper: Scraper, html):
+    """
+    Rows of `html` as an iterator: lazily for scrapers registered with a stream
+    variant, otherwise over the full result (XPath specs need the whole tree).
+    """
+    if isinstance(scraper, ExtractorSpec):
+        return iter(compile_extractor(scraper).extract(html))
+    with _registry_lock:
+        stream = _streams.get(scraper)
+    return stream(html) if stream is not None else iter(scraper(html))
@@ -0,0 +1,275 @@
+# scraping/http_client.py
+"""
+Shared HTTP client for page fetches and poll probes.
+
+One pooled keep-alive `requests.Session` serves every job, so repeat fetches
+skip the TCP/TLS handshake, and gzip/deflate is always requested. Around it,
+per host:
+
+- a token bucket (HTTP_RATE_PER_HOST requests/s, bursts of HTTP_BURST) keeps
+  us polite however many providers point at one site;
+- connection errors, timeouts, bodies cut off mid-transfer and 429/5xx
+  answers are retried up to HTTP_RETRIES times with capped, jittered
+  exponential backoff (a server's Retry-After is honoured when it fits under
+  the cap); any other request error is raised at once but still counts
+  against the breaker;
+- all attempts of one call share an HTTP_DEADLINE_S budget: each attempt's
+  timeouts are cut to what is left, and no retry is started that could not
+  finish in time (timeouts apply per socket operation, so a server trickling
+  bytes can still overrun it slightly);
+- a circuit breaker opens after HTTP_BREAKER_FAILURES consecutive failed
+  requests. For HTTP_BREAKER_RESET_S every call fails at once with
+  CircuitOpenError, then one trial request decides whether it closes again.
+
+So a flapping site costs a job milliseconds instead of tying up a scheduler
+thread in timeouts.
+
+Env:
+  HTTP_POOL_SIZE          default 10 (keep-alive connections per host)
+  HTTP_CONNECT_TIMEOUT    default 5
+  HTTP_READ_TIMEOUT       default 20
+  HTTP_RATE_PER_HOST      default 2 (requests/s; 0 disables the limit)
+  HTTP_BURST              default 4
+  HTTP_RETRIES            default 2
+  HTTP_BACKOFF_S          default 0.5
+  HTTP_MAX_BACKOFF_S      default 8
+  HTTP_DEADLINE_S         default 30 (per call, retries included; 0 disables)
+  HTTP_BREAKER_FAILURES   default 5
+  HTTP_BREAKER_RESET_S    default 60
+"""
+import os
+import random
+import threading
+import time
+from typing import Callable, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.utils.metrics import HTTP_BREAKER_OPEN, HTTP_REQUESTS
+
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", 10))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", 5))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", 20))
+HTTP_RATE_PER_HOST = float(os.getenv("HTTP_RATE_PER_HOST", 2))
+HTTP_BURST = int(os.getenv("HTTP_BURST", 4))
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", 2))
+HTTP_BACKOFF_S = float(os.getenv("HTTP_BACKOFF_S", 0.5))
+HTTP_MAX_BACKOFF_S = float(os.getenv("HTTP_MAX_BACKOFF_S", 8))
+HTTP_DEADLINE_S = float(os.getenv("HTTP_DEADLINE_S", 30))
+HTTP_BREAKER_FAILURES = int(os.getenv("HTTP_BREAKER_FAILURES", 5))
+HTTP_BREAKER_RESET_S = float(os.getenv("HTTP_BREAKER_RESET_S", 60))
+
+RETRY_STATUS = frozenset({429, 500, 502, 503, 504})
+RETRY_ERRORS = (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError)
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """The host's circuit breaker is open; no request was made."""
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int, clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._clock = clock
+        self._sleep = sleep
+        self._last = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take one token, sleeping until one is available."""
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            self._sleep(wait)
+
+
+class CircuitBreaker:
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failures: int, reset_after: float, clock: Callable[[], float] = time.monotonic):
+        self.failures = max(1, failures)
+        self.reset_after = reset_after
+        self._clock = clock
+        self.state = self.CLOSED
+        self._consecutive = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """May a request go out? After the cool-down exactly one trial request is let through."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and self._clock() - self._opened_at >= self.reset_after:
+                self.state = self.HALF_OPEN
+                return True
+            return False
+
+    def record(self, ok: bool) -> bool:
+        """Record a request's outcome; True if this opened the circuit."""
+        with self._lock:
+            if ok:
+                self.state, self._consecutive = self.CLOSED, 0
+                return False
+            self._consecutive += 1
+            if self.state == self.HALF_OPEN or self._consecutive >= self.failures:
+                opened = self.state != self.OPEN
+                self.state, self._opened_at = self.OPEN, self._clock()
+                return opened
+            return False
+
+    def retry_in(self) -> float:
+        with self._lock:
+            return max(0.0, self.reset_after - (self._clock() - self._opened_at))
+
+
+class HttpClient:
+    def __init__(self, pool_size=HTTP_POOL_SIZE, rate=HTTP_RATE_PER_HOST, burst=HTTP_BURST,
+                 retries=HTTP_RETRIES, backoff=HTTP_BACKOFF_S, max_backoff=HTTP_MAX_BACKOFF_S,
+                 breaker_failures=HTTP_BREAKER_FAILURES, breaker_reset=HTTP_BREAKER_RESET_S,
+                 timeout=(HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT), deadline=HTTP_DEADLINE_S,
+                 session: Optional[requests.Session] = None, sleep: Callable[[float], None] = time.sleep,
+                 jitter: Callable[[], float] = random.random, clock: Callable[[], float] = time.monotonic):
+        self.session = session or requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers["Accept-Encoding"] = "gzip, deflate"
+        self.rate, self.burst = rate, burst
+        self.retries = max(0, retries)
+        self.backoff, self.max_backoff = backoff, max_backoff
+        self.breaker_failures, self.breaker_reset = breaker_failures, breaker_reset
+        self.timeout = timeout
+        self.deadline = deadline
+        self._sleep = sleep
+        self._jitter = jitter
+        self._clock = clock
+        self._buckets = {}
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def _host_state(self, host):
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = self._buckets[host] = TokenBucket(self.rate, self.burst, sleep=self._sleep)
+                self._breakers[host] = CircuitBreaker(self.breaker_failures, self.breaker_reset)
+            return bucket, self._breakers[host]
+
+    def breaker(self, url) -> CircuitBreaker:
+        return self._host_state(urlparse(url).netloc)[1]
+
+    def _delay(self, attempt, response=None):
+        d = min(self.max_backoff, self.backoff * 2 ** attempt)
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit() and int(retry_after) <= self.max_backoff:
+            return float(retry_after)
+        return d / 2 + self._jitter() * d / 2
+
+    def request(self, method, url, timeout=None, **kwargs) -> requests.Response:
+        """
+        requests-style call with the host's rate limit, retries and circuit
+        breaker applied. A final 429/5xx answer is returned (and counts as a
+        failure); exhausted transient errors and any other request error are
+        raised. Retries stop early once the deadline would be overrun.
+        """
+        host = urlparse(url).netloc
+        bucket, breaker = self._host_state(host)
+        if not breaker.allow():
+            HTTP_REQUESTS.labels(host, "circuit_open").inc()
+            raise CircuitOpenError(f"circuit open for {host}; retry in {breaker.retry_in():.0f}s")
+
+        # a caller's single number caps the read timeout; connecting still fails fast
+        if isinstance(timeout, (int, float)):
+            timeout = (min(self.timeout[0], timeout), timeout)
+        timeout = timeout or self.timeout
+        deadline = self._clock() + self.deadline if self.deadline > 0 else None
+        attempt = 0
+        while True:
+            bucket.acquire()
+            attempt_timeout = timeout
+            if deadline is not None:
+                left = max(0.1, deadline - self._clock())
+                attempt_timeout = (min(timeout[0], left), min(timeout[1], left))
+            try:
+                r = self.session.request(method, url, timeout=attempt_timeout, **kwargs)
+            except RETRY_ERRORS as e:
+                r, error = None, e
+            except Exception:
+                # not worth retrying (redirect loop, undecodable body, ...), but every
+                # attempt must record an outcome or a half-open breaker never settles
+                HTTP_REQUESTS.labels(host, "failed").inc()
+                if breaker.record(False):
+                    HTTP_BREAKER_OPEN.labels(host).set(1)
+                raise
+            else:
+                error = None
+                if r.status_code not in RETRY_STATUS:
+                    breaker.record(True)
+                    HTTP_BREAKER_OPEN.labels(host).set(0)
+                    HTTP_REQUESTS.labels(host, "ok").inc()
+                    return r
+
+            delay = self._delay(attempt, r)
+            out_of_time = deadline is not None and self._clock() + delay >= deadline
+            if attempt >= self.retries or out_of_time or breaker.state == CircuitBreaker.HALF_OPEN:
+                HTTP_REQUESTS.labels(host, "failed").inc()
+                if breaker.record(False):
+                    HTTP_BREAKER_OPEN.labels(host).set(1)
+                if error is not None:
+                    raise error
+                return r
+            HTTP_REQUESTS.labels(host, "retry").inc()
+            self._sleep(delay)
+            attempt += 1
+
+    def get(self, url, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def head(self, url, **kwargs) -> requests.Response:
+        return self.request("HEAD", url, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def default_client() -> HttpClient:
+    """Process-wide client, created on first use."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = HttpClient()
+        return _default
+
+
+def set_default_client(client):
+    """Swap the process-wide client (e.g. for tests or load tests); returns the previous one."""
+    global _default
+    with _default_lock:
+        prev, _default = _default, client
+        return prev
+
+
+def get(url, **kwargs):
+    return default_client().get(url, **kwargs)
+
+
+def head(url, **kwargs):
+    return default_client().head(url, **kwargs)
@@ -0,0 +1,129 @@
+# scraping/keyword_matcher.py
+"""
+Keyword matching for many subscription profiles at once.
+
+A profile is (key, area_keywords, location_keywords) and matches a row when
+any area keyword is a substring of the row's area AND any location keyword is
+a substring of its location (case-insensitive) — the rule the scraper has
+always used. All keywords are compiled once into two
+Aho-Corasick automatons, with an inverted index from keyword to the profiles
+that use it, so each row is scanned once regardless of how many profiles exist.
+"""
+from collections import deque
+from functools import lru_cache
+from typing import Hashable, Iterable, Sequence
+
+
+def norm_keyword(k: str) -> str:
+    return k.lower()
+
+
+class AhoCorasick:
+    """Multi-pattern substring search; `find` returns the ids of patterns present in a text."""
+
+    def __init__(self, patterns: Sequence[str]):
+        self._goto: list[dict[str, int]] = [{}]
+        self._always: tuple[int, ...] = tuple(i for i, p in enumerate(patterns) if not p)
+
+        out: list[list[int]] = [[]]
+        for pid, pat in enumerate(patterns):
+            if not pat:
+                continue
+            node = 0
+            for ch in pat:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    out.append([])
+                node = nxt
+            out[node].append(pid)
+
+        # BFS for failure links; fold each node's fail outputs into its own
+        fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                f = fail[node]
+                while f and ch not in self._goto[f]:
+                    f = fail[f]
+                fail[nxt] = self._goto[f].get(ch, 0)
+                out[nxt].extend(out[fail[nxt]])
+        self._fail = fail
+        self._out = [tuple(o) for o in out]
+
+    def find(self, text: str) -> set[int]:
+        goto, fail, out = self._goto, self._fail, self._out
+        hits = set(self._always)
+        node = 0
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                hits.update(out[node])
+        return hits
+
+
+class KeywordMatcher:
+    def __init__(self, profiles: Iterable[tuple[Hashable, Iterable[str], Iterable[str]]]):
+        self.keys: list[Hashable] = []
+        area_ids: dict[str, int] = {}
+        loc_ids: dict[str, int] = {}
+        area_index: list[list[int]] = []
+        loc_index: list[list[int]] = []
+
+        for pidx, (key, area_kws, loc_kws) in enumerate(profiles):
+            self.keys.append(key)
+            for kws, ids, index in ((area_kws, area_ids, area_index), (loc_kws, loc_ids, loc_index)):
+                for kw in set(map(norm_keyword, kws)):
+                    kid = ids.setdefault(kw, len(ids))
+                    if kid == len(index):
+                        index.append([])
+                    index[kid].append(pidx)
+
+        self._area = AhoCorasick(list(area_ids))
+        self._loc = AhoCorasick(list(loc_ids))
+        self._area_index = [frozenset(p) for p in area_index]
+        self._loc_index = [frozenset(p) for p in loc_index]
+
+    def _profiles(self, automaton: AhoCorasick, index: list[frozenset], text: str) -> set[int]:
+        hit: set[int] = set()
+        for kid in automaton.find(text.lower()):
+            hit |= index[kid]
+        return hit
+
+    def match(self, area: str, location: str) -> list[Hashable]:
+        """Keys of every profile matching this row, in profile order."""
+        areas = self._profiles(self._area, self._area_index, area)
+        if not areas:
+            return []
+        both = areas & self._profiles(self._loc, self._loc_index, location)
+        return [self.keys[i] for i in sorted(both)]
+
+
+@lru_cache(maxsize=256)
+def _compile_single(area_keywords: tuple, location_keywords: tuple) -> KeywordMatcher:
+    return KeywordMatcher([(None, area_keywords, location_keywords)])
+
+
+def compile_matcher(area_keywords, location_keywords) -> KeywordMatcher:
+    """Matcher for a single provider's keywords, compiled once per keyword set."""
+    return _compile_single(tuple(area_keywords), tuple(location_keywords))
+
+
+@lru_cache(maxsize=64)
+def _compile_profiles(profiles: tuple) -> KeywordMatcher:
+    return KeywordMatcher(profiles)
+
+
+def compile_profiles(profiles) -> KeywordMatcher:
+    """
+    One matcher for several providers' keywords, e.g. the members of a fetch
+    group: [(key, area_keywords, location_keywords), ...]. Compiled once per
+    profile set.
+    """
+    return _compile_profiles(tuple((key, tuple(area), tuple(loc)) for key, area, loc in profiles))
@@ -0,0 +1,114 @@
+# scraping/page_cache.py
+"""
+Shared, URL-keyed page cache with conditional GET revalidation.
+
+Providers that point at the same page (e.g. both TTEC entries) share one
+download. Within the TTL the cached body is reused as-is; after that the page
+is revalidated with If-None-Match / If-Modified-Since, and a 304 keeps the old
+body *and* anything derived from it (parsed rows), so nothing is re-parsed.
+"""
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+from urllib.parse import urlparse
+
+from src.utils.metrics import FETCH_BYTES, FETCHES
+
+
+@dataclass
+class CachedPage:
+    url: str
+    text: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    fetched_at: float = 0.0
+    # bumped whenever a new body replaces the old one
+    version: int = 1
+    # artefacts computed from `text` (e.g. parsed rows); survive a 304
+    derived: dict = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def memo(self, key: str, fn: Callable[[str], Any]) -> Any:
+        """Compute fn(text) once per body and keep it alongside the page."""
+        with self._lock:
+            if key not in self.derived:
+                self.derived[key] = fn(self.text)
+            return self.derived[key]
+
+    def remember(self, key: str, value: Any) -> Any:
+        """Keep an artefact computed elsewhere (e.g. by a stream); the first one stored wins."""
+        with self._lock:
+            return self.derived.setdefault(key, value)
+
+    def forget(self, key: str) -> None:
+        with self._lock:
+            self.derived.pop(key, None)
+
+    def peek(self, key: str) -> Any:
+        """The memoized artefact for `key`, or None if it hasn't been computed."""
+        with self._lock:
+            return self.derived.get(key)
+
+
+class PageCache:
+    def __init__(self, ttl: float = 300.0, clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self._clock = clock
+        self._pages: dict[str, CachedPage] = {}
+        self._url_locks: dict[str, threading.Lock] = {}
+        self._guard = threading.Lock()
+
+    def _lock_for(self, url: str) -> threading.Lock:
+        with self._guard:
+            return self._url_locks.setdefault(url, threading.Lock())
+
+    def get(self, url: str, session_get: Callable[..., Any], headers: Optional[dict] = None,
+            timeout: Optional[float] = 30, max_age: Optional[float] = None) -> CachedPage:
+        """
+        Return the page for `url`, downloading at most once per TTL window.
+        `session_get` is a requests-style `get(url, headers=..., timeout=...)`.
+        Concurrent callers for the same URL wait on the one in-flight request.
+        `max_age` overrides the TTL for this call (0 always revalidates).
+        """
+        ttl = self.ttl if max_age is None else max_age
+        host = urlparse(url).netloc
+        with self._lock_for(url):
+            page = self._pages.get(url)
+            now = self._clock()
+            if page and now - page.fetched_at < ttl:
+                FETCHES.labels(host, "cached").inc()
+                return page
+
+            req_headers = dict(headers or {})
+            if page and page.etag:
+                req_headers["If-None-Match"] = page.etag
+            if page and page.last_modified:
+                req_headers["If-Modified-Since"] = page.last_modified
+
+            r = session_get(url, headers=req_headers, timeout=timeout)
+            if page and r.status_code == 304:
+                page.fetched_at = now
+                FETCHES.labels(host, "not_modified").inc()
+                return page
+
+            r.raise_for_status()
+            FETCHES.labels(host, "downloaded").inc()
+            FETCH_BYTES.labels(host).inc(len(r.content))
+            page = CachedPage(
+                url=url,
+                text=r.text,
+                etag=r.headers.get("ETag"),
+                last_modified=r.headers.get("Last-Modified"),
+                fetched_at=now,
+                version=(page.version + 1) if page else 1,
+            )
+            self._pages[url] = page
+            return page
+
+    def invalidate(self, url: Optional[str] = None) -> None:
+        with self._guard:
+            if url is None:
+                self._pages.clear()
+            else:
+                self._pages.pop(url, None)
@@ -0,0 +1,92 @@
+# scraping/parse_pool.py
+"""
+Optional process pool for the parse stage.
+
+Parsing is CPU-bound and holds the GIL, so threaded provider runs serialise
+on it once there are many distinct pages. With PARSE_WORKERS > 0 the fetching
+thread ships the page body (UTF-8 bytes) to a worker process and gets back
+plain (date, area, location, time) tuples; nothing heavier crosses the
+process boundary. Pages under PARSE_POOL_MIN_BYTES are still parsed in-thread,
+where the round trip would cost more than it saves.
+
+Env:
+  PARSE_WORKERS         default 0 (parse in the calling thread)
+  PARSE_POOL_MIN_BYTES  default 262144
+"""
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", 0))
+PARSE_POOL_MIN_BYTES = int(os.getenv("PARSE_POOL_MIN_BYTES", 256 * 1024))
+
+_executor = None
+_workers = PARSE_WORKERS
+_lock = threading.Lock()
+
+
+def _parse_bytes(scraper, data):
+    # runs in the worker; imports (and spec compilation) are paid once per worker process
+    from src.scraping import ttec_scraper  # noqa: F401  registers the built-in scraper
+    from src.scraping.extractor import extract_rows
+    return extract_rows(scraper, data)
+
+
+def configure(workers):
+    """Set the worker count (0 disables the pool); a running pool is replaced on next use."""
+    global _workers
+    workers = max(0, int(workers))
+    with _lock:
+        if workers != _workers:
+            _shutdown_locked()
+            _workers = workers
+
+
+def _pool():
+    global _executor
+    with _lock:
+        if _executor is None and _workers > 0:
+            # spawn: the parent runs logging/scheduler threads that fork would copy mid-lock
+            _executor = ProcessPoolExecutor(max_workers=_workers,
+                                            mp_context=multiprocessing.get_context("spawn"))
+        return _executor
+
+
+def _shutdown_locked():
+    global _executor
+    if _executor is not None:
+        # parses already submitted still complete and deliver their rows
+        _executor.shutdown(wait=False)
+        _executor = None
+
+
+def shutdown():
+    with _lock:
+        _shutdown_locked()
+
+
+atexit.register(shutdown)
+
+
+def offloads(html, min_bytes=None):
+    """True if parse_rows() would send `html` to a worker process (size checked in characters)."""
+    threshold = PARSE_POOL_MIN_BYTES if min_bytes is None else min_bytes
+    return _workers > 0 and len(html) >= threshold
+
+
+def parse_rows(html, min_bytes=None, scraper=None):
+    """
+    Rows of `html` with `scraper` (a registered spec or function, default the
+    TTEC one), parsed in a worker process when the pool is enabled and the
+    page is big enough.
+    """
+    from src.scraping.extractor import extract_rows, get_scraper
+    scraper = scraper or get_scraper()
+    data = html.encode("utf-8") if isinstance(html, str) else html
+    threshold = PARSE_POOL_MIN_BYTES if min_bytes is None else min_bytes
+    pool = _pool() if len(data) >= threshold else None
+    if pool is None:
+        return extract_rows(scraper, data)
+    return pool.submit(_parse_bytes, scraper, data).result()
@@ -1,44 +1,243 @@
 # scraping/ttec_scraper.py
-from bs4 import BeautifulSoup
-import requests
-
-def fetch(url):
-    headers = {
-        "User-Agent": "Mozilla/5.0 (compatible; OutageMonitor/1.0; +https://example.com)"
-    }
-    r = requests.get(url, headers=headers, timeout=30)
-    r.raise_for_status()
-    return r.text
-
-def norm_text(t):
-    return " ".join(t.split())
-
-def scrape_outages(url, area_keywords, location_keywords, status_inactive_keyword):
-    html = fetch(url)
-    soup = BeautifulSoup(html, "lxml")
-    rows = soup.find_all("tr", class_="MsoNormalTable")
+import os
+import threading
+
+try:
+    from lxml import etree
+except ImportError:  # fall back to the BeautifulSoup path
+    etree = None
+
+from src.scraping import http_client, parse_pool
+from src.scraping.extractor import DEFAULT_SCRAPER, get_scraper, norm_text, register_scraper, stream_rows
+from src.scraping.page_cache import PageCache
+from src.utils.metrics import ROWS_MATCHED, ROWS_SCANNED, stage
+from src.utils.records import Outage
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (compatible; OutageMonitor/1.0; +https://example.com)"
+}
 
-    filtered_outages = []
-    for row in rows:
+# providers sharing a URL share one download per TTL window
+_page_cache = PageCache(ttl=float(os.getenv("PAGE_CACHE_TTL", 300)))
+
+def fetch_page(url, max_age=None):
+    # timeouts, retries, rate limits and the circuit breaker come from the shared client
+    return _page_cache.get(url, http_client.get, headers=HEADERS, timeout=None, max_age=max_age)
+
+def parse_rows_soup(html):
+    from bs4 import BeautifulSoup  # fallback only; not worth its import cost up front
+    soup = BeautifulSoup(html, "lxml")
+    rows = []
+    for row in soup.find_all("tr", class_="MsoNormalTable"):
         cols = row.find_all("td")
         if len(cols) >= 4:
-            date = norm_text(cols[0].get_text())
-            area = norm_text(cols[1].get_text())
-            location = norm_text(cols[2].get_text())
-            time = norm_text(cols[3].get_text())
-
-            status = "Active"
-            if location.lower().startswith(status_inactive_keyword.lower()):
-                status = "Cancelled"
-
-            if any(a.lower() in area.lower() for a in area_keywords) and \
-               any(l.lower() in location.lower() for l in location_keywords):
-                filtered_outages.append({
-                    "date": date,
-                    "area": area,
-                    "location": location,
-                    "time": time,
-                    "status": status,
-                    "description": location
-                })
-    return filtered_outages
+            rows.append(tuple(norm_text(c.get_text()) for c in cols[:4]))
+    return rows
+
+ROW_CLASS = "MsoNormalTable"
+
+FEED_CHUNK = 64 * 1024
+
+def _tr_events(html):
+    """(event, <tr>) pairs, feeding the parser a chunk at a time so the page is never copied whole."""
+    parser = etree.HTMLPullParser(events=("start", "end"), tag="tr", encoding="utf-8")
+    for i in range(0, len(html), FEED_CHUNK):
+        chunk = html[i:i + FEED_CHUNK]
+        parser.feed(chunk.encode("utf-8") if isinstance(chunk, str) else chunk)
+        yield from parser.read_events()
+    parser.close()
+    yield from parser.read_events()
+
+def iter_rows_lxml(html):
+    """
+    Streaming extraction of (date, area, location, time) from `tr.MsoNormalTable`,
+    yielded in document order as soon as each row closes. Only matching rows are
+    ever turned into text, and every finished top-level row is dropped from the
+    partial tree, so memory stays flat as the page grows.
+    """
+    slots = {}  # row -> position, reserved on <tr> open so nested rows keep document order
+    done = {}   # position -> row (None for rows with fewer than 4 cells)
+    opened = emitted = 0
+    for event, tr in _tr_events(html):
+        if event == "start":
+            if ROW_CLASS in (tr.get("class") or "").split():
+                slots[tr] = opened
+                opened += 1
+            continue
+
+        slot = slots.pop(tr, None)
+        if slot is not None:
+            cells, row = [], None
+            for td in tr.iterdescendants("td"):
+                cells.append(norm_text("".join(td.itertext())))
+                if len(cells) == 4:
+                    row = tuple(cells)
+                    break
+            done[slot] = row
+            # a nested row closes before its parent; hold it until the parent is out
+            while emitted in done:
+                row = done.pop(emitted)
+                emitted += 1
+                if row is not None:
+                    yield row
+        # nested rows are still needed by their enclosing row's text
+        if next(tr.iterancestors("tr"), None) is None:
+            tr.clear()
+            while tr.getprevious() is not None:
+                del tr.getparent()[0]
+
+def parse_rows_lxml(html):
+    return list(iter_rows_lxml(html))
+
+def iter_rows(html):
+    """Rows of the TTEC page one at a time; falls back to BeautifulSoup if lxml can't start."""
+    if etree is not None:
+        started = False
+        try:
+            for row in iter_rows_lxml(html):
+                started = True
+                yield row
+            return
+        except Exception:
+            if started:
+                raise
+    yield from parse_rows_soup(html)
+
+def parse_rows(html):
+    if etree is not None:
+        try:
+            return parse_rows_lxml(html)
+        except Exception:
+            pass
+    return parse_rows_soup(html)
+
+# the hand-written streaming path stays the scraper for the TTEC page
+register_scraper(DEFAULT_SCRAPER, parse_rows, stream=iter_rows)
+
+def _outage(date, area, location, time, status_inactive_keyword):
+    return Outage.from_row(date, area, location, time, status_inactive_keyword)
+
+def page_rows(page, extractor=None):
+    """Rows of a cached page for a registered scraper; parsed once per body and scraper."""
+    scraper = get_scraper(extractor)
+    shared = page.peek(("stream", scraper))
+    if shared is not None:
+        # a stream of this body is under way; finish it rather than parse again
+        return shared.drain()
+    return page.memo(("rows", scraper), lambda text: parse_pool.parse_rows(text, scraper=scraper))
+
+def fetch_rows(url, provider=None, extractor=None):
+    """Fetch and parse `url` (fetch + parse stages) with the named scraper (default "ttec")."""
+    label = provider or "-"
+    with stage("fetch", label):
+        page = fetch_page(url)
+    with stage("parse", label):
+        return page_rows(page, extractor)
+
+class _SharedRows:
+    """
+    One lazy parse of a page shared by every reader. Whichever reader needs a
+    row nobody has parsed yet pulls it from the parser (under the lock) and
+    appends it to the shared buffer, so concurrent readers interleave on a
+    single parse instead of each starting their own. Once the parser runs out
+    the buffer becomes the page's memoized row list.
+    """
+
+    def __init__(self, page, key, stream_key, source):
+        self._page = page
+        self._key = key
+        self._stream_key = stream_key
+        self._source = source
+        self._rows = []
+        self._done = False
+        self._error = None
+        self._lock = threading.Lock()
+
+    def _fill(self, i):
+        """True once row i is buffered; False at the end of the page."""
+        with self._lock:
+            while len(self._rows) <= i:
+                if self._error is not None:
+                    raise self._error
+                if self._done:
+                    return False
+                try:
+                    self._rows.append(next(self._source))
+                except StopIteration:
+                    self._done = True
+                    self._page.remember(self._key, self._rows)
+                except Exception as e:
+                    # current readers see the failure and a truncated list is never
+                    # memoized; the next reader of this body starts a fresh parse
+                    self._error = e
+                    self._page.forget(self._stream_key)
+                    raise
+            return True
+
+    def __iter__(self):
+        i = 0
+        while i < len(self._rows) or self._fill(i):
+            yield self._rows[i]
+            i += 1
+
+    def drain(self):
+        for _ in self:
+            pass
+        return self._rows
+
+def iter_page_rows(page, extractor=None):
+    """
+    Rows of a cached page as an iterator. Rows already parsed for this body (or
+    handed to the parse pool) come from the memo; otherwise the page is parsed
+    lazily, row by row, through one parse shared by every reader of this body
+    (concurrent ones included), and the rows are memoized once it runs out, so
+    a cached or revalidated (304) page is never parsed twice.
+    """
+    scraper = get_scraper(extractor)
+    key = ("rows", scraper)
+    rows = page.peek(key)
+    if rows is None and parse_pool.offloads(page.text):
+        rows = page_rows(page, extractor)
+    if rows is not None:
+        return iter(rows)
+    stream_key = ("stream", scraper)
+    shared = page.memo(stream_key, lambda text: _SharedRows(page, key, stream_key, stream_rows(scraper, text)))
+    return iter(shared)
+
+def split_rows(rows, matcher, provider=None):
+    """
+    Scan rows once against a multi-profile matcher (see compile_profiles) and
+    fan them out: {profile_key: [row, ...]} for every profile that matched.
+    Each key counts as having scanned every row, as if it had filtered alone.
+    """
+    split = {k: [] for k in matcher.keys}
+    with stage("filter", provider or "-"):
+        for row in rows:
+            for k in matcher.match(row[1], row[2]):
+                split[k].append(row)
+    for k, kept in split.items():
+        ROWS_SCANNED.labels(k).inc(len(rows))
+        ROWS_MATCHED.labels(k).inc(len(kept))
+    return split
+
+def iter_outages(rows, status_inactive_keyword):
+    """Outages for rows already filtered for a provider (e.g. by split_rows)."""
+    for date, area, location, time in rows:
+        yield _outage(date, area, location, time, status_inactive_keyword)
+
+def iter_matches(rows, matcher, status_inactive_keyword, provider=None):
+    """
+    Filter stage as a generator: outages of `rows` matching the provider's own
+    keywords (profile None), yielded as they are found.
+    """
+    scanned = matched = 0
+    try:
+        for date, area, location, time in rows:
+            scanned += 1
+            if None in matcher.match(area, location):
+                matched += 1
+                yield _outage(date, area, location, time, status_inactive_keyword)
+    finally:
+        label = provider or "-"
+        ROWS_SCANNED.labels(label).inc(scanned)
+        ROWS_MATCHED.labels(label).inc(matched)
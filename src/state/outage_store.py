@@ -0,0 +1,228 @@
+# state/outage_store.py
+"""
+SQLite-backed record of the outages already reported per provider.
+
+Each outage gets a content-derived identity from (source, date, area,
+location) — with the cancellation prefix stripped from the location so a
+cancelled row keeps the identity of the outage it cancels — and a hash of the
+fields that can change. Comparing against the stored hash classifies every
+scraped outage as new, changed, cancelled or unchanged, and the identity
+doubles as a stable calendar UID.
+
+The source is the page the outage was scraped from (the pipeline passes the
+provider's URL), so subscriptions to the same page agree on an outage's
+identity while renaming a provider changes nothing. What has been reported
+is still recorded per provider id.
+
+Only what is on the page is diffed: an outage is reported as cancelled when
+its row turns CANCELLED, not when the row silently disappears (past outages
+drop off the page the same way, so absence says nothing). Such an event
+stays in calendars as last reported. Outages not seen for
+OUTAGE_PRUNE_DAYS are forgotten by prune(), which the entry points call
+after a run (one-shot) or daily (runner).
+"""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+
+from src.utils.records import Outage
+
+NEW, CHANGED, CANCELLED, UNCHANGED = "new", "changed", "cancelled", "unchanged"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outages (
+    provider_id TEXT NOT NULL,
+    identity    TEXT NOT NULL,
+    row_hash    TEXT NOT NULL,
+    status      TEXT NOT NULL,
+    sequence    INTEGER NOT NULL DEFAULT 0,
+    first_seen  REAL NOT NULL,
+    last_seen   REAL NOT NULL,
+    PRIMARY KEY (provider_id, identity)
+)
+"""
+
+# what the adaptive poller has learned about each page (see scraping/adaptive_poll.py)
+_POLL_SCHEMA = """
+CREATE TABLE IF NOT EXISTS poll_state (
+    url   TEXT PRIMARY KEY,
+    state TEXT NOT NULL
+)
+"""
+
+
+def _h(*parts):
+    return hashlib.sha1("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def base_location(location, status_inactive_keyword):
+    """Location with any leading cancellation keyword (and separator) removed."""
+    loc = location.strip()
+    if status_inactive_keyword and loc.lower().startswith(status_inactive_keyword.lower()):
+        loc = re.sub(r"^[\s:\-–—]+", "", loc[len(status_inactive_keyword):])
+    return loc
+
+
+def outage_identity(source, outage, status_inactive_keyword="CANCELLED"):
+    loc = base_location(outage["location"], status_inactive_keyword)
+    return _h(source, outage["date"], outage["area"].lower(), loc.lower())
+
+
+def row_hash(outage):
+    return _h(outage["time"], outage["status"], outage["location"], outage.get("description", ""))
+
+
+def uid_for(identity):
+    return f"{identity}@service-outage-monitor"
+
+
+@dataclass
+class OutageChange:
+    kind: str
+    outage: Outage
+    identity: str
+    row_hash: str
+    sequence: int = 0
+
+    @property
+    def uid(self):
+        return uid_for(self.identity)
+
+
+@dataclass
+class Delta:
+    provider_id: str
+    changes: list = field(default_factory=list)
+
+    def of(self, kind):
+        return [c for c in self.changes if c.kind == kind]
+
+    @property
+    def pending(self):
+        """Changes worth notifying about (everything except unchanged)."""
+        return [c for c in self.changes if c.kind != UNCHANGED]
+
+    def counts(self):
+        return {k: len(self.of(k)) for k in (NEW, CHANGED, CANCELLED, UNCHANGED)}
+
+
+class OutageStore:
+    def __init__(self, path):
+        path = os.path.expanduser(path)
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(_SCHEMA)
+            self._conn.execute(_POLL_SCHEMA)
+
+    def diff(self, provider_id, outages, status_inactive_keyword="CANCELLED", source=None):
+        """
+        Classify `outages` against what was last recorded for `provider_id`;
+        does not write. Identities are derived from `source` (the page URL;
+        default: provider_id).
+        """
+        delta = Delta(provider_id)
+        for _ in self.iter_diff(delta, outages, status_inactive_keyword, source):
+            pass
+        return delta
+
+    def iter_diff(self, delta, outages, status_inactive_keyword="CANCELLED", source=None):
+        """
+        Streaming form of diff(): classify `outages` (any iterable) one at a
+        time, appending each change to `delta` and yielding it.
+        """
+        with self._lock:
+            known = {
+                ident: (h, status, seq)
+                for ident, h, status, seq in self._conn.execute(
+                    "SELECT identity, row_hash, status, sequence FROM outages WHERE provider_id = ?",
+                    (delta.provider_id,))
+            }
+        seen = set()
+        for o in outages:
+            ident = outage_identity(source or delta.provider_id, o, status_inactive_keyword)
+            if ident in seen:  # the page lists the same outage twice
+                continue
+            seen.add(ident)
+            h = row_hash(o)
+            prev = known.get(ident)
+            if prev is None:
+                change = OutageChange(NEW, o, ident, h)
+            elif prev[0] == h:
+                change = OutageChange(UNCHANGED, o, ident, h, prev[2])
+            elif o["status"] == "Cancelled" and prev[1] != "Cancelled":
+                change = OutageChange(CANCELLED, o, ident, h, prev[2] + 1)
+            else:
+                change = OutageChange(CHANGED, o, ident, h, prev[2] + 1)
+            delta.changes.append(change)
+            yield change
+
+    def commit(self, delta):
+        """Record a delta once its notifications have gone out."""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                """
+                INSERT INTO outages (provider_id, identity, row_hash, status, sequence, first_seen, last_seen)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (provider_id, identity) DO UPDATE SET
+                    row_hash = excluded.row_hash, status = excluded.status,
+                    sequence = excluded.sequence, last_seen = excluded.last_seen
+                """,
+                [(delta.provider_id, c.identity, c.row_hash, c.outage["status"], c.sequence, now, now)
+                 for c in delta.changes],
+            )
+
+    def load_poll_state(self, url):
+        with self._lock:
+            row = self._conn.execute("SELECT state FROM poll_state WHERE url = ?", (url,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save_poll_state(self, url, state):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO poll_state (url, state) VALUES (?, ?) "
+                "ON CONFLICT (url) DO UPDATE SET state = excluded.state",
+                (url, json.dumps(state)),
+            )
+
+    def prune(self, older_than_days=None):
+        """Forget outages last seen more than `older_than_days` (default
+        OUTAGE_PRUNE_DAYS, 90) ago; returns how many."""
+        if older_than_days is None:
+            older_than_days = float(os.getenv("OUTAGE_PRUNE_DAYS", 90))
+        cutoff = time.time() - older_than_days * 86400
+        with self._lock, self._conn:
+            return self._conn.execute("DELETE FROM outages WHERE last_seen < ?", (cutoff,)).rowcount
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def default_store():
+    """Process-wide store at $OUTAGE_STATE_DB (default ./logs/outage_state.sqlite3)."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = OutageStore(os.getenv("OUTAGE_STATE_DB", "./logs/outage_state.sqlite3"))
+        return _default
+
+
+def set_default_store(store):
+    """Swap the process-wide store (e.g. a throwaway one for load tests); returns the previous one."""
+    global _default
+    with _default_lock:
+        prev, _default = _default, store
+        return prev
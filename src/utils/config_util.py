@@ -0,0 +1,251 @@
+# utils/config_util.py
+"""
+config.yaml loading, validation and hot reload.
+
+`load_config` returns the raw mapping (re-parsed only when the file changes).
+`compile_config` turns it into a ConfigSnapshot: providers keyed by id, each
+with its keyword matcher compiled, and registers the `extractors:` block.
+`ConfigWatcher` polls the file and hands (old, new) snapshots to a callback;
+`diff_providers` says which providers were added, removed or changed so only
+those jobs need touching.
+"""
+import copy
+import logging
+import os
+import threading
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Optional
+
+import yaml
+
+DEFAULT_PATH = "config/config.yaml"
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+class ConfigError(ValueError):
+    pass
+
+
+def _signature(path):
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def load_config(path=DEFAULT_PATH):
+    """Parsed config.yaml; served from memory until the file's mtime/size change."""
+    sig = _signature(path)
+    with _cache_lock:
+        hit = _cache.get(path)
+        if hit is None or hit[0] != sig:
+            with open(path, "r", encoding="utf-8") as f:
+                hit = _cache[path] = (sig, yaml.safe_load(f))
+        # callers may mutate what they get back
+        return copy.deepcopy(hit[1])
+
+
+@dataclass(frozen=True)
+class PollSettings:
+    """Adaptive polling bounds (seconds) and the backoff factor while a page is stable."""
+    min_interval: float = 300.0
+    max_interval: float = 6 * 3600.0
+    backoff: float = 2.0
+
+
+@dataclass(frozen=True)
+class ProviderSpec:
+    id: str
+    title: str
+    url: str
+    area_keywords: tuple
+    location_keywords: tuple
+    status_inactive_keyword: str
+    schedule: Optional[str]
+    # set when the provider is polled for changes instead of run on `schedule`
+    poll: Optional[PollSettings]
+    # registered scraper that turns the page into rows (see scraping/extractor.py)
+    extractor: str
+    # the provider's mapping as written in config.yaml
+    config: dict = field(repr=False)
+    matcher: Any = field(default=None, compare=False, repr=False)
+
+    @property
+    def keywords(self):
+        return self.area_keywords, self.location_keywords
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    raw: dict
+    providers: dict  # id -> ProviderSpec, in config order
+    signature: tuple = ()
+    digest: bool = False  # one combined email per recipient per scheduling window
+
+
+def _keywords(p, key, pid):
+    kws = p.get(key) or []
+    if isinstance(kws, str) or not all(isinstance(k, str) for k in kws):
+        raise ConfigError(f"provider {pid!r}: '{key}' must be a list of strings")
+    return tuple(kws)
+
+
+def _poll_settings(defaults, p, pid):
+    poll = p.get("poll")
+    if not poll:
+        return None
+    if poll is not True and not isinstance(poll, dict):
+        raise ConfigError(f"provider {pid!r}: 'poll' must be true or a mapping")
+    merged = {**defaults, **(poll if isinstance(poll, dict) else {})}
+    unknown = set(merged) - set(PollSettings.__dataclass_fields__)
+    if unknown:
+        raise ConfigError(f"provider {pid!r}: unknown poll setting(s) {', '.join(sorted(unknown))}")
+    try:
+        settings = PollSettings(**{k: float(v) for k, v in merged.items()})
+    except (TypeError, ValueError):
+        raise ConfigError(f"provider {pid!r}: poll settings must be numbers") from None
+    if not 0 < settings.min_interval <= settings.max_interval or settings.backoff < 1:
+        raise ConfigError(f"provider {pid!r}: need 0 < min_interval <= max_interval and backoff >= 1")
+    return settings
+
+
+def compile_config(cfg, previous: Optional[ConfigSnapshot] = None, signature=()) -> ConfigSnapshot:
+    """
+    Validate `cfg` and build a snapshot. Matchers are taken from `previous`
+    for providers whose keywords are unchanged and compiled only for the rest.
+    Raises ConfigError on anything that would make the snapshot ambiguous.
+    """
+    from src.scraping import extractor as extractors
+    from src.scraping.keyword_matcher import compile_matcher
+
+    if not isinstance(cfg, dict):
+        raise ConfigError("config must be a mapping")
+    websites = cfg.get("websites") or []
+    if not isinstance(websites, list):
+        raise ConfigError("'websites' must be a list")
+
+    extractor_cfg = cfg.get("extractors") or {}
+    if not isinstance(extractor_cfg, dict):
+        raise ConfigError("'extractors' must be a mapping")
+    specs = {}
+    for name, spec_cfg in extractor_cfg.items():
+        try:
+            specs[name] = extractors.ExtractorSpec.from_config(name, spec_cfg)
+        except ValueError as e:
+            raise ConfigError(str(e)) from None
+    known = extractors.builtin_names() | set(specs) | {extractors.DEFAULT_SCRAPER}
+
+    poll_defaults = cfg.get("polling") or {}
+    if not isinstance(poll_defaults, dict):
+        raise ConfigError("'polling' must be a mapping")
+    digest = cfg.get("digest", False)
+    if not isinstance(digest, bool):
+        raise ConfigError("'digest' must be true or false")
+
+    old = previous.providers if previous else {}
+    providers = {}
+    for idx, p in enumerate(websites, 1):
+        if not isinstance(p, dict):
+            raise ConfigError(f"websites[{idx}] must be a mapping")
+        pid = p.get("id")
+        if not pid or not isinstance(pid, str):
+            raise ConfigError(f"websites[{idx}] ({p.get('title', '?')}) needs a string 'id'")
+        if pid in providers:
+            raise ConfigError(f"duplicate provider id {pid!r}")
+        for key in ("title", "url"):
+            if not p.get(key):
+                raise ConfigError(f"provider {pid!r} is missing '{key}'")
+        scraper = p.get("extractor") or extractors.DEFAULT_SCRAPER
+        if scraper not in known:
+            raise ConfigError(f"provider {pid!r}: unknown extractor {scraper!r}")
+        area = _keywords(p, "area_keywords", pid)
+        loc = _keywords(p, "location_keywords", pid)
+
+        prev = old.get(pid)
+        matcher = prev.matcher if prev and prev.keywords == (area, loc) else compile_matcher(area, loc)
+        providers[pid] = ProviderSpec(
+            id=pid,
+            title=p["title"],
+            url=p["url"],
+            area_keywords=area,
+            location_keywords=loc,
+            status_inactive_keyword=p.get("status_inactive_keyword", "CANCELLED"),
+            schedule=p.get("schedule"),
+            poll=_poll_settings(poll_defaults, p, pid),
+            extractor=scraper,
+            config=p,
+            matcher=matcher,
+        )
+    # only a fully valid config replaces the registered extractors
+    extractors.set_configured(specs)
+    return ConfigSnapshot(raw=cfg, providers=providers, signature=signature, digest=digest)
+
+
+def load_snapshot(path=DEFAULT_PATH, previous: Optional[ConfigSnapshot] = None) -> ConfigSnapshot:
+    sig = _signature(path)
+    return compile_config(load_config(path), previous=previous, signature=sig)
+
+
+def diff_providers(old: Optional[ConfigSnapshot], new: ConfigSnapshot):
+    """(added, removed, changed) provider ids between two snapshots."""
+    before = old.providers if old else {}
+    after = new.providers
+    added = [pid for pid in after if pid not in before]
+    removed = [pid for pid in before if pid not in after]
+    changed = [pid for pid in after if pid in before and after[pid] != before[pid]]
+    return added, removed, changed
+
+
+class ConfigWatcher:
+    """
+    Poll `path` every `interval` seconds; when its mtime/size change, build a
+    new snapshot and call on_change(old, new). A file that fails to parse or
+    validate is logged and ignored; the last good snapshot stays current.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, on_change: Callable = None, interval: float = 5.0,
+                 logger: Optional[logging.Logger] = None):
+        self.path = path
+        self.on_change = on_change
+        self.interval = interval
+        self.logger = logger or logging.getLogger(__name__)
+        self.snapshot = load_snapshot(path)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def check(self) -> bool:
+        """Reload if the file changed; True if a new snapshot was applied."""
+        try:
+            sig = _signature(self.path)
+        except OSError as e:
+            self.logger.warning(f"Config watch: cannot stat {self.path}: {e}")
+            return False
+        if sig == self.snapshot.signature:
+            return False
+        old = self.snapshot
+        try:
+            new = load_snapshot(self.path, previous=old)
+        except (ConfigError, yaml.YAMLError, OSError) as e:
+            self.logger.error(f"Config reload rejected, keeping previous config: {e}")
+            # don't re-report the same broken file every poll
+            self.snapshot = replace(old, signature=sig)
+            return False
+        self.snapshot = new
+        if self.on_change:
+            self.on_change(old, new)
+        return True
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                self.logger.exception(f"Config watch failed: {e}")
+
+    def start(self):
+        self._thread = threading.Thread(target=self._loop, daemon=True, name="config-watcher")
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
@@ -1,6 +1,16 @@
 # utils/env_util.py
 import os
 
+_env_loaded = False
+
+def load_env():
+    """Load .env into os.environ once; python-dotenv is only imported when this is called."""
+    global _env_loaded
+    if not _env_loaded:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _env_loaded = True
+
 def recipients_for_provider(provider_id: str) -> list[str]:
     """
     Read recipients from env var: RECIPIENTS__<UPPER_PROVIDER_ID>
@@ -0,0 +1,151 @@
+# utils/load_test.py
+"""
+End-to-end load test: drive the real per-provider job for N synthetic
+providers against local stand-ins — an HTTP server with generated outage
+pages and an in-process SMTP sink — and report throughput and latency.
+
+Everything the job writes (state DB, outbox, ICS files, calendars) goes to a
+temp directory; the process-wide SMTP pool, HTTP client (without its per-host
+rate limit), outbox and state store are
+swapped out for the duration of the run and restored afterwards. Jobs only
+enqueue their mail; the outbox worker sends it while they run, and the
+SMTP rate is measured until the outbox is empty.
+"""
+import logging
+import os
+import resource
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.mailer import email_util, outbox as outbox_mod
+from src.mailer.smtp_pool import SMTPPool
+from src.mailer.smtp_sink import SMTPSink
+from src.scraping import http_client
+from src.state import outage_store
+from src.utils.synthetic_pages import generate_page, serve_pages
+
+AREA_KWS = ["north", "east", "central"]
+LOC_KWS = ["road", "street", "avenue", "trace"]
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    k = max(0, min(len(sorted_values) - 1, round(p / 100 * len(sorted_values) + 0.5) - 1))
+    return sorted_values[k]
+
+
+def synthetic_providers(n, base_url, pages):
+    return [
+        {
+            "id": f"loadtest_{i}",
+            "title": f"Load {i}",
+            "url": f"{base_url}/page{i % pages}.html",
+            "area_keywords": AREA_KWS,
+            "location_keywords": LOC_KWS,
+            "status_inactive_keyword": "CANCELLED",
+        }
+        for i in range(n)
+    ]
+
+
+def run_load_test(run_impl, providers=50, rows=500, pages=None, workers=8, recipients=3, logger=None):
+    """
+    Run `run_impl(provider)` for `providers` synthetic providers on `workers`
+    threads. Returns a dict with providers/sec, p50/p95/p99 latency, peak RSS
+    and SMTP messages/sec.
+    """
+    pages = pages or providers
+    server = serve_pages({f"/page{i}.html": generate_page(rows, seed=i) for i in range(pages)})
+    sink = SMTPSink().start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    cfg = synthetic_providers(providers, base_url, pages)
+
+    env_keys = [f"RECIPIENTS__{p['id'].upper()}" for p in cfg]
+    for key, p in zip(env_keys, cfg):
+        os.environ[key] = ",".join(f"{p['id']}+{j}@loadtest.invalid" for j in range(recipients))
+
+    cwd = os.getcwd()
+    prev_level = logger.level if logger else None
+    with tempfile.TemporaryDirectory(prefix="outage-loadtest-") as tmp:
+        os.chdir(tmp)
+        pool = SMTPPool(sink.host, sink.port, starttls=False, size=email_util.SMTP_POOL_SIZE)
+        prev_pool = email_util.set_pool(pool)
+        prev_from = email_util.FROM_EMAIL
+        email_util.FROM_EMAIL = prev_from or "loadtest@localhost"
+        prev_store = outage_store.set_default_store(outage_store.OutageStore(os.path.join(tmp, "state.sqlite3")))
+        # the stand-in server is one host: no politeness limit, or it would be the bottleneck
+        prev_client = http_client.set_default_client(http_client.HttpClient(rate=0))
+        outbox = outbox_mod.Outbox(os.path.join(tmp, "outbox"), workers=email_util.SMTP_POOL_SIZE, logger=logger)
+        prev_outbox = outbox_mod.set_default_outbox(outbox.start(poll=0.1))
+        if logger:
+            logger.setLevel(logging.WARNING)  # keep per-job INFO lines out of the measurement
+
+        latencies, errors = [], 0
+
+        def _job(p):
+            t0 = time.perf_counter()
+            run_impl(p)
+            return time.perf_counter() - t0
+
+        try:
+            t0 = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=max(1, workers)) as ex:
+                for fut in [ex.submit(_job, p) for p in cfg]:
+                    try:
+                        latencies.append(fut.result())
+                    except Exception:
+                        errors += 1
+            wall = time.perf_counter() - t0
+            outbox.flush()
+            delivery_wall = time.perf_counter() - t0
+        finally:
+            outbox.stop()
+            http_client.set_default_client(prev_client).close()
+            outbox_mod.set_default_outbox(prev_outbox)
+            if logger:
+                logger.setLevel(prev_level)
+            email_util.set_pool(prev_pool)
+            email_util.FROM_EMAIL = prev_from
+            outage_store.set_default_store(prev_store).close()
+            pool.close()
+            os.chdir(cwd)
+            for key in env_keys:
+                os.environ.pop(key, None)
+            sink.stop()
+            server.shutdown()
+            server.server_close()
+
+    latencies.sort()
+    return {
+        "providers": providers,
+        "pages": pages,
+        "rows_per_page": rows,
+        "workers": workers,
+        "errors": errors,
+        "wall_s": wall,
+        "providers_per_s": providers / wall if wall else 0.0,
+        "latency_p50_s": percentile(latencies, 50),
+        "latency_p95_s": percentile(latencies, 95),
+        "latency_p99_s": percentile(latencies, 99),
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "smtp_messages": len(sink.messages),
+        "smtp_connections": sink.connections,
+        "smtp_messages_per_s": len(sink.messages) / delivery_wall if delivery_wall else 0.0,
+        "outbox_drained_s": delivery_wall,
+    }
+
+
+def format_report(r):
+    return "\n".join([
+        f"load test: {r['providers']} providers, {r['pages']} pages x {r['rows_per_page']} rows, "
+        f"{r['workers']} workers",
+        f"  wall            {r['wall_s']:.2f} s   errors {r['errors']}",
+        f"  providers/sec   {r['providers_per_s']:.1f}",
+        f"  job latency     p50 {r['latency_p50_s'] * 1000:.0f} ms   p95 {r['latency_p95_s'] * 1000:.0f} ms"
+        f"   p99 {r['latency_p99_s'] * 1000:.0f} ms",
+        f"  peak RSS        {r['peak_rss_mb']:.0f} MB",
+        f"  SMTP            {r['smtp_messages']} messages over {r['smtp_connections']} connection(s), "
+        f"{r['smtp_messages_per_s']:.1f} msg/s (outbox drained after {r['outbox_drained_s']:.2f} s)",
+    ])
@@ -0,0 +1,259 @@
+# utils/metrics.py
+"""
+Tiny in-process metrics registry with a Prometheus text-format endpoint.
+No external deps; counters, gauges and histograms with string labels.
+
+    with stage("fetch", provider_id):
+        ...
+    start_http_server(9464)          # GET /metrics
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+
+def _escape(v):
+    return str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _fmt_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _fmt_num(v):
+    if v == float("inf"):
+        return "+Inf"
+    return repr(float(v)) if isinstance(v, float) else str(v)
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name, doc, labelnames=()):
+        self.name = name
+        self.doc = doc
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def labels(self, *values):
+        values = tuple(str(v) for v in values)
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+        with self._lock:
+            child = self._values.get(values)
+            if child is None:
+                child = self._values[values] = self._new_child()
+            return child
+
+    def expose(self):
+        lines = [f"# HELP {self.name} {self.doc}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = list(self._values.items())
+        for values, child in items:
+            lines.extend(self._sample_lines(values, child))
+        return lines
+
+
+class _Value:
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1.0):
+        with self._lock:
+            self.value += amount
+
+    def set(self, value):
+        with self._lock:
+            self.value = value
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _Value()
+
+    def _sample_lines(self, values, child):
+        return [f"{self.name}{_fmt_labels(self.labelnames, values)} {_fmt_num(child.value)}"]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+
+class _HistogramChild:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        with self._lock:
+            self.sum += value
+            self.count += 1
+            for i, b in enumerate(self.buckets):
+                if value <= b:
+                    self.counts[i] += 1
+                    break
+
+    @contextmanager
+    def time(self):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - t0)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, doc, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, doc, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def _sample_lines(self, values, child):
+        with child._lock:
+            counts, total, n = list(child.counts), child.sum, child.count
+        lines, running = [], 0
+        for b, c in zip(self.buckets, counts):
+            running += c
+            lines.append(f"{self.name}_bucket{_fmt_labels(self.labelnames, values, [('le', _fmt_num(b))])} {running}")
+        lines.append(f"{self.name}_sum{_fmt_labels(self.labelnames, values)} {_fmt_num(total)}")
+        lines.append(f"{self.name}_count{_fmt_labels(self.labelnames, values)} {n}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def expose(self):
+        with self._lock:
+            metrics = list(self._metrics)
+        lines = []
+        for m in metrics:
+            lines.extend(m.expose())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    "outage_stage_seconds", "Time spent per pipeline stage.", ("provider", "stage")))
+ROWS_SCANNED = REGISTRY.register(Counter(
+    "outage_rows_scanned_total", "Outage rows scanned.", ("provider",)))
+ROWS_MATCHED = REGISTRY.register(Counter(
+    "outage_rows_matched_total", "Outage rows matching the provider's keywords.", ("provider",)))
+FETCH_BYTES = REGISTRY.register(Counter(
+    "outage_fetch_bytes_total", "Response body bytes downloaded.", ("host",)))
+FETCHES = REGISTRY.register(Counter(
+    "outage_fetches_total", "Page fetches by result (downloaded, not_modified, cached).", ("host", "result")))
+SCHEDULER_LAG = REGISTRY.register(Histogram(
+    "outage_scheduler_lag_seconds", "Delay between a job's scheduled fire time and its start.", ("job",),
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300, 1800)))
+HTTP_REQUESTS = REGISTRY.register(Counter(
+    "outage_http_requests_total", "HTTP requests by result (ok, retry, failed, circuit_open).", ("host", "result")))
+HTTP_BREAKER_OPEN = REGISTRY.register(Gauge(
+    "outage_http_circuit_open", "1 while the host's circuit breaker is open.", ("host",)))
+POLL_PROBES = REGISTRY.register(Counter(
+    "outage_poll_probes_total", "Adaptive poll probes by result (head_unchanged, rows_unchanged, changed).",
+    ("host", "result")))
+POLL_INTERVAL = REGISTRY.register(Gauge(
+    "outage_poll_interval_seconds", "Current adaptive poll interval per page.", ("host",)))
+OUTBOX_MESSAGES = REGISTRY.register(Counter(
+    "outage_outbox_messages_total", "Outbox messages by result (queued, duplicate, sent, retry, dead).",
+    ("result",)))
+OUTBOX_DEPTH = REGISTRY.register(Gauge(
+    "outage_outbox_depth", "Messages waiting in the outbox."))
+JOB_RUNS = REGISTRY.register(Counter(
+    "outage_job_runs_total", "Provider job runs by outcome.", ("provider", "outcome")))
+
+
+@contextmanager
+def stage(name, provider):
+    """Time a block into outage_stage_seconds{provider, stage}."""
+    with STAGE_SECONDS.labels(provider, name).time():
+        yield
+
+
+class StageTimer:
+    """
+    Per-stage timing for a chain of lazy generator stages, which run
+    interleaved. Each wrapped stage accumulates the time spent in its next()
+    calls; since that includes the stages upstream of it, observe() records
+    every stage's own share into outage_stage_seconds{provider, stage}.
+    Wrap the stages source first, each consuming the one wrapped before it.
+    """
+
+    def __init__(self, provider):
+        self.provider = provider
+        self._stages = []  # [name, seconds], source first
+
+    def wrap(self, name, iterable):
+        slot = [name, 0.0]
+        self._stages.append(slot)
+        return self._timed(slot, iter(iterable))
+
+    @staticmethod
+    def _timed(slot, it):
+        clock = time.perf_counter
+        while True:
+            t0 = clock()
+            try:
+                item = next(it)
+            except StopIteration:
+                slot[1] += clock() - t0
+                return
+            slot[1] += clock() - t0
+            yield item
+
+    def observe(self):
+        upstream = 0.0
+        for name, seconds in self._stages:
+            STAGE_SECONDS.labels(self.provider, name).observe(max(0.0, seconds - upstream))
+            upstream = seconds
+
+
+def start_http_server(port, addr="127.0.0.1", registry=REGISTRY):
+    """Serve `registry` at http://addr:port/metrics from a daemon thread."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class _Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/metrics", "/"):
+                self.send_error(404)
+                return
+            body = self.server.registry.expose().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):  # keep scrapes out of stderr
+            pass
+
+    server = ThreadingHTTPServer((addr, port), _Handler)
+    server.daemon_threads = True
+    server.registry = registry
+    threading.Thread(target=server.serve_forever, daemon=True, name="metrics-http").start()
+    return server
@@ -1,31 +1,139 @@
 # utils/my_logging.py
+"""
+Logging setup: callers only enqueue records (QueueHandler); a QueueListener
+thread formats them and does the file/console I/O. The logger's level is set
+from LOGGING_LEVEL, so disabled levels are rejected before a record is even
+created.
+
+Env:
+  LOGGING_LEVEL  default DEBUG
+  LOG_FORMAT     "text" (default) or "json" (JSON lines with provider_id/run_id)
+  LOG_ROTATE     "size" (default) or a TimedRotatingFileHandler `when`, e.g. "midnight"
+  LOG_MAX_BYTES  default 5 MB (size rotation)
+  LOG_BACKUPS    default 5
+"""
+import atexit
+import contextvars
+import copy
+import json
 import logging
+import logging.handlers
 import os
+import queue
+from contextlib import contextmanager
 
-def setup_logging(app_name, base_dir="./"):
-    base_dir = os.path.expanduser(base_dir)
-    logs_dir = os.path.join(base_dir, "logs")
-    os.makedirs(logs_dir, exist_ok=True)
+_provider_id = contextvars.ContextVar("provider_id", default=None)
+_run_id = contextvars.ContextVar("run_id", default=None)
 
-    app_logs_dir = os.path.join(logs_dir, app_name)
-    os.makedirs(app_logs_dir, exist_ok=True)
+_listeners = {}
+
+
+@contextmanager
+def log_context(provider_id=None, run_id=None):
+    """Tag every record logged inside the block (in this thread/context) with provider_id/run_id."""
+    tokens = [(_provider_id, _provider_id.set(provider_id)), (_run_id, _run_id.set(run_id))]
+    try:
+        yield
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
+
+
+class ContextFilter(logging.Filter):
+    def filter(self, record):
+        record.provider_id = _provider_id.get()
+        record.run_id = _run_id.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        doc = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "provider_id": getattr(record, "provider_id", None),
+            "run_id": getattr(record, "run_id", None),
+            "thread": record.threadName,
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            doc["exc"] = record.exc_text
+        return json.dumps(doc, ensure_ascii=False)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Resolve msg % args and tracebacks on the calling thread; leave formatting to the listener."""
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _file_handler(log_file):
+    rotate = os.getenv("LOG_ROTATE", "size")
+    backups = int(os.getenv("LOG_BACKUPS", 5))
+    if rotate == "size":
+        return logging.handlers.RotatingFileHandler(
+            log_file, maxBytes=int(os.getenv("LOG_MAX_BYTES", 5 * 1024 * 1024)),
+            backupCount=backups, encoding="utf-8")
+    return logging.handlers.TimedRotatingFileHandler(log_file, when=rotate, backupCount=backups, encoding="utf-8")
 
-    log_file = os.path.join(app_logs_dir, f"{app_name}.log")
 
+def setup_logging(app_name, base_dir="./", level=None, json_format=None):
     logger = logging.getLogger(app_name)
-    logger.setLevel(logging.DEBUG)
+    # avoid duplicate handlers on reruns
+    if app_name in _listeners:
+        return logger
 
-    file_handler = logging.FileHandler(log_file)
-    console_handler = logging.StreamHandler()
+    base_dir = os.path.expanduser(base_dir)
+    app_logs_dir = os.path.join(base_dir, "logs", app_name)
+    os.makedirs(app_logs_dir, exist_ok=True)
+    log_file = os.path.join(app_logs_dir, f"{app_name}.log")
+
+    level = level or os.getenv("LOGGING_LEVEL", "DEBUG")
+    logger.setLevel(level.upper() if isinstance(level, str) else level)
+
+    if json_format is None:
+        json_format = os.getenv("LOG_FORMAT", "text").lower() == "json"
+    formatter = JsonFormatter() if json_format else logging.Formatter("%(asctime)s %(levelname)s %(message)s")
 
-    formatter = logging.Formatter("%(asctime)s %(levelname)s %(message)s")
+    file_handler = _file_handler(log_file)
+    console_handler = logging.StreamHandler()
     file_handler.setFormatter(formatter)
     console_handler.setFormatter(formatter)
 
-    # avoid duplicate handlers on reruns
-    if not logger.handlers:
-        logger.addHandler(file_handler)
-        logger.addHandler(console_handler)
+    q = queue.SimpleQueue()
+    qh = _QueueHandler(q)
+    qh.addFilter(ContextFilter())
+    logger.addHandler(qh)
 
-    logger.debug("Logger initialized with DEBUG level")
+    listener = logging.handlers.QueueListener(q, file_handler, console_handler, respect_handler_level=True)
+    listener.start()
+    _listeners[app_name] = listener
+    atexit.register(listener.stop)
+
+    logger.debug("Logger initialized with %s level", logging.getLevelName(logger.level))
     return logger
+
+
+def queued_handlers(logger):
+    """Handlers that do the actual output for `logger` (behind its queue)."""
+    listener = _listeners.get(logger.name)
+    return list(listener.handlers) if listener else list(logger.handlers)
+
+
+def attach_handler(logger, handler):
+    """Add an output handler behind the queue, so it also runs off the calling thread."""
+    listener = _listeners.get(logger.name)
+    if listener is None:
+        logger.addHandler(handler)
+        return
+    listener.handlers = listener.handlers + (handler,)
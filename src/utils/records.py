@@ -0,0 +1,87 @@
+# utils/records.py
+"""
+Compact, immutable records for the pipeline: `Outage` (one scraped row) and
+`Event` (one calendar entry). Both are slotted frozen dataclasses (which needs
+Python 3.10+), so a row costs a fixed handful of pointers instead of a dict,
+and the values that repeat across thousands of rows (dates, areas, time
+ranges, statuses, titles) are interned and stored once.
+
+They are also read-only Mappings, so code written against the old dicts
+(`ev["start"]`, `o.get("uid")`, `{**o}`) keeps working; optional fields left
+at None are simply absent from the mapping view. Use `.replace(...)` to derive
+a modified copy.
+"""
+import sys
+from collections.abc import Mapping
+from dataclasses import dataclass, fields, replace
+from datetime import datetime
+from typing import Optional
+
+_intern = sys.intern
+
+
+class _Record(Mapping):
+    __slots__ = ()
+    _keys = ()
+
+    def __getitem__(self, key):
+        if key in self._keys:
+            value = getattr(self, key)
+            if value is not None:
+                return value
+        raise KeyError(key)
+
+    def __iter__(self):
+        return (k for k in self._keys if getattr(self, k) is not None)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def replace(self, **changes):
+        return replace(self, **changes)
+
+    def as_dict(self):
+        return dict(self)
+
+
+@dataclass(frozen=True, slots=True, eq=True)
+class Outage(_Record):
+    date: str
+    area: str
+    location: str
+    time: str
+    status: str
+    # the TTEC page has no separate description; it is the location itself
+    description: str
+    uid: Optional[str] = None
+    sequence: Optional[int] = None
+
+    @classmethod
+    def from_row(cls, date, area, location, time, status_inactive_keyword="CANCELLED"):
+        status = "Cancelled" if location.lower().startswith(status_inactive_keyword.lower()) else "Active"
+        return cls(_intern(date), _intern(area), location, _intern(time), status, location)
+
+
+@dataclass(frozen=True, slots=True, eq=True)
+class Event(_Record):
+    start: datetime
+    end: datetime
+    title: str
+    location: str
+    description: str
+    uid: str
+    date_str: Optional[str] = None
+    status: Optional[str] = None
+    sequence: Optional[int] = None
+    url: Optional[str] = None
+
+    @classmethod
+    def make(cls, start, end, title, location, description, uid, date_str=None, status=None, sequence=None,
+             url=None):
+        return cls(start, end, _intern(title), location, description, uid,
+                   _intern(date_str) if date_str else date_str, _intern(status) if status else status,
+                   sequence, url)
+
+
+for _cls in (Outage, Event):
+    _cls._keys = tuple(f.name for f in fields(_cls))
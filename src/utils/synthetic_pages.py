@@ -0,0 +1,127 @@
+# utils/synthetic_pages.py
+"""
+Generator for synthetic outage pages shaped like the TTEC public page
+(Word-exported HTML: `tr.MsoNormalTable` rows with nested <p>/<span> cells),
+with mixed a.m./p.m. time formats and a share of CANCELLED rows, plus a local
+HTTP stand-in to serve them. Used by the benchmarks and the load test;
+deterministic for a given seed.
+
+    python -m src.utils.synthetic_pages --rows 10000 > page.html
+"""
+import random
+import threading
+import zlib
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+AREAS = ["North", "South", "East", "West", "Central", "Tobago", "North East", "South West"]
+PLACES = ["Moka", "Maraval", "Fernandez", "Saddle", "Perseverance", "Hummingbird", "Ojoe",
+          "Foster", "Eastern Main", "Arima", "Sangre Grande", "Couva", "Chaguanas", "Diego Martin",
+          "Point Fortin", "Siparia", "Tunapuna", "Curepe", "St. Augustine", "Valsayn"]
+STREETS = ["Road", "Street", "Avenue", "Trace", "Drive", "Lane", "Extension", "Heights"]
+TIME_RANGES = [
+    "8:30 a.m. to 4:00 p.m.",
+    "9 a.m. to 3 p.m.",
+    "9:00 AM to 3:00 PM",
+    "10:00 a.m. to 2:00 p.m.",
+    "7:30 a.m. to 12:30 p.m.",
+    "1:00 p.m. to 5:00 p.m.",
+    "9am - 3pm",
+    "8.30 a.m. to 4.30 p.m.",
+    "12 p.m. to 4 p.m.",
+]
+
+_HEAD = (
+    '<html><head><meta http-equiv="Content-Type" content="text/html; charset=windows-1252">'
+    "<title>Scheduled Outages</title></head><body lang=EN-US>"
+    '<div class="WordSection1"><p class="MsoNormal">Planned interruptions</p>'
+    '<table class="MsoNormalTable" border=1 cellspacing=0 cellpadding=0>'
+    "<tr><td><p><b>Date</b></p></td><td><p><b>Area</b></p></td>"
+    "<td><p><b>Location</b></p></td><td><p><b>Time</b></p></td></tr>"
+)
+_TAIL = "</table><p class=MsoNormal>&nbsp;</p></div></body></html>"
+
+
+def _cell(text):
+    return f'<td valign=top style="padding:0in 5.4pt"><p class=MsoNormal><span style="font-size:10.0pt">{text}</span></p></td>'
+
+
+def outage_row(rng, start=date(2025, 1, 6), cancelled_ratio=0.1):
+    d = start + timedelta(days=rng.randint(0, 60))
+    location = ", ".join(f"{rng.choice(PLACES)} {rng.choice(STREETS)}" for _ in range(rng.randint(1, 4)))
+    if rng.random() < cancelled_ratio:
+        location = f"CANCELLED - {location}"
+    return (d.strftime("%d/%m/%Y"), rng.choice(AREAS), location, rng.choice(TIME_RANGES))
+
+
+def generate_rows(n, seed=0, cancelled_ratio=0.1):
+    rng = random.Random(seed)
+    return [outage_row(rng, cancelled_ratio=cancelled_ratio) for _ in range(n)]
+
+
+def render_page(rows):
+    parts = [_HEAD]
+    for r in rows:
+        parts.append('<tr class="MsoNormalTable" style="height:15.0pt">')
+        parts.extend(_cell(c.replace("&", "&amp;")) for c in r)
+        parts.append("</tr>")
+    parts.append(_TAIL)
+    return "".join(parts)
+
+
+def generate_page(n, seed=0, cancelled_ratio=0.1):
+    return render_page(generate_rows(n, seed=seed, cancelled_ratio=cancelled_ratio))
+
+
+class _PageHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_HEAD(self):
+        self.do_GET(head=True)
+
+    def do_GET(self, head=False):
+        body = self.server.pages.get(self.path.split("?")[0])
+        if body is None:
+            self.send_error(404)
+            return
+        etag = self.server.etags[self.path.split("?")[0]]
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve_pages(pages, host="127.0.0.1", port=0):
+    """
+    Serve {path: html} over local HTTP (with ETags) from a daemon thread.
+    Returns the server; its base URL is f"http://{host}:{server.server_address[1]}".
+    """
+    server = ThreadingHTTPServer((host, port), _PageHandler)
+    server.daemon_threads = True
+    server.pages = {p: (h.encode("utf-8") if isinstance(h, str) else h) for p, h in pages.items()}
+    server.etags = {p: f'"{zlib.crc32(b):08x}"' for p, b in server.pages.items()}
+    threading.Thread(target=server.serve_forever, daemon=True, name="synthetic-pages").start()
+    return server
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=1000)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--cancelled-ratio", type=float, default=0.1)
+    args = ap.parse_args()
+    sys.stdout.write(generate_page(args.rows, seed=args.seed, cancelled_ratio=args.cancelled_ratio))
@@ -0,0 +1,14 @@
+import pytest
+
+from src import pipeline
+from src.state import outage_store
+
+
+@pytest.fixture
+def isolated(tmp_path, monkeypatch):
+    """In-memory outage store and calendar/ICS output under tmp_path."""
+    prev = outage_store.set_default_store(outage_store.OutageStore(":memory:"))
+    monkeypatch.setattr(pipeline, "OUTPUT_DIR", str(tmp_path))
+    monkeypatch.setattr(pipeline, "CALENDAR_DIR", str(tmp_path / "calendars"))
+    yield tmp_path
+    outage_store.set_default_store(prev).close()
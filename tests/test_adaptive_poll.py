@@ -0,0 +1,81 @@
+import requests
+
+from src.scraping import adaptive_poll, ttec_scraper
+from src.scraping.page_cache import CachedPage
+from src.utils.config_util import PollSettings
+
+ROW = '<tr class="MsoNormalTable"><td>20/10/2026</td><td>East</td><td>Arima</td><td>{} a.m. to 3 p.m.</td></tr>'
+
+
+def _page_server(monkeypatch, bodies):
+    """fetch_page serves `bodies` in turn; returns the list of fetched bodies."""
+    fetched = []
+
+    def fetch_page(url, max_age=None):
+        fetched.append(bodies.pop(0))
+        return CachedPage(url, f"<table>{fetched[-1]}</table>")
+    monkeypatch.setattr(ttec_scraper, "fetch_page", fetch_page)
+    return fetched
+
+
+def _head(headers):
+    def head(url, **kwargs):
+        r = requests.Response()
+        r.status_code = 200
+        r.headers.update(headers)
+        return r
+    return head
+
+
+def test_content_length_alone_does_not_skip_the_get(monkeypatch):
+    # same length, different hour: only the GET can tell
+    fetched = _page_server(monkeypatch, [ROW.format(9), ROW.format(8)])
+    poller = adaptive_poll.AdaptivePoller("http://site.test/", PollSettings(),
+                                          session_head=_head({"Content-Length": "120"}))
+    assert poller.poll() is not None
+    assert poller.poll() == [("20/10/2026", "East", "Arima", "8 a.m. to 3 p.m.")]
+    assert len(fetched) == 2
+
+
+def test_etag_match_skips_the_get(monkeypatch):
+    fetched = _page_server(monkeypatch, [ROW.format(9), ROW.format(8)])
+    poller = adaptive_poll.AdaptivePoller("http://site.test/", PollSettings(), session_head=_head({"ETag": '"v1"'}))
+    assert poller.poll() is not None
+    assert poller.poll() is None
+    assert len(fetched) == 1
+
+
+def test_rewound_change_is_reported_again(monkeypatch):
+    _page_server(monkeypatch, [ROW.format(9), ROW.format(8), ROW.format(8)])
+    poller = adaptive_poll.AdaptivePoller("http://site.test/", PollSettings(), session_head=_head({"ETag": '"v1"'}))
+    poller.poll()
+    seen = poller.state()
+    poller._head = _head({"ETag": '"v2"'})
+    assert poller.poll() is not None
+    poller.rewind(seen)
+    assert poller.poll() is not None
+
+
+def test_run_poll_keeps_change_pending_when_a_member_fails(monkeypatch):
+    import runner
+
+    class _Store:
+        saved = {}
+
+        def save_poll_state(self, key, state):
+            self.saved[key] = dict(state)
+
+    _page_server(monkeypatch, [ROW.format(9), ROW.format(9)])
+    poller = adaptive_poll.AdaptivePoller("http://site.test/", PollSettings(), session_head=_head({"ETag": '"v1"'}))
+    store = _Store()
+    monkeypatch.setattr(runner, "_poller_for", lambda url, settings, extractor=None: poller)
+    monkeypatch.setattr(runner, "default_store", lambda: store)
+    monkeypatch.setattr(runner, "_run_members", lambda members, rows: [])
+    members = [({"id": "east", "title": "TTEC", "url": "http://site.test/"}, None)]
+
+    runner.run_poll(members, PollSettings())
+    assert store.saved["http://site.test/"]["row_hash"] is None
+    poller.next_due = 0
+    monkeypatch.setattr(runner, "_run_members", lambda members, rows: [object()])
+    runner.run_poll(members, PollSettings())
+    assert store.saved["http://site.test/"]["row_hash"] is not None
@@ -0,0 +1,95 @@
+import logging
+import os
+import sys
+from datetime import datetime
+
+import pytest
+
+from src.ics_generator.calendar_util import create_event, create_events, iter_events, parse_when
+from src.scraping.ttec_scraper import _outage
+from src.utils.synthetic_pages import generate_rows
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+from bench_events import legacy_create_event  # noqa: E402  the pre-parse_when per-row path
+
+
+def _at(h, m=0):
+    return datetime(2025, 2, 3, h, m)
+
+
+@pytest.mark.parametrize("time, start, end", [
+    ("8:30 a.m. to 4:00 p.m.", _at(8, 30), _at(16)),
+    ("9 a.m. to 3 p.m.", _at(9), _at(15)),          # bare hours: dropped by the old parser
+    ("9:00 AM to 3:00 PM", _at(9), _at(15)),
+    ("9am - 3pm", _at(9), _at(15)),
+    ("8.30 a.m. to 4.30 p.m.", _at(8, 30), _at(16, 30)),
+    ("12 p.m. to 4 p.m.", _at(12), _at(16)),
+    ("12 a.m. to 1 a.m.", _at(0), _at(1)),
+    ("10:00 A.M. – 2:00 P.M.", _at(10), _at(14)),
+    ("9 to 11", _at(9), _at(11)),                    # no meridiem: bare hours < 12 are AM
+    ("1 p.m.", _at(13), _at(13)),                    # a single time is a zero-length window
+])
+def test_parse_when(time, start, end):
+    assert parse_when("03/02/2025", time) == (start, end)
+
+
+@pytest.mark.parametrize("date, time", [
+    ("03/02/2025", "soon"),
+    ("03/02/2025", "13 p.m. to 2 p.m."),
+    ("31/02/2025", "9 a.m. to 3 p.m."),
+    ("2025-02-03", "9 a.m. to 3 p.m."),
+])
+def test_parse_when_rejects(date, time):
+    with pytest.raises(ValueError):
+        parse_when(date, time)
+
+
+def test_parse_when_is_memoized():
+    parse_when.cache_clear()
+    parse_when("03/02/2025", "9 a.m. to 3 p.m.")
+    parse_when("03/02/2025", "9 a.m. to 3 p.m.")
+    assert parse_when.cache_info().hits == 1
+
+
+def test_agrees_with_the_old_parser_where_it_worked():
+    rows = [_outage(*r, "CANCELLED") for r in generate_rows(500, seed=5)]
+    checked = 0
+    for o in rows:
+        old = legacy_create_event(o["date"], o["time"], "TTEC", o["status"], o["location"], o["description"])
+        if old is None:
+            continue
+        new = create_event(o["date"], o["time"], "TTEC", o["status"], o["location"], o["description"])
+        assert (new.start, new.end, new.title, new.location, new.description) == (
+            old["start"], old["end"], old["title"], old["location"], old["description"])
+        checked += 1
+    assert checked > 100
+
+
+def test_create_event_fields():
+    ev = create_event("03/02/2025", "9 a.m. to 3 p.m.", "TTEC", "Cancelled", "Arima", "Arima Road",
+                      uid="u1", date_str="03/02/2025", row_status="Cancelled", sequence=2)
+    assert ev.title == "Cancelled: TTEC - Scheduled Outage"
+    assert ev.description == "Cancelled: Cancelled: Arima Road"
+    assert (ev.uid, ev.date_str, ev.status, ev.sequence) == ("u1", "03/02/2025", "Cancelled", 2)
+    active = create_event("03/02/2025", "9 a.m. to 3 p.m.", "TTEC", "Active", "Arima", "Arima Road")
+    assert active.title == "TTEC - Scheduled Outage" and active.description == "Active: Arima Road"
+    assert active.uid and active.sequence is None
+
+
+def test_bulk_matches_per_row(caplog):
+    rows = [_outage(*r, "CANCELLED").replace(uid=f"u{i}", sequence=i % 3)
+            for i, r in enumerate(generate_rows(300, seed=9))]
+    rows.append(_outage("03/02/2025", "East", "Arima", "whenever", "CANCELLED").replace(uid="bad"))
+    rows.append({"date": "03/02/2025", "time": "9am - 3pm", "status": "Active", "location": "Moka",
+                 "description": "Moka", "uid": "dict-row"})
+    expected = [ev for ev in (
+        create_event(o["date"], o["time"], "TTEC", o["status"], o["location"], o["description"],
+                     uid=o.get("uid"), date_str=o["date"], row_status=o["status"], sequence=o.get("sequence"))
+        for o in rows) if ev]
+
+    logger = logging.getLogger("test-calendar")
+    with caplog.at_level(logging.WARNING, logger="test-calendar"):
+        bulk = create_events(rows, "TTEC", logger=logger)
+    assert bulk == expected == list(iter_events(rows, "TTEC"))
+    assert len(bulk) == len(rows) - 1
+    assert "whenever" in caplog.text
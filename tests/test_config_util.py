@@ -0,0 +1,35 @@
+import os
+
+from src.utils.config_util import ConfigWatcher
+
+CONFIG = """
+digest: {digest}
+websites:
+  - id: ttec_east
+    title: TTEC
+    url: https://ttec.co.tt/cis/outages_public.html
+    area_keywords: [east]
+    schedule: "0 6 * * mon,wed"
+"""
+
+
+def _save(path, text, n):
+    path.write_text(text)
+    os.utime(path, ns=(n * 10**9, n * 10**9))  # a distinct mtime per save
+
+
+def test_rejected_reload_keeps_the_whole_snapshot(tmp_path):
+    path = tmp_path / "config.yaml"
+    _save(path, CONFIG.format(digest="true"), 1)
+    changes = []
+    watcher = ConfigWatcher(str(path), on_change=lambda old, new: changes.append((old, new)))
+    assert watcher.snapshot.digest
+
+    _save(path, "websites: [", 2)
+    assert not watcher.check()
+    assert watcher.snapshot.digest
+
+    _save(path, CONFIG.format(digest="false"), 3)
+    assert watcher.check()
+    old, new = changes[-1]
+    assert old.digest and not new.digest
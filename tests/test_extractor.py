@@ -0,0 +1,63 @@
+import threading
+
+import pytest
+
+from src.scraping import extractor
+from src.scraping.extractor import ExtractorSpec, compile_extractor, extract_rows, get_scraper, stream_rows
+
+HTML = """<table id="outages">
+<tr><th>Date</th><th>Area</th><th>Place</th><th>From</th><th>To</th></tr>
+<tr class="row"><td>2026-10-20</td><td>East</td><td><span>Arima</span> Main Rd</td><td>09:00</td><td>15:00</td></tr>
+<tr class="row"><td>2026-10-21</td><td>North</td><td><span>Maraval</span></td><td>08:30</td><td>12:00</td></tr>
+</table>"""
+
+EXPECTED = [("20/10/2026", "East", "Arima Main Rd", "09:00 to 15:00"),
+            ("21/10/2026", "North", "Maraval", "08:30 to 12:00")]
+
+
+def _spec(rows, **columns):
+    columns = columns or {"date": 0, "area": 1, "location": 2, "start": 3, "end": 4}
+    return ExtractorSpec.from_config("isp", {"rows": rows, "columns": columns,
+                                             "date_format": "%Y-%m-%d", "time_format": "%H:%M"})
+
+
+@pytest.mark.parametrize("rows", ["table#outages tr", "table#outages > tr", "//table[@id='outages']//tr"])
+def test_css_and_xpath_specs_extract_the_same_rows(rows):
+    assert extract_rows(_spec(rows), HTML) == EXPECTED
+
+
+def test_column_selectors_are_relative_to_the_row():
+    spec = _spec(".row", date="./td[1]", area="./td[2]", location="span", start="./td[4]", end="./td[5]")
+    assert [row[2] for row in extract_rows(spec, HTML)] == ["Arima", "Maraval"]
+
+
+def test_bad_selector_is_reported_at_load_time():
+    with pytest.raises(ValueError, match="bad selector"):
+        _spec("//tr[")
+
+
+def test_threads_extract_concurrently():
+    compiled = compile_extractor(_spec("table#outages tr"))
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(compiled.extract(HTML))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert results == [EXPECTED] * 8
+
+
+def test_registry_resolves_configured_specs_before_builtins(monkeypatch):
+    monkeypatch.setattr(extractor, "_configured", {})
+    spec = _spec("table#outages tr")
+    extractor.set_configured({"isp": spec})
+
+    assert get_scraper("isp") is spec
+    assert list(stream_rows(spec, HTML)) == EXPECTED
+    assert callable(get_scraper()) and "ttec" in extractor.builtin_names()
+    with pytest.raises(KeyError):
+        get_scraper("nope")
+
+    extractor.set_configured({})
+    with pytest.raises(KeyError):
+        get_scraper("isp")
@@ -0,0 +1,100 @@
+import pytest
+import requests
+
+from src.scraping.http_client import CircuitBreaker, CircuitOpenError, HttpClient
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class _Session(requests.Session):
+    """Answers each request from a script of exceptions / status codes."""
+
+    def __init__(self, script):
+        super().__init__()
+        self.script = list(script)
+        self.calls = 0
+
+    def request(self, method, url, **kwargs):
+        self.calls += 1
+        step = self.script.pop(0)
+        if isinstance(step, BaseException):
+            raise step
+        r = requests.Response()
+        r.status_code = step
+        return r
+
+
+def _client(script, **kwargs):
+    kwargs.setdefault("retries", 0)
+    return HttpClient(rate=0, breaker_failures=1, breaker_reset=60, session=_Session(script),
+                      sleep=lambda s: None, jitter=lambda: 0.0, **kwargs)
+
+
+def _half_open(client, clock):
+    breaker = client.breaker("http://site.test/")
+    breaker._clock = clock
+    with pytest.raises(requests.ConnectionError):
+        client.get("http://site.test/")
+    assert breaker.state == CircuitBreaker.OPEN
+    clock.now = 61
+    return breaker
+
+
+@pytest.mark.parametrize("error", [
+    requests.exceptions.ChunkedEncodingError("reset mid-body"),
+    requests.exceptions.ContentDecodingError("bad gzip"),
+    requests.TooManyRedirects("loop"),
+])
+def test_failed_trial_request_reopens_breaker(error):
+    clock = _Clock()
+    client = _client([requests.ConnectionError("down"), error, 200])
+    breaker = _half_open(client, clock)
+
+    with pytest.raises(type(error)):
+        client.get("http://site.test/")
+    assert breaker.state == CircuitBreaker.OPEN
+
+    with pytest.raises(CircuitOpenError):
+        client.get("http://site.test/")
+    clock.now = 200
+    assert client.get("http://site.test/").status_code == 200
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_chunked_encoding_error_is_retried():
+    client = _client([requests.exceptions.ChunkedEncodingError("reset"), 200], retries=2)
+    assert client.get("http://site.test/").status_code == 200
+    assert client.session.calls == 2
+
+
+def test_other_request_errors_are_not_retried():
+    client = _client([requests.TooManyRedirects("loop"), 200], retries=2)
+    with pytest.raises(requests.TooManyRedirects):
+        client.get("http://site.test/")
+    assert client.session.calls == 1
+
+
+def test_retries_share_one_deadline():
+    clock = _Clock()
+
+    class _Hanging(_Session):
+        def request(self, method, url, timeout=None, **kwargs):
+            self.timeouts.append(timeout)
+            clock.now += timeout[1]  # every attempt times out reading
+            return super().request(method, url, **kwargs)
+
+    session = _Hanging([requests.Timeout("slow")] * 10)
+    session.timeouts = []
+    client = HttpClient(rate=0, retries=5, backoff=0.5, max_backoff=8, timeout=(5, 20), deadline=30,
+                        session=session, sleep=lambda s: setattr(clock, "now", clock.now + s),
+                        jitter=lambda: 1.0, clock=clock)
+    with pytest.raises(requests.Timeout):
+        client.get("http://site.test/")
+    assert session.timeouts == [(5, 20), (5, 9.5)]
+    assert clock.now <= 30
@@ -0,0 +1,23 @@
+import json
+import os
+import subprocess
+import sys
+
+RUNNER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "runner.py")
+
+
+def test_load_test_mode_reports_a_clean_run(tmp_path):
+    env = dict(os.environ, TT_BRIDGE_ENABLED="0")
+    proc = subprocess.run(
+        [sys.executable, RUNNER, "--load-test", "4", "--rows", "50", "--pages", "2", "--workers", "2", "--json"],
+        cwd=tmp_path, env=env, capture_output=True, text=True, timeout=120,
+    )
+    assert proc.returncode == 0, proc.stderr
+    report = json.loads(proc.stdout)
+    assert report["providers"] == 4 and report["errors"] == 0
+    assert report["latency_p50_s"] <= report["latency_p99_s"]
+    # every synthetic provider matched rows, so each queued one message and the outbox drained
+    assert report["smtp_messages"] == 4
+    assert 1 <= report["smtp_connections"] <= 4
+    # state, outbox and calendars went to a temp dir, not the working directory
+    assert not (tmp_path / "outbox").exists() and not (tmp_path / "state.sqlite3").exists()
@@ -0,0 +1,31 @@
+import threading
+import time
+from collections import Counter
+
+from src import main
+
+
+def test_run_providers_caps_concurrency_per_host(monkeypatch):
+    lock = threading.Lock()
+    running, peak = Counter(), Counter()
+
+    def run_for_provider(provider, deliver=True):
+        host = provider["url"].split("/")[2]
+        with lock:
+            running[host] += 1
+            peak[host] = max(peak[host], running[host])
+        time.sleep(0.05)
+        with lock:
+            running[host] -= 1
+        if provider["id"] == "b3":
+            raise RuntimeError("boom")
+        return provider["id"]
+
+    monkeypatch.setattr(main, "run_for_provider", run_for_provider)
+    providers = ([{"id": f"a{i}", "url": "https://a.test/x"} for i in range(5)]
+                 + [{"id": f"b{i}", "url": "https://B.test/y"} for i in range(5)])
+
+    results = main.run_providers(providers, workers=8, per_host=2)
+
+    assert peak == {"a.test": 2, "B.test": 2}
+    assert results == [p["id"] if p["id"] != "b3" else None for p in providers]
@@ -0,0 +1,56 @@
+import time
+import urllib.request
+
+from src.utils.metrics import STAGE_SECONDS, Counter, Histogram, Registry, StageTimer, start_http_server
+
+
+def test_stage_timer_records_each_stage_on_its_own(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(time, "perf_counter", lambda: now[0])
+
+    def slow(items, cost):
+        for item in items:
+            now[0] += cost
+            yield item
+
+    timer = StageTimer("timer-test")
+    rows = timer.wrap("parse", slow(range(3), 0.02))
+    kept = timer.wrap("filter", slow(rows, 0.0))
+    assert list(timer.wrap("create_event", slow(kept, 0.01))) == [0, 1, 2]
+    timer.observe()
+
+    own = {name: STAGE_SECONDS.labels("timer-test", name).sum for name in ("parse", "filter", "create_event")}
+    assert abs(own["parse"] - 0.06) < 1e-9
+    assert abs(own["filter"]) < 1e-9
+    assert abs(own["create_event"] - 0.03) < 1e-9
+
+
+def test_metrics_endpoint_serves_text_exposition():
+    registry = Registry()
+    runs = registry.register(Counter("test_runs_total", "Runs.", ["provider"]))
+    seconds = registry.register(Histogram("test_seconds", "Time.", ["stage"], buckets=(0.1, 1)))
+    runs.labels('tt"ec').inc(2)
+    for v in (0.05, 0.5, 3):
+        seconds.labels("fetch").observe(v)
+
+    server = start_http_server(0, registry=registry)
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.server_address[1]}/metrics") as r:
+            content_type = r.headers["Content-Type"]
+            body = r.read().decode("utf-8")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert content_type.startswith("text/plain; version=0.0.4")
+    lines = body.splitlines()
+    assert lines[:2] == ["# HELP test_runs_total Runs.", "# TYPE test_runs_total counter"]
+    assert 'test_runs_total{provider="tt\\"ec"} 2.0' in lines
+    assert "# TYPE test_seconds histogram" in lines
+    # buckets are cumulative and end at +Inf == _count
+    assert 'test_seconds_bucket{stage="fetch",le="0.1"} 1' in lines
+    assert 'test_seconds_bucket{stage="fetch",le="1"} 2' in lines
+    assert 'test_seconds_bucket{stage="fetch",le="+Inf"} 3' in lines
+    assert 'test_seconds_sum{stage="fetch"} 3.55' in lines
+    assert 'test_seconds_count{stage="fetch"} 3' in lines
+    assert body.endswith("\n")
@@ -0,0 +1,40 @@
+import atexit
+import json
+import logging
+import threading
+
+from src.utils import my_logging
+from src.utils.my_logging import log_context, setup_logging
+
+
+def test_records_carry_provider_and_run_ids(tmp_path, monkeypatch):
+    monkeypatch.delenv("LOGGING_LEVEL", raising=False)
+    name = "log-context-test"
+    logger = setup_logging(name, base_dir=str(tmp_path), json_format=True)
+    assert logger.level == logging.DEBUG
+
+    def job(pid):
+        with log_context(provider_id=pid, run_id="run-1"):
+            logger.info("scraping %s", pid)
+
+    threads = [threading.Thread(target=job, args=(pid,)) for pid in ("ttec_east", "ttec_north")]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    logger.info("outside")
+
+    listener = my_logging._listeners.pop(name)
+    listener.stop()  # drains the queue
+    atexit.unregister(listener.stop)
+    for h in list(logger.handlers):
+        logger.removeHandler(h)
+
+    path = tmp_path / "logs" / name / f"{name}.log"
+    docs = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    tagged = {d["msg"]: (d["provider_id"], d["run_id"]) for d in docs if d["level"] == "INFO"}
+    assert tagged == {
+        "scraping ttec_east": ("ttec_east", "run-1"),
+        "scraping ttec_north": ("ttec_north", "run-1"),
+        "outside": (None, None),
+    }
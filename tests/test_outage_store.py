@@ -0,0 +1,79 @@
+from src.state.outage_store import OutageStore
+from src.utils.records import Outage
+
+URL = "https://ttec.co.tt/cis/outages_public.html"
+
+
+def _outage(location="Arima"):
+    return Outage.from_row("20/10/2026", "East", location, "9 a.m. to 3 p.m.", "CANCELLED")
+
+
+def test_identity_follows_the_page_not_the_title():
+    from src.pipeline import pending_events
+    from src.state.outage_store import Delta
+
+    def uids(title, url=URL):
+        provider = {"id": "ttec_east", "title": title, "url": url, "area_keywords": ["east"],
+                    "location_keywords": ["arima"]}
+        rows = [("20/10/2026", "East", "Arima", "9 a.m. to 3 p.m.")]
+        return [ev.uid for ev in pending_events(provider, rows, Delta("ttec_east"), store=OutageStore(":memory:"))]
+
+    assert uids("TTEC") == uids("TTEC Power")
+    assert uids("TTEC") != uids("TTEC", url="https://isp.example/outages")
+
+
+def test_cancelled_row_keeps_identity_and_is_reported_per_provider():
+    store = OutageStore(":memory:")
+    first = store.diff("ttec_east", [_outage()], source=URL)
+    store.commit(first)
+    cancelled = store.diff("ttec_east", [_outage("CANCELLED: Arima")], source=URL)
+    assert cancelled.changes[0].identity == first.changes[0].identity
+    assert cancelled.counts()["unchanged"] == 0
+    assert store.diff("ttec_north", [_outage()], source=URL).counts()["new"] == 1
+
+
+def _row(time_="9 a.m. to 3 p.m.", location="Arima"):
+    return Outage.from_row("20/10/2026", "East", location, time_)
+
+
+def test_diff_classifies_and_bumps_sequence():
+    store = OutageStore(":memory:")
+    first = store.diff("ttec_east", [_row()], source=URL)
+    assert first.counts() == {"new": 1, "changed": 0, "cancelled": 0, "unchanged": 0}
+    assert first.changes[0].sequence == 0
+    store.commit(first)
+
+    same = store.diff("ttec_east", [_row()], source=URL)
+    assert same.counts()["unchanged"] == 1 and same.pending == []
+    assert same.changes[0].sequence == 0
+
+    moved = store.diff("ttec_east", [_row("10 a.m. to 4 p.m.")], source=URL)
+    assert moved.counts()["changed"] == 1 and moved.changes[0].sequence == 1
+    store.commit(moved)
+
+    cancelled = store.diff("ttec_east", [_row("10 a.m. to 4 p.m.", "CANCELLED: Arima")], source=URL)
+    assert cancelled.counts()["cancelled"] == 1 and cancelled.changes[0].sequence == 2
+    store.commit(cancelled)
+    assert store.diff("ttec_east", [_row("10 a.m. to 4 p.m.", "CANCELLED: Arima")],
+                      source=URL).counts()["unchanged"] == 1
+
+
+def test_uncommitted_diff_is_reported_again():
+    store = OutageStore(":memory:")
+    store.diff("ttec_east", [_row()], source=URL)
+    assert store.diff("ttec_east", [_row()], source=URL).counts()["new"] == 1
+
+
+def test_prune_forgets_only_stale_outages(monkeypatch):
+    import time
+
+    store = OutageStore(":memory:")
+    monkeypatch.setattr(time, "time", lambda: 1_000_000.0)
+    store.commit(store.diff("ttec_east", [_row(location="Arima")], source=URL))
+    monkeypatch.setattr(time, "time", lambda: 1_000_000.0 + 10 * 86400)
+    store.commit(store.diff("ttec_east", [_row(location="Sangre Grande")], source=URL))
+
+    monkeypatch.setenv("OUTAGE_PRUNE_DAYS", "5")
+    assert store.prune() == 1
+    assert store.diff("ttec_east", [_row(location="Arima")], source=URL).counts()["new"] == 1
+    assert store.diff("ttec_east", [_row(location="Sangre Grande")], source=URL).counts()["unchanged"] == 1
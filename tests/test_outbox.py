@@ -0,0 +1,51 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from src.ics_generator import ics_stream
+from src.mailer import outbox as outbox_mod
+from src.mailer.render_cache import render_cache
+from src.utils.records import Event
+
+
+def _events():
+    return [Event.make(start=datetime(2026, 10, 20, 9), end=datetime(2026, 10, 20, 15),
+                       title="TTEC - Scheduled Outage", location="Arima", description="Planned: Arima",
+                       uid="uid-1", sequence=0)]
+
+
+@pytest.fixture
+def render_at(monkeypatch):
+    """Render the test events afresh with DTSTAMP fixed at `second` past the minute."""
+    def render(second):
+        class _Now(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return datetime(2026, 10, 16, 12, 0, second, tzinfo=timezone.utc)
+        monkeypatch.setattr(ics_stream, "datetime", _Now)
+        render_cache.clear()
+        return render_cache.render(_events(), "outage.ics")
+    yield render
+    render_cache.clear()
+
+
+def test_rerendered_event_set_is_queued_once(tmp_path, render_at):
+    box = outbox_mod.Outbox(path=str(tmp_path), send=None)
+    first, second = render_at(0), render_at(1)
+    assert first.ics_bytes != second.ics_bytes
+
+    for rendered in (first, second):
+        key = box.enqueue("TTEC — Scheduled Outages (1)", rendered.table_html, ["a@example.com"],
+                          attachment_part=rendered.attachment, content_key=rendered.key)
+    assert key is None
+    assert len(box.pending()) == 1
+
+
+def test_key_without_content_key_ignores_dtstamp(render_at):
+    first, second = render_at(0), render_at(1)
+    args = ("subject", "<p>body</p>", ["a@example.com"])
+    assert (outbox_mod.message_key(*args, attachment_part=first.attachment)
+            == outbox_mod.message_key(*args, attachment_part=second.attachment))
+    other = render_cache.render([_events()[0].replace(location="Chaguanas")], "outage.ics")
+    assert (outbox_mod.message_key(*args, attachment_part=other.attachment)
+            != outbox_mod.message_key(*args, attachment_part=first.attachment))
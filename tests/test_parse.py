@@ -0,0 +1,54 @@
+import pytest
+
+from src.scraping import ttec_scraper
+from src.scraping.ttec_scraper import iter_rows_lxml, parse_rows_lxml, parse_rows_soup
+from src.utils.synthetic_pages import generate_page
+
+MESSY = {
+    "unclosed_tr_td": (
+        '<table><tr class="MsoNormalTable"><td>01/02/2025<td>East<td>Arima<td>9 a.m. to 3 p.m.'
+        '<tr class="MsoNormalTable"><td>02/02/2025<td>North<td>Moka<td>8 a.m. to 4 p.m.</table>'
+    ),
+    "nested_tables": (
+        '<table><tr class="MsoNormalTable"><td><table><tr class="MsoNormalTable"><td>a</td><td>b</td>'
+        '<td>c</td><td>d</td></tr></table>03/02/2025</td><td>East</td><td>Ojoe</td><td>9am - 3pm</td></tr>'
+        '<tr class="MsoNormalTable"><td>04/02/2025</td><td>West</td><td>Maraval</td><td>1 p.m. to 5 p.m.</td></tr>'
+        '</table>'
+    ),
+    "multi_class_rows": (
+        '<table><tr class="odd MsoNormalTable  highlight"><td>05/02/2025</td><td>South</td><td>Couva</td>'
+        '<td>9 a.m. to 3 p.m.</td></tr><tr class="MsoNormalTableX"><td>x</td><td>x</td><td>x</td><td>x</td></tr>'
+        '<tr class="msonormaltable"><td>y</td><td>y</td><td>y</td><td>y</td></tr></table>'
+    ),
+    "short_rows_and_entities": (
+        '<table><tr class="MsoNormalTable"><td>only</td><td>three</td><td>cells</td></tr>'
+        '<tr class="MsoNormalTable"><td> 06/02/2025 </td><td>Central&nbsp;Area</td>'
+        '<td><p><span>Chaguanas</span>\n  <span>&amp; Environs</span></p></td><td>9:00 AM to 3:00 PM</td>'
+        '<td>extra</td></tr></table>'
+    ),
+    "rows_outside_tables": (
+        '<div><tr class="MsoNormalTable"><td>07/02/2025</td><td>East</td><td>Foster</td><td>9am - 3pm</td></tr></div>'
+    ),
+}
+
+
+@pytest.mark.parametrize("seed", [0, 7])
+def test_lxml_matches_soup_on_synthetic_pages(seed):
+    html = generate_page(300, seed=seed)
+    expected = parse_rows_soup(html)
+    assert len(expected) == 300
+    assert parse_rows_lxml(html) == expected
+
+
+@pytest.mark.parametrize("name", sorted(MESSY))
+def test_lxml_matches_soup_on_messy_html(name):
+    html = MESSY[name]
+    expected = parse_rows_soup(html)
+    assert expected
+    assert parse_rows_lxml(html) == expected
+
+
+def test_rows_split_across_feed_chunks(monkeypatch):
+    html = generate_page(50, seed=3)
+    monkeypatch.setattr(ttec_scraper, "FEED_CHUNK", 97)
+    assert list(iter_rows_lxml(html)) == parse_rows_soup(html)
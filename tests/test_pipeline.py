@@ -0,0 +1,119 @@
+import itertools
+
+from src.scraping import ttec_scraper
+from src.scraping.page_cache import CachedPage
+
+ROW = '<tr class="MsoNormalTable"><td>20/10/2026</td><td>East</td><td>{}</td><td>9 a.m. to 3 p.m.</td></tr>'
+HTML = "<table>" + "".join(ROW.format(town) for town in ("Arima", "Sangre Grande", "Valencia")) + "</table>"
+
+
+def _no_stream(monkeypatch):
+    def stream_rows(scraper, html):
+        raise AssertionError("page parsed again")
+    monkeypatch.setattr(ttec_scraper, "stream_rows", stream_rows)
+
+
+def test_streamed_rows_are_memoized_on_the_page(monkeypatch):
+    page = CachedPage("http://site.test/", HTML)
+    first = list(ttec_scraper.iter_page_rows(page))
+    assert len(first) == 3
+
+    _no_stream(monkeypatch)
+    assert list(ttec_scraper.iter_page_rows(page)) == first
+    assert ttec_scraper.page_rows(page) == first
+
+
+def test_partly_read_stream_is_not_memoized():
+    page = CachedPage("http://site.test/", HTML)
+    rows = ttec_scraper.iter_page_rows(page)
+    list(itertools.islice(rows, 1))
+    rows.close()
+    assert len(list(ttec_scraper.iter_page_rows(page))) == 3
+
+
+def test_group_rows_are_scanned_once_and_fanned_out(monkeypatch):
+    import runner
+    from src.scraping.keyword_matcher import KeywordMatcher
+
+    scans = []
+    match = KeywordMatcher.match
+    monkeypatch.setattr(KeywordMatcher, "match", lambda self, area, loc: scans.append(loc) or match(self, area, loc))
+    got = {}
+
+    def run_provider(provider, matcher=None, rows=None, deliver=True, prefiltered=False):
+        got[provider["id"]] = (rows, prefiltered)
+        return provider["id"]
+    monkeypatch.setattr(runner, "run_provider", run_provider)
+
+    rows = ttec_scraper.parse_rows(HTML)
+    members = [({"id": "arima", "title": "TTEC", "area_keywords": ["east"], "location_keywords": ["arima"]}, None),
+               ({"id": "east", "title": "TTEC", "area_keywords": ["east"], "location_keywords": ["a"]}, None)]
+    assert runner._run_members(members, rows) == ["arima", "east"]
+    assert len(scans) == len(rows)
+    assert got["arima"] == ([rows[0]], True)
+    assert got["east"] == (rows, True)
+
+
+def test_concurrent_providers_on_one_url_share_one_parse(monkeypatch, isolated):
+    import threading
+    import time
+    from src import main
+    from src.utils.synthetic_pages import generate_page
+
+    page = CachedPage("http://site.test/", generate_page(400, seed=1))
+    monkeypatch.setattr(ttec_scraper, "fetch_page", lambda url, max_age=None: page)
+    monkeypatch.setattr("src.pipeline.fetch_page", lambda url, max_age=None: page)
+    parses = []
+    stream_rows = ttec_scraper.stream_rows
+    both_started = threading.Barrier(2, timeout=5)
+
+    def counting_stream(scraper, html):
+        parses.append(threading.current_thread().name)
+        for row in stream_rows(scraper, html):
+            time.sleep(0.0005)  # slow enough for the two providers to overlap
+            yield row
+    monkeypatch.setattr(ttec_scraper, "stream_rows", counting_stream)
+    iter_page_rows = ttec_scraper.iter_page_rows
+
+    def in_step(p, extractor=None):
+        both_started.wait()
+        return iter_page_rows(p, extractor)
+    monkeypatch.setattr("src.pipeline.iter_page_rows", in_step)
+
+    providers = [{"id": f"provider_{i}", "title": "TTEC", "url": page.url,
+                  "area_keywords": ["east", "north"], "location_keywords": ["a"]} for i in range(2)]
+    reports = main.run_providers(providers, workers=4, per_host=2, deliver=False)
+    assert len(parses) == 1
+    assert reports[0].events and len(reports[1].events) == len(reports[0].events)
+    assert len(ttec_scraper.page_rows(page)) == 400
+
+
+def test_failed_parse_is_not_memoized_and_is_retried(monkeypatch):
+    import pytest
+
+    page = CachedPage("http://site.test/", HTML)
+    stream_rows = ttec_scraper.stream_rows
+
+    def broken(scraper, html):
+        yield next(stream_rows(scraper, html))
+        raise ValueError("parser blew up")
+    monkeypatch.setattr(ttec_scraper, "stream_rows", broken)
+    with pytest.raises(ValueError):
+        list(ttec_scraper.iter_page_rows(page))
+
+    monkeypatch.setattr(ttec_scraper, "stream_rows", stream_rows)
+    assert len(list(ttec_scraper.iter_page_rows(page))) == 3
+
+
+def test_providers_sharing_a_title_keep_their_own_ics(isolated):
+    from src import pipeline
+
+    rows = [("20/10/2026", "East", "Arima", "9 a.m. to 3 p.m.")]
+    paths = []
+    for pid, town in (("ttec_east", "arima"), ("ttec_north", "arima")):
+        provider = {"id": pid, "title": "TTEC", "url": "http://site.test/", "area_keywords": ["east"],
+                    "location_keywords": [town]}
+        report = pipeline.prepare(provider, rows=list(rows), render=False)
+        paths.append(report.ics_path)
+    assert len(set(paths)) == 2
+    assert all(str(isolated) in p for p in paths)
@@ -0,0 +1,98 @@
+import os
+from datetime import timedelta
+from types import SimpleNamespace
+
+import runner
+from src.utils.config_util import ConfigWatcher, compile_config
+from src.utils.metrics import SCHEDULER_LAG
+
+URL = "https://ttec.co.tt/cis/outages_public.html"
+
+
+class _Scheduler:
+    def __init__(self):
+        self.jobs = {}
+        self.added, self.modified = [], []
+
+    def add_job(self, func, id, **kwargs):
+        self.added.append(id)
+        self.jobs[id] = SimpleNamespace(id=id, func=func, kwargs=kwargs["kwargs"], trigger=kwargs["trigger"])
+
+    def get_job(self, job_id):
+        return self.jobs.get(job_id)
+
+    def remove_job(self, job_id):
+        del self.jobs[job_id]
+
+    def modify_job(self, job_id, **changes):
+        self.modified.append(job_id)
+        vars(self.jobs[job_id]).update(changes)
+
+
+def _snapshot(*ids):
+    return compile_config({"websites": [
+        {"id": pid, "title": "TTEC", "url": URL, "area_keywords": ["east"], "schedule": "0 6 * * mon,wed"}
+        for pid in ids]})
+
+
+def test_group_job_reports_lag_per_member(monkeypatch):
+    monkeypatch.setattr(runner, "_member_jobs", {})
+    sched = _Scheduler()
+    runner._apply_config(sched, None, _snapshot("lag_east", "lag_north"))
+    assert list(sched.jobs) == ["group_lag_east+lag_north"]
+
+    fired = runner.now_tt() - timedelta(seconds=2)
+    runner._record_lag(SimpleNamespace(job_id="group_lag_east+lag_north", scheduled_run_times=[fired]))
+    for member in ("provider_lag_east", "provider_lag_north"):
+        assert SCHEDULER_LAG.labels(member).count == 1
+    assert SCHEDULER_LAG.labels("group_lag_east+lag_north").count == 0
+
+    runner._apply_config(sched, _snapshot("lag_east", "lag_north"), _snapshot("lag_east"))
+    assert list(sched.jobs) == ["provider_lag_east"]
+    assert runner._member_jobs == {"provider_lag_east": ("provider_lag_east",)}
+
+
+CONFIG = """
+websites:
+  - id: east
+    title: TTEC
+    url: https://ttec.co.tt/cis/outages_public.html
+    area_keywords: [{east_kw}]
+    schedule: "0 6 * * mon"
+  - id: north
+    title: TTEC
+    url: https://isp.example/outages
+    area_keywords: [north]
+    schedule: "{north_cron}"
+"""
+
+
+def test_config_reload_touches_only_changed_jobs(tmp_path, monkeypatch):
+    monkeypatch.setattr(runner, "_member_jobs", {})
+    path = tmp_path / "config.yaml"
+
+    def save(n, text):
+        path.write_text(text)
+        os.utime(path, ns=(n * 10**9, n * 10**9))
+
+    save(1, CONFIG.format(east_kw="east", north_cron="0 7 * * tue"))
+    sched = _Scheduler()
+    watcher = ConfigWatcher(str(path), on_change=lambda old, new: runner._apply_config(sched, old, new))
+    runner._apply_config(sched, None, watcher.snapshot)
+    assert sorted(sched.added) == ["provider_east", "provider_north"]
+    east_trigger = sched.jobs["provider_east"].trigger
+
+    # new keywords on the same schedule: swapped in place; a new cron: re-added
+    save(2, CONFIG.format(east_kw="arima", north_cron="30 8 * * fri"))
+    sched.added.clear()
+    assert watcher.check()
+    assert sched.modified == ["provider_east"] and sched.added == ["provider_north"]
+    assert sched.jobs["provider_east"].trigger is east_trigger
+    assert sched.jobs["provider_east"].kwargs["provider"]["area_keywords"] == ["arima"]
+    assert "hour='8'" in str(sched.jobs["provider_north"].trigger)
+
+    # a provider gone from the file loses its job
+    save(3, CONFIG.format(east_kw="arima", north_cron="30 8 * * fri").split("  - id: north")[0])
+    assert watcher.check()
+    assert list(sched.jobs) == ["provider_east"]
+    assert runner._member_jobs == {"provider_east": ("provider_east",)}
@@ -0,0 +1,56 @@
+import socket
+from email import message_from_bytes
+from email.mime.text import MIMEText
+
+import pytest
+
+from src.mailer.smtp_pool import SMTPPool, deliver
+from src.mailer.smtp_sink import SMTPSink
+
+
+@pytest.fixture
+def sink():
+    sink = SMTPSink().start()
+    yield sink
+    sink.stop()
+
+
+def _pool(sink, **kw):
+    return SMTPPool(sink.host, sink.port, starttls=False, **kw)
+
+
+def test_idle_connection_is_probed_and_reused(sink):
+    pool = _pool(sink, size=1, idle_timeout=0)  # every reuse goes through NOOP
+    for _ in range(3):
+        pool.sendmail("a@x.test", ["b@x.test"], "Subject: hi\r\n\r\nbody")
+    pool.close()
+    assert sink.connections == 1
+    assert len(sink.messages) == 3
+
+
+def test_dropped_connection_is_replaced_after_failed_probe(sink):
+    pool = _pool(sink, size=1, idle_timeout=0)
+    pool.sendmail("a@x.test", ["b@x.test"], "Subject: hi\r\n\r\nbody")
+    (server, _), = pool._idle
+    server.sock.shutdown(socket.SHUT_RDWR)  # the connection died while idle
+    pool.sendmail("a@x.test", ["b@x.test"], "Subject: hi\r\n\r\nbody")
+    pool.close()
+    assert sink.connections == 2
+    assert len(sink.messages) == 2
+
+
+def test_deliver_batches_without_touching_the_message(sink):
+    pool = _pool(sink, size=2)
+    msg = MIMEText("body")
+    msg["Subject"] = "hi"
+    recipients = [f"r{i}@x.test" for i in range(5)]
+
+    report = deliver(pool, "a@x.test", recipients, msg, batch_size=2)
+    pool.close()
+
+    assert report.ok and report.sent == 3
+    assert "To" not in msg
+    batches = sorted(rcpts for _, rcpts, _ in sink.messages)
+    assert batches == [recipients[0:2], recipients[2:4], recipients[4:]]
+    for _, rcpts, raw in sink.messages:
+        assert message_from_bytes(raw)["To"] == ", ".join(rcpts)
@@ -0,0 +1,19 @@
+import os
+import sys
+
+BENCH_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks")
+if BENCH_DIR not in sys.path:
+    sys.path.insert(0, BENCH_DIR)
+
+import bench_startup  # noqa: E402
+
+# slower CI machines can raise the budget; the side-effect checks always apply
+BUDGET_MS = float(os.getenv("STARTUP_BUDGET_MS", bench_startup.DEFAULT_BUDGET_MS))
+
+
+def test_runner_cold_start():
+    median, _, _, facts, _ = bench_startup.check(budget_ms=BUDGET_MS, repeat=3)
+    assert facts["loaded"] == [], "scheduler-only/fallback modules loaded by `import runner`"
+    assert facts["threads"] == [], "`import runner` started threads"
+    assert not facts["logs_dir"], "`import runner` created ./logs"
+    assert median <= BUDGET_MS, f"import runner took {median:.1f} ms (budget {BUDGET_MS:.0f} ms)"
@@ -0,0 +1,76 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.notify.termux_bridge import _Dispatcher
+
+
+@pytest.fixture
+def bridge():
+    """Local stand-in for the bridge; requests wait for `gate` before answering."""
+    received, gate = [], threading.Event()
+
+    class _Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            gate.wait(5)
+            received.append((self.path, body["text"]))
+            self.send_response(200)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", received, gate
+    gate.set()
+    server.shutdown()
+    server.server_close()
+
+
+def _wait_for(cond, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not cond():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def test_dispatcher_drops_oldest_coalesces_and_flushes(bridge):
+    url, received, gate = bridge
+    d = _Dispatcher(url, maxlen=2, coalesce_s=60)
+
+    d.submit("/toast", {"text": "a"})
+    _wait_for(lambda: not d._queue)  # "a" is in flight, held by the gate
+    for text in ("b", "c", "d"):
+        d.submit("/toast", {"text": text})
+    assert d.dropped == 1  # "b" made room for "d"
+
+    d.submit("/toast", {"text": "c"})  # already queued
+    assert d.coalesced == 1
+    assert not d.flush(timeout=0.05)  # still blocked
+
+    gate.set()
+    assert d.flush(timeout=2)
+    assert received == [("/toast", "a"), ("/toast", "c"), ("/toast", "d")]
+    assert d.sent == 3 and d.failed == 0
+
+    d.submit("/toast", {"text": "d"})  # sent within the coalesce window
+    assert d.coalesced == 2
+    assert d.flush(timeout=1) and len(received) == 3
+
+
+def test_unreachable_bridge_never_blocks_submit():
+    d = _Dispatcher("http://127.0.0.1:9", timeout=0.2)  # nothing listens on the discard port
+    t0 = time.monotonic()
+    assert d.submit("/toast", {"text": "x"})
+    assert time.monotonic() - t0 < 0.1
+    assert d.flush(timeout=2)
+    assert d.failed == 1 and d.sent == 0